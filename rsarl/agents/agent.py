@@ -1,7 +1,7 @@
 
-from rsarl.data import Action
-from rsarl.utils import cal_slot, sort_tuple
-from rsarl.algorithms import SpectrumAssignment, Routing
+import copy
+from rsarl.data import Action, FeatureObservation
+from rsarl.algorithms import SpectrumAssignment, PathCatalog, CandidatePath, build_ksp_table
 
 
 class Agent(object):
@@ -25,18 +25,23 @@ class KSPAgent(Agent):
         """
         self.k = k
         self.path_table = {}
+        self.path_catalog = None
 
 
-    def prepare_ksp_table(self, net):
+    def prepare_ksp_table(self, net, cache_dir: str=None, n_workers: int=1, algorithm: str="networkx"):
         """Prepare k-shortest path table to shorten exec time. 
             Args:
                 net (Network): The target network            
+                cache_dir (str): directory to cache the table. The table is 
+                    loaded from the cache file if it exists.
+                n_workers (int): The number of processes to build the table.
+                algorithm (str): "networkx" or "yen", which is faster but may order 
+                    paths of equal length differently.
         """
-        for s in range(net.n_nodes):
-            for d in range(net.n_nodes):
-                if s < d:
-                    paths = Routing.k_shortest_paths(net, s, d, self.k, is_weight=net.is_weight)
-                    self.path_table[(s, d)] = paths
+        self.path_table = build_ksp_table(
+            net, self.k, cache_dir=cache_dir, n_workers=n_workers, algorithm=algorithm)
+        # distance, edges and required slots of each path
+        self.path_catalog = PathCatalog(net, self.path_table)
 
 
 class PrioritizedKSPAgent(KSPAgent):
@@ -49,7 +54,13 @@ class PrioritizedKSPAgent(KSPAgent):
         super().__init__(k)
 
 
-    def assign_spectrum(self, net, path: list, n_req_slot: int) -> int:
+    def assign_spectrum(self, net, cand: CandidatePath, n_req_slot: int) -> int:
+        """Search start index of slots on the candidate path.
+
+        Returns:
+            int: index, or None if there is no assignable index.
+
+        """
         raise NotImplementedError
 
 
@@ -59,21 +70,18 @@ class PrioritizedKSPAgent(KSPAgent):
         # generate current request
         src, dst, bandwidth, duration = observation.request
 
-        sd_tuple = (src, dst)
-        paths = self.path_table[sort_tuple(sd_tuple)]
+        candidates = self.path_catalog[(src, dst)]
 
         # Search assignable path & slot
-        for path in paths:
-            # physical length of the path
-            path_len = net.distance(path)
+        for cand in candidates:
             # number of requred slots
-            n_req_slot = cal_slot(bandwidth, path_len)
+            n_req_slot = cand.n_req_slot(bandwidth)
 
             # spectrum assignment
-            slot_idx = self.assign_spectrum(net, path, n_req_slot)
+            slot_idx = self.assign_spectrum(net, cand, n_req_slot)
 
             if slot_idx is not None:
-                return Action(path, slot_idx, n_req_slot, duration)
+                return Action(cand.path, slot_idx, n_req_slot, duration)
 
         return None
 
@@ -96,19 +104,78 @@ class KSPDRLAgent(KSPAgent):
         """
         raise NotImplementedError
 
+    def candidate_actions(self, obs) -> list:
+        """RSA actions of all outputs of DRL agent
+
+        """
+        raise NotImplementedError
+
+    def transform(self, obs) -> FeatureObservation:
+        """Convert observation to feature vector and candidate actions
+
+        """
+        return FeatureObservation(
+            request=obs.request, 
+            fvec=self.preprocess(obs), 
+            actions=self.candidate_actions(obs))
+
+    def observation_transform(self):
+        """Get transform of observation which can be run in workers of vector env, 
+        e.g., MultiprocessVectorEnv(env_fns, obs_transform=agent.observation_transform()). 
+        The agent is copied without DRL agent.
+
+        Returns:
+            callable: convert Observation into FeatureObservation
+        """
+        return self._copy_without_drl().transform
+
+    def action_mapper(self):
+        """Get mapping from output of DRL agent to action which can be run in workers 
+        of vector env, e.g., MultiprocessVectorEnv(env_fns, action_mapper=agent.action_mapper()). 
+        The agent is copied without DRL agent.
+
+        Returns:
+            callable: map (Observation, output of DRL agent) to Action
+        """
+        return self._copy_without_drl().map_drlout_to_action
+
+    def _copy_without_drl(self):
+        agent = copy.copy(self)
+        agent.drl = None
+        return agent
+
+    def _preprocess(self, obs):
+        if isinstance(obs, FeatureObservation):
+            return obs.fvec
+        return self.preprocess(obs)
+
+    def batch_preprocess(self, batch_obs) -> list:
+        """Convert observations to feature vectors, which can be vectorized over observations
+
+        """
+        return [self._preprocess(o) for o in batch_obs]
+
     def observe(self, obs, reward, done, reset):
         self.batch_observe([obs], [reward], [done], [reset])
     
     def batch_observe(self, batch_obs, batch_reward, batch_done, batch_reset):
-        obs = [self.preprocess(o) for o in batch_obs]
+        obs = self.batch_preprocess(batch_obs)
         self.drl.batch_observe(obs, batch_reward, batch_done, batch_reset)
 
     def act(self, obs):
         return self.batch_act([obs])[0]
 
+    def batch_drl_act(self, batch_obs) -> list:
+        """Get outputs of DRL agent without mapping to actions
+
+        """
+        obs = self.batch_preprocess(batch_obs)
+        return self.drl.batch_act(obs)
+
     def batch_act(self, batch_obs):
-        obs = [self.preprocess(o) for o in batch_obs]
-        drl_outs = self.drl.batch_act(obs)
-        acts = [self.map_drlout_to_action(obs, out) for obs, out in zip(batch_obs, drl_outs)]
+        drl_outs = self.batch_drl_act(batch_obs)
+        acts = [
+            obs.actions[out] if isinstance(obs, FeatureObservation) else self.map_drlout_to_action(obs, out)
+            for obs, out in zip(batch_obs, drl_outs)]
         return acts
 
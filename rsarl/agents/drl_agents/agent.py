@@ -2,7 +2,6 @@
 from abc import ABCMeta, abstractmethod
 from rsarl.data import Action
 from rsarl.agents import KSPDRLAgent
-from rsarl.utils import cal_slot, sort_tuple
 from rsarl.algorithms import SpectrumAssignment
 
 class RoutingAgent(KSPDRLAgent, metaclass=ABCMeta):
@@ -29,20 +28,27 @@ class RoutingAgent(KSPDRLAgent, metaclass=ABCMeta):
         """
         net = obs.net
         s, d, bandwidth, duration = obs.request
-        paths = self.path_table[sort_tuple((s, d))]
         # map
-        path = paths[out]
+        cand = self.path_catalog[(s, d)][out]
+        path = cand.path
 
         #required slots
-        path_len = net.distance(path)
-        n_req_slot = cal_slot(bandwidth, path_len)
+        n_req_slot = cand.n_req_slot(bandwidth)
         # FF
-        path_slot = net.path_slot(path)
+        path_slot = cand.slot_mask(net)
         slot_index = SpectrumAssignment.first_fit(path_slot, n_req_slot)
         if slot_index is None:
             return None
         else:
             return Action(path, slot_index, n_req_slot, duration)
+
+    def candidate_actions(self, obs) -> list:
+        """Mapping all RL outputs to KSP
+
+        """
+        s, d, _, _ = obs.request
+        n_paths = len(self.path_catalog[(s, d)])
+        return [self.map_drlout_to_action(obs, out) for out in range(n_paths)]
         
 
 
@@ -23,7 +23,7 @@ class DeepRMSAv1Agent(RoutingAgent):
         net = obs.net
         source, destination, bandwidth, duration = obs.request
         # slot table
-        whole_slot = np.array(list(net.slot.values()))
+        whole_slot = net.slot_rows(np.arange(net.n_edges))
         whole_slot = whole_slot.reshape(1, net.n_edges, net.n_slot).astype(np.float32)
         # source, destination, bandwidth map
         smap = np.ones_like(whole_slot) * vectorize(net.n_nodes, source)
@@ -1,7 +1,9 @@
 
 import numpy as np
+from rsarl.data import FeatureObservation
 from rsarl.agents.drl_agents import RoutingAgent
-from rsarl.utils import cal_slot, sort_tuple, onehot_list, k_consecutive_available_slot
+from rsarl.algorithms import sa_kernel
+from rsarl.utils import onehot_list
 
 
 class DeepRMSAv2Agent(RoutingAgent):
@@ -20,8 +22,7 @@ class DeepRMSAv2Agent(RoutingAgent):
         net = obs.net
         src, dst, bandwidth, duration = obs.request
         # get k-sp
-        sd_tuple = sort_tuple((src, dst))
-        paths = self.path_table[sd_tuple]
+        paths = self.path_catalog[(src, dst)]
 
         fvec = []
         # Feature 1: onehot of source-destination nodes
@@ -33,14 +34,16 @@ class DeepRMSAv2Agent(RoutingAgent):
         all_nega_ones = [-1 for _ in range(3 + 2)]
 
         # Feature 2: Path information
-        for path in paths:
+        for cand in paths:
             # spectrum utilization on the whole path
-            path_slot = net.path_slot(path)
-            # calc path-length and the required number of slots
-            path_len = net.distance(path)
-            req_n_slot = cal_slot(bandwidth, path_len)
+            path_slot = cand.slot_mask(net)
+            # the required number of slots
+            req_n_slot = cand.n_req_slot(bandwidth)
             # wavelength assignment
-            isFound, slot_start_indices, slot_continuous = k_consecutive_available_slot(path_slot, req_n_slot)
+            slot_start_indices, slot_continuous = sa_kernel.free_blocks(path_slot)
+            is_fit = slot_continuous >= req_n_slot
+            slot_start_indices, slot_continuous = slot_start_indices[is_fit], slot_continuous[is_fit]
+            isFound = len(slot_start_indices)
 
             if isFound:
                 # normalized slot num is added
@@ -60,3 +63,40 @@ class DeepRMSAv2Agent(RoutingAgent):
         fvec = np.array(fvec, dtype=np.float32)
         return fvec
 
+
+
+    def batch_preprocess(self, batch_obs) -> list:
+        """Same as preprocess, but features of paths of all observations are calculated at once
+
+        """
+        fvecs = [o.fvec if isinstance(o, FeatureObservation) else None for o in batch_obs]
+        targets = [i for i, fvec in enumerate(fvecs) if fvec is None]
+        if not targets:
+            return fvecs
+
+        nets = [batch_obs[i].net for i in targets]
+        sds = [batch_obs[i].request[:2] for i in targets]
+        bandwidths = [batch_obs[i].request[2] for i in targets]
+        masks = self.path_catalog.batch_path_slot_masks(nets, sds)
+        n_batch, k, n_slot = masks.shape
+        n_req_slot = self.path_catalog.batch_n_req_slot(sds, bandwidths)
+        n_blocks, start, length, total = (
+            x.reshape(n_batch, k) for x in sa_kernel.batch_fit_blocks(masks.reshape(-1, n_slot), n_req_slot.reshape(-1)))
+
+        # Feature 2: Path information, -1 if there is no available path
+        path_fvecs = np.stack([
+            (n_req_slot - 5.5) / 3.5,
+            2 * (start - 0.5 * n_slot) / n_slot,
+            (length - 8) / 8,
+            2 * (total - 0.5 * n_slot) / n_slot,
+            (total / np.maximum(n_blocks, 1) - 4) / 4,
+        ], axis=2)
+        path_fvecs[n_blocks == 0] = -1
+
+        node_onehot = np.eye(nets[0].n_nodes)
+        for b, (i, (src, dst)) in enumerate(zip(targets, sds)):
+            # Feature 1: onehot of source-destination nodes
+            n_paths = len(self.path_catalog[(src, dst)])
+            fvecs[i] = np.concatenate(
+                (node_onehot[src], node_onehot[dst], path_fvecs[b, :n_paths].ravel())).astype(np.float32)
+        return fvecs
@@ -2,7 +2,6 @@
 import numpy as np
 from rsarl.data import Action
 from rsarl.agents import KSPAgent
-from rsarl.utils import cal_slot, sort_tuple
 from rsarl.utils.fragmentation import edge_based_entropy
 
 
@@ -31,16 +30,14 @@ class EntropyAgent(KSPAgent):
         # generate current request
         src, dst, bandwidth, duration = observation.request
         # get pre-calculated k-sp path
-        sd_tuple = (src, dst)
-        paths = self.path_table[sort_tuple(sd_tuple)]
+        paths = self.path_catalog[(src, dst)]
 
         # Search KSP-FF
         candidates = []
-        for i, path in enumerate(paths):
-            path_len = net.distance(path)  # physical length of the path
-            n_req_slot = cal_slot(bandwidth, path_len)
+        for i, cand in enumerate(paths):
+            n_req_slot = cand.n_req_slot(bandwidth)
             # calc entropy
-            ent = edge_based_entropy(net, path, n_req_slot)
+            ent = edge_based_entropy(net, cand.path, n_req_slot)
             min_ent = np.min(ent)
             slot_index = np.argmin(ent)
             # candidate (k-path, slot-idx, n_req_slot, entropy)
@@ -48,7 +45,7 @@ class EntropyAgent(KSPAgent):
 
         # search the minimum entropy among k-sp
         i_th, start_idx, n_req_slot, _ = min(candidates, key=lambda item:item[3])
-        path = paths[i_th]
+        path = paths[i_th].path
 
         act = Action(path, start_idx, n_req_slot, duration)
         return act
@@ -2,9 +2,8 @@
 import numpy as np
 from rsarl.data import Action
 from rsarl.agents import KSPAgent
-from rsarl.utils import cal_slot, sort_tuple, k_consecutive_available_slot
 from rsarl.utils.fragmentation import count_cut, count_misalignment
-from rsarl.algorithms import SpectrumAssignment
+from rsarl.algorithms import SpectrumAssignment, sa_kernel
 
 class FragmentAwareAgent(KSPAgent):
     """Fragment-aware Agent with K-Shortest Path
@@ -29,16 +28,18 @@ class FragmentAwareAgent(KSPAgent):
         # generate current request
         src, dst, bandwidth, duration = obs.request
         # get pre-calculated k-sp path
-        paths = self.path_table[sort_tuple((src, dst))]
+        paths = self.path_catalog[(src, dst)]
 
         candidates = []
         min_n_cut = np.inf
-        for path in paths:
+        for path_cand in paths:
+            path = path_cand.path
             # calculate candidates of spectrum assignment
-            path_slot = net.path_slot(path)
-            path_len = net.distance(path)  # physical length of the path
-            n_req_slot = cal_slot(bandwidth, path_len)
-            num, start_indices, _ = k_consecutive_available_slot(path_slot, n_req_slot)
+            path_slot = path_cand.slot_mask(net)
+            n_req_slot = path_cand.n_req_slot(bandwidth)
+            start_indices, lengths = sa_kernel.free_blocks(path_slot)
+            start_indices = start_indices[lengths >= n_req_slot].tolist()
+            num = len(start_indices)
             
             if num > 0:
                 # explore all candidates
@@ -83,11 +84,11 @@ class FragmentAwareAgent(KSPAgent):
         net = obs.net
         src, dst, bandwidth, duration = obs.request
         # select shortest path
-        path = self.path_table[sort_tuple((src, dst))][0]
-        path_len = net.distance(path)
-        n_req_slot = cal_slot(bandwidth, path_len)
+        shortest = self.path_catalog[(src, dst)][0]
+        path = shortest.path
+        n_req_slot = shortest.n_req_slot(bandwidth)
         # target path slot
-        path_slot = net.path_slot(path)
+        path_slot = shortest.slot_mask(net)
         # first fit
         start_idx = SpectrumAssignment.first_fit(path_slot, n_req_slot)
         if start_idx is None:
@@ -25,11 +25,9 @@ class KSP_EntropyAgent(PrioritizedKSPAgent):
         # the number of paths to consider
         self.mode = mode
 
-    def assign_spectrum(self, net, path: list, n_req_slot: int) -> int:
-        # spectrum utilization on the whole path
-        path_slot = net.path_slot(path)
+    def assign_spectrum(self, net, cand, n_req_slot: int) -> int:
         # search 
-        slot_index = SpectrumAssignment.entropy(net, path, n_req_slot, self.mode)
+        slot_index = SpectrumAssignment.entropy(net, cand.path, n_req_slot, self.mode)
         return slot_index
 
 
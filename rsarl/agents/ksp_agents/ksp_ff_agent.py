@@ -1,4 +1,4 @@
-
+from rsarl.data import Action
 from rsarl.algorithms import SpectrumAssignment
 from rsarl.agents import PrioritizedKSPAgent
 
@@ -17,10 +17,30 @@ class KSP_FF_Agent(PrioritizedKSPAgent):
     def __init__(self, k: int):
         super().__init__(k)
 
-    def assign_spectrum(self, net, path: list, n_req_slot: int) -> int:
+    def assign_spectrum(self, net, cand, n_req_slot: int) -> int:
         # spectrum utilization on the whole path
-        path_slot = net.path_slot(path)
+        path_slot = cand.slot_mask(net)
         # search 
         slot_index = SpectrumAssignment.first_fit(path_slot, n_req_slot)
         return slot_index
-    
\ No newline at end of file
+
+    def batch_act(self, observations: list):
+        # first-fit of all candidate paths of all observations at once
+        slot_idx, n_req_slot = self.path_catalog.batch_first_fit(
+            [o.net for o in observations],
+            [(o.request.source, o.request.destination) for o in observations],
+            [o.request.bandwidth for o in observations])
+        # the first assignable path in order of priority
+        is_assignable = slot_idx >= 0
+        path_idx = is_assignable.argmax(axis=1)
+
+        acts = []
+        for b, obs in enumerate(observations):
+            if not is_assignable[b, path_idx[b]]:
+                acts.append(None)
+                continue
+            i = path_idx[b]
+            src, dst, _, duration = obs.request
+            path = self.path_catalog[(src, dst)][i].path
+            acts.append(Action(path, int(slot_idx[b, i]), int(n_req_slot[b, i]), duration))
+        return acts
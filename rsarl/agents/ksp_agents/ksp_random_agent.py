@@ -15,9 +15,9 @@ class KSP_RANDOM_Agent(PrioritizedKSPAgent):
     def __init__(self, k: int):
         super().__init__(k)
 
-    def assign_spectrum(self, net, path: list, n_req_slot: int) -> int:
+    def assign_spectrum(self, net, cand, n_req_slot: int) -> int:
         # spectrum utilization on the whole path
-        path_slot = net.path_slot(path)
+        path_slot = cand.slot_mask(net)
         # search 
         slot_index = SpectrumAssignment.random(path_slot, n_req_slot)
         return slot_index
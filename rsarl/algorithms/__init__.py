@@ -1,4 +1,7 @@
 
 from rsarl.algorithms import drl
+from rsarl.algorithms import sa_kernel
 from rsarl.algorithms.routing import Routing
+from rsarl.algorithms.ksp_table import build_ksp_table, all_pairs_k_shortest_paths, networkx_k_shortest_paths
+from rsarl.algorithms.path_catalog import PathCatalog, CandidatePath
 from rsarl.algorithms.sa import SpectrumAssignment
@@ -0,0 +1,313 @@
+
+
+import os
+import json
+import hashlib
+from heapq import heappush, heappop
+from multiprocessing import Pool
+
+from rsarl.networks import Network
+from rsarl.algorithms.routing import Routing
+
+
+# algorithms to build the table. Yen's algorithm is faster,
+# but paths of equal length can be in different order from networkx
+KSP_ALGORITHMS = ("networkx", "yen")
+# bumped when paths built by an algorithm change, to invalidate cache files
+KSP_CACHE_VERSION = 1
+
+
+def weighted_adjacency(net: Network) -> dict:
+    """Get adjacency of the network with edge weight.
+
+    Args:
+        net (Network): The target network
+
+    Returns:
+        dict: adj[u][v] is weight of edge (u, v), 1 if net is not weighted.
+
+    """
+    adj = {u: {} for u in net.G.nodes()}
+    for u, v, w in net.G.edges(data='weight', default=1):
+        w = w if net.is_weight else 1
+        adj[u][v] = w
+        adj[v][u] = w
+    return adj
+
+
+def shortest_path_tree(adj: dict, root: int) -> tuple:
+    """Dijkstra's algorithm from the root.
+
+    Args:
+        adj (dict): weighted adjacency
+        root (int): root node
+
+    Returns:
+        tuple: dist (dict) is distance from each node to the root and
+            next_hop (dict) is the next node on the shortest path towards the root.
+
+    """
+    dist = {root: 0}
+    next_hop = {root: None}
+    done = set()
+    heap = [(0, root)]
+    while heap:
+        d, u = heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in adj[u].items():
+            if v not in dist or d + w < dist[v]:
+                dist[v] = d + w
+                next_hop[v] = u
+                heappush(heap, (d + w, v))
+    return dist, next_hop
+
+
+def _tree_path(next_hop: dict, node: int) -> list:
+    path = [node]
+    while next_hop[node] is not None:
+        node = next_hop[node]
+        path.append(node)
+    return path
+
+
+def _spur_path(adj: dict, tree: tuple, spur: int, ignore_nodes: set, ignore_edges: set) -> tuple:
+    """Search the shortest path from spur to the root of tree avoiding nodes and edges.
+
+    The path on the tree is reused if it is not blocked. Otherwise, A* search is
+    performed whose heuristic is the distance on the tree, i.e., the exact
+    distance without the restriction.
+
+    """
+    dist, next_hop = tree
+    if spur not in dist:
+        return None
+
+    path = _tree_path(next_hop, spur)
+    is_blocked = any(v in ignore_nodes for v in path) \
+        or any((u, v) in ignore_edges or (v, u) in ignore_edges for u, v in zip(path, path[1:]))
+    if not is_blocked:
+        return dist[spur], path
+
+    target = path[-1]
+    g = {spur: 0}
+    prev = {spur: None}
+    done = set()
+    heap = [(dist[spur], 0, spur)]
+    while heap:
+        _, d, u = heappop(heap)
+        if u == target:
+            return d, _tree_path(prev, u)[::-1]
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in adj[u].items():
+            if v in ignore_nodes or v in done or v not in dist:
+                continue
+            if (u, v) in ignore_edges or (v, u) in ignore_edges:
+                continue
+            if v not in g or d + w < g[v]:
+                g[v] = d + w
+                prev[v] = u
+                heappush(heap, (d + w + dist[v], d + w, v))
+    return None
+
+
+def yen_k_shortest_paths(adj: dict, source: int, k: int, tree: tuple) -> list:
+    """Yen's algorithm for loopless k-shortest paths.
+
+    Args:
+        adj (dict): weighted adjacency
+        source (int): source node
+        k (int): the number of paths to search
+        tree (tuple): shortest path tree rooted at the destination node
+
+    Returns:
+        list: list of list of node ids between source and destination nodes.
+
+    """
+    dist, next_hop = tree
+    if source not in dist:
+        return []
+
+    paths = [_tree_path(next_hop, source)]
+    seen = {tuple(paths[0])}
+    candidates = []
+    n_pushed = 0
+    while len(paths) < k:
+        prev_path = paths[-1]
+        ignore_nodes = set()
+        root_length = 0
+        for i in range(1, len(prev_path)):
+            root = prev_path[:i]
+            ignore_edges = {(p[i - 1], p[i]) for p in paths if p[:i] == root}
+            spur = _spur_path(adj, tree, root[-1], ignore_nodes, ignore_edges)
+            if spur is not None:
+                path = root[:-1] + spur[1]
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heappush(candidates, (root_length + spur[0], n_pushed, path))
+                    n_pushed += 1
+            ignore_nodes.add(root[-1])
+            root_length += adj[prev_path[i - 1]][prev_path[i]]
+
+        if not candidates:
+            break
+        paths.append(heappop(candidates)[2])
+    return paths
+
+
+# arguments shared by the tasks in a worker process
+_worker_args = None
+
+
+def _init_worker(adj: dict, trees: dict, k: int):
+    global _worker_args
+    _worker_args = (adj, trees, k)
+
+
+def _source_k_shortest_paths(adj: dict, trees: dict, k: int, s: int) -> list:
+    """Search k-shortest paths from the source to all nodes with larger id. """
+    return [yen_k_shortest_paths(adj, s, k, trees[d]) for d in range(s + 1, len(adj))]
+
+
+def _worker_task(s: int) -> list:
+    return _source_k_shortest_paths(*_worker_args, s)
+
+
+def all_pairs_k_shortest_paths(net: Network, k: int, n_workers: int=1) -> dict:
+    """Search k-shortest paths between all pairs of nodes.
+
+    A shortest path tree is computed once per destination and reused by
+    all sources and all spur paths of Yen's algorithm.
+
+    Args:
+        net (Network): The target network
+        k (int): the number of paths to search
+        n_workers (int): The number of processes. Paths from each source 
+            are searched as a task of the process pool if greater than 1.
+
+    Returns:
+        dict: key is sorted source-destination tuple and value is list of paths
+
+    """
+    adj = weighted_adjacency(net)
+    trees = {d: shortest_path_tree(adj, d) for d in range(net.n_nodes)}
+    sources = range(net.n_nodes)
+    if n_workers > 1:
+        with Pool(n_workers, initializer=_init_worker, initargs=(adj, trees, k)) as pool:
+            # results are in order of sources
+            results = pool.map(_worker_task, sources, chunksize=1)
+    else:
+        results = [_source_k_shortest_paths(adj, trees, k, s) for s in sources]
+
+    path_table = {}
+    for s, paths_list in zip(sources, results):
+        for d, paths in enumerate(paths_list, start=s + 1):
+            path_table[(s, d)] = paths
+    return path_table
+
+
+def _networkx_source_paths(net: Network, k: int, s: int) -> list:
+    """Search k-shortest paths from the source to all nodes with larger id by networkx. """
+    return [Routing.k_shortest_paths(net, s, d, k, is_weight=net.is_weight) for d in range(s + 1, net.n_nodes)]
+
+
+def _init_networkx_worker(net: Network, k: int):
+    global _worker_args
+    _worker_args = (net, k)
+
+
+def _networkx_worker_task(s: int) -> list:
+    return _networkx_source_paths(*_worker_args, s)
+
+
+def networkx_k_shortest_paths(net: Network, k: int, n_workers: int=1) -> dict:
+    """Search k-shortest paths between all pairs of nodes by networkx, i.e., Routing.k_shortest_paths().
+
+    Args:
+        net (Network): The target network
+        k (int): the number of paths to search
+        n_workers (int): The number of processes. Paths from each source 
+            are searched as a task of the process pool if greater than 1.
+
+    Returns:
+        dict: key is sorted source-destination tuple and value is list of paths
+
+    """
+    sources = range(net.n_nodes)
+    if n_workers > 1:
+        with Pool(n_workers, initializer=_init_networkx_worker, initargs=(net, k)) as pool:
+            # results are in order of sources
+            results = pool.map(_networkx_worker_task, sources, chunksize=1)
+    else:
+        results = [_networkx_source_paths(net, k, s) for s in sources]
+
+    path_table = {}
+    for s, paths_list in zip(sources, results):
+        for d, paths in enumerate(paths_list, start=s + 1):
+            path_table[(s, d)] = paths
+    return path_table
+
+
+def ksp_cache_key(net: Network, k: int, algorithm: str="networkx") -> str:
+    """Get key of k-shortest path table, i.e., hash of topology name, edge weights, k, 
+    algorithm and cache version.
+
+    Args:
+        net (Network): The target network
+        k (int): the number of paths
+        algorithm (str): algorithm to build the table
+
+    Returns:
+        str: hex digest
+
+    """
+    edges = sorted(net.G.edges(data='weight', default=1)) if net.is_weight else sorted(net.G.edges())
+    data = json.dumps([net.name, net.is_weight, k, edges, algorithm, KSP_CACHE_VERSION])
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def _search_ksp_table(net: Network, k: int, n_workers: int, algorithm: str) -> dict:
+    if algorithm == "yen":
+        return all_pairs_k_shortest_paths(net, k, n_workers)
+    return networkx_k_shortest_paths(net, k, n_workers)
+
+
+def build_ksp_table(net: Network, k: int, cache_dir: str=None, n_workers: int=1, algorithm: str="networkx") -> dict:
+    """Build k-shortest path table, loading it from cache file if exists.
+
+    Args:
+        net (Network): The target network
+        k (int): the number of paths
+        cache_dir (str): directory of cache files. Cache is not used if None.
+        n_workers (int): The number of processes to search paths.
+        algorithm (str): "networkx" searches paths in the same order as Routing.k_shortest_paths().
+            "yen" is faster, but paths of equal length may be in different order.
+
+    Returns:
+        dict: key is sorted source-destination tuple and value is list of paths
+
+    Raises:
+        ValueError: When the algorithm is unknown.
+
+    """
+    if algorithm not in KSP_ALGORITHMS:
+        raise ValueError(f"unknown algorithm: {algorithm}, expected one of {KSP_ALGORITHMS}")
+    if cache_dir is None:
+        return _search_ksp_table(net, k, n_workers, algorithm)
+
+    cache_path = os.path.join(cache_dir, f"ksp_{net.name}_{k}_{ksp_cache_key(net, k, algorithm)}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return {(s, d): paths for s, d, paths in json.load(f)}
+
+    path_table = _search_ksp_table(net, k, n_workers, algorithm)
+    os.makedirs(cache_dir, exist_ok=True)
+    # write and rename not to leave broken file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump([[s, d, paths] for (s, d), paths in path_table.items()], f)
+    os.replace(tmp_path, cache_path)
+    return path_table
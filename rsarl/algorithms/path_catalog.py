@@ -0,0 +1,178 @@
+
+
+import numpy as np
+from typing import NamedTuple
+from rsarl.utils import cal_slot, sort_tuple
+from rsarl.algorithms import sa_kernel
+
+
+class CandidatePath(NamedTuple):
+    path: list
+    rows: np.ndarray         # row indices of edges on the path
+    distance: int            # physical length of the path
+    n_slot_table: np.ndarray # required number of slots indexed by bandwidth
+    guard: int = 0           # slot guard
+
+    def n_req_slot(self, bandwidth: int) -> int:
+        """Get the number of required slots.
+
+        Args:
+            bandwidth (int): required bandwidth
+
+        Returns:
+            int: the number of required slots
+
+        """
+        if 0 <= bandwidth < len(self.n_slot_table):
+            return int(self.n_slot_table[bandwidth])
+        return cal_slot(bandwidth, self.distance, self.guard)
+
+    def slot_mask(self, net) -> np.ndarray:
+        """Calculate AND for slot table of edges on the path by its rows.
+
+        Args:
+            net (Network): The target network
+
+        Returns:
+            np.ndarray: bool array whose size is n_slot. True is available.
+
+        """
+        return net.slot_rows(self.rows).all(axis=0)
+
+
+class PathCatalog:
+    """Precomputed properties of candidate paths between all pairs of nodes.
+
+    Besides CandidatePath of each pair, edge rows of all paths are kept in
+    a padded (n_pairs, k, max_hops) array so that slots of the candidate paths
+    of many requests are gathered and evaluated at once. A path shorter than
+    max_hops is padded with its own last row, which does not change AND of slots.
+
+    Args:
+        net (Network): The target network
+        path_table (dict): key is sorted source-destination tuple and value is list of paths
+        max_bandwidth (int): The maximum bandwidth in the table of required slots.
+            Larger bandwidth is calculated on demand.
+        guard (int): slot guard
+
+    """
+
+    def __init__(self, net, path_table: dict, max_bandwidth: int=100, guard: int=0):
+        bandwidths = range(max_bandwidth + 1)
+        self.catalog = {}
+        for sd, paths in path_table.items():
+            candidates = []
+            for path in paths:
+                distance = net.distance(path)
+                candidates.append(CandidatePath(
+                    path=path,
+                    rows=np.array(net.path_rows(path), dtype=np.intp),
+                    distance=distance,
+                    n_slot_table=np.array([cal_slot(b, distance, guard) for b in bandwidths]),
+                    guard=guard,
+                ))
+            self.catalog[sd] = candidates
+
+        # padded arrays for batched evaluation
+        self.pair_index = {sd: i for i, sd in enumerate(self.catalog)}
+        k = max(len(cands) for cands in self.catalog.values())
+        max_hops = max(len(c.rows) for cands in self.catalog.values() for c in cands)
+        n_pairs = len(self.catalog)
+        self.padded_rows = np.zeros((n_pairs, k, max_hops), dtype=np.intp)
+        self.is_valid = np.zeros((n_pairs, k), dtype=bool)
+        self.padded_n_slot = np.zeros((n_pairs, k, len(bandwidths)), dtype=np.int64)
+        for sd, i in self.pair_index.items():
+            for j, cand in enumerate(self.catalog[sd]):
+                self.padded_rows[i, j, :len(cand.rows)] = cand.rows
+                self.padded_rows[i, j, len(cand.rows):] = cand.rows[-1]
+                self.is_valid[i, j] = True
+                self.padded_n_slot[i, j] = cand.n_slot_table
+
+
+    def __getitem__(self, sd: tuple) -> list:
+        """Get candidate paths.
+
+        Args:
+            sd (tuple): pair of source and destination nodes
+
+        Returns:
+            list: list of CandidatePath
+
+        """
+        return self.catalog[sort_tuple(sd)]
+
+
+    def path_slot_masks(self, net, sd: tuple) -> np.ndarray:
+        """Calculate AND for slot table of each candidate path at once.
+
+        Args:
+            net (Network): The target network
+            sd (tuple): pair of source and destination nodes
+
+        Returns:
+            np.ndarray: (k, n_slot) bool array. Rows of missing paths are all False.
+
+        """
+        i = self.pair_index[sort_tuple(sd)]
+        masks = net.slot_rows(self.padded_rows[i]).all(axis=1)
+        masks &= self.is_valid[i, :, None]
+        return masks
+
+
+    def batch_path_slot_masks(self, nets: list, sds: list) -> np.ndarray:
+        """Calculate AND for slot table of each candidate path of all requests at once.
+
+        Args:
+            nets (list): network of each request
+            sds (list): pair of source and destination nodes of each request
+
+        Returns:
+            np.ndarray: (n_batch, k, n_slot) bool array. Rows of missing paths are all False.
+
+        """
+        return np.stack([self.path_slot_masks(net, sd) for net, sd in zip(nets, sds)])
+
+
+    def batch_n_req_slot(self, sds: list, bandwidths: list) -> np.ndarray:
+        """Get the number of required slots of each candidate path of all requests at once.
+
+        Args:
+            sds (list): pair of source and destination nodes of each request
+            bandwidths (list): required bandwidth of each request
+
+        Returns:
+            np.ndarray: (n_batch, k) int array. Missing paths require 0 slots.
+
+        """
+        n_req_slot = np.empty((len(sds), self.is_valid.shape[1]), dtype=np.int64)
+        for b, (sd, bandwidth) in enumerate(zip(sds, bandwidths)):
+            if 0 <= bandwidth < self.padded_n_slot.shape[2]:
+                n_req_slot[b] = self.padded_n_slot[self.pair_index[sort_tuple(sd)], :, bandwidth]
+            else:
+                cands = self[sd]
+                n_req_slot[b] = [c.n_req_slot(bandwidth) for c in cands] + [0] * (n_req_slot.shape[1] - len(cands))
+        return n_req_slot
+
+
+    def batch_first_fit(self, nets: list, sds: list, bandwidths: list) -> tuple:
+        """Search first-fit slot index of all candidate paths of all requests at once.
+
+        Args:
+            nets (list): network of each request
+            sds (list): pair of source and destination nodes of each request
+            bandwidths (list): required bandwidth of each request
+
+        Returns:
+            tuple: (n_batch, k) int arrays of slot index and the number of required slots.
+                Slot index is -1 when the path is not assignable.
+
+        """
+        pairs = np.array([self.pair_index[sort_tuple(sd)] for sd in sds], dtype=np.intp)
+        masks = self.batch_path_slot_masks(nets, sds)
+        n_batch, k, n_slot = masks.shape
+        n_req_slot = self.batch_n_req_slot(sds, bandwidths)
+
+        slot_idx = sa_kernel.batch_first_fit(masks.reshape(-1, n_slot), n_req_slot.reshape(-1))
+        slot_idx = slot_idx.reshape(n_batch, k)
+        slot_idx[~self.is_valid[pairs]] = -1
+        return slot_idx, n_req_slot
@@ -1,51 +1,90 @@
-
 import random
 import numpy as np
 from bitarray import bitarray
-from rsarl.utils import assignable_indices
+from rsarl.algorithms import sa_kernel
 from rsarl.utils.fragmentation import path_based_entropy, edge_based_entropy
 
 
 class SpectrumAssignment:
     """ Spectrum Assignment Class 
+
+    Slot of the path can be given either as bitarray or as NumPy array,
+    e.g., ArrayNetwork.path_slot_array().
     
     """
     @staticmethod
-    def random(slot: bitarray, n_req_slot: int) -> int:
+    def random(slot, n_req_slot: int) -> int:
         """Random algorithm searches assignable indices
         Args:
-            slot (bitarray): slot bitarray.
+            slot (bitarray or np.ndarray): slot of the path.
             n_req_slot (int): the number of required slots.
 
         Returns:
             int: index   
             
         """
-        slot_indices = assignable_indices(slot, n_req_slot)
-        if slot_indices:
-            return random.choice(slot_indices)
-        else:
-            return None
+        return sa_kernel.random_fit(sa_kernel.to_mask(slot), n_req_slot, rng=random)
 
 
     @staticmethod
-    def first_fit(slot: bitarray, n_req_slot: int) -> int:
+    def first_fit(slot, n_req_slot: int) -> int:
         """ First-fit algorithm searches assignable indices. 
 
         Args:
-            slot (bitarray): slot bitarray.
+            slot (bitarray or np.ndarray): slot of the path.
             n_req_slot (int): the number of required slots.
 
         Returns:
             int: index
         
         """
-        slot_indices = assignable_indices(slot, n_req_slot)
+        return sa_kernel.first_fit(sa_kernel.to_mask(slot), n_req_slot)
 
-        if slot_indices:
-            return slot_indices[0]
-        else:
-            return None
+
+    @staticmethod
+    def last_fit(slot, n_req_slot: int) -> int:
+        """ Last-fit algorithm searches the highest assignable index. 
+
+        Args:
+            slot (bitarray or np.ndarray): slot of the path.
+            n_req_slot (int): the number of required slots.
+
+        Returns:
+            int: index
+        
+        """
+        return sa_kernel.last_fit(sa_kernel.to_mask(slot), n_req_slot)
+
+
+    @staticmethod
+    def best_fit(slot, n_req_slot: int) -> int:
+        """ Best-fit algorithm searches the smallest available block that fits. 
+
+        Args:
+            slot (bitarray or np.ndarray): slot of the path.
+            n_req_slot (int): the number of required slots.
+
+        Returns:
+            int: index
+        
+        """
+        return sa_kernel.best_fit(sa_kernel.to_mask(slot), n_req_slot)
+
+
+    @staticmethod
+    def exact_fit(slot, n_req_slot: int) -> int:
+        """ Exact-fit algorithm searches the available block of exactly required size, 
+        otherwise falls back to first-fit. 
+
+        Args:
+            slot (bitarray or np.ndarray): slot of the path.
+            n_req_slot (int): the number of required slots.
+
+        Returns:
+            int: index
+        
+        """
+        return sa_kernel.exact_fit(sa_kernel.to_mask(slot), n_req_slot)
 
 
     @staticmethod
@@ -0,0 +1,211 @@
+
+
+import random
+import numpy as np
+from bitarray import bitarray
+
+
+def to_mask(slot) -> np.ndarray:
+    """Convert slot into bool mask.
+
+    Args:
+        slot (bitarray or array-like): slot whose 1 is available, otherwise occupied.
+
+    Returns:
+        np.ndarray: bool array. True is available.
+
+    """
+    if isinstance(slot, bitarray):
+        return np.frombuffer(slot.unpack(), dtype=bool)
+    return np.asarray(slot, dtype=bool)
+
+
+def fit_mask(mask: np.ndarray, n: int) -> np.ndarray:
+    """Search start positions where n consecutive slots are available.
+
+    Counts available slots in every window of width n with a cumulative sum,
+    i.e., the window [i, i + n) is feasible iff cumsum[i + n] - cumsum[i] == n.
+    The last axis is regarded as slot, so that mask can be batched.
+
+    Args:
+        mask (np.ndarray): (..., n_slot) bool array. True is available.
+        n (int): the number of required slots.
+
+    Returns:
+        np.ndarray: (..., n_slot - n + 1) bool array. True is a feasible start index.
+
+    """
+    n_slot = mask.shape[-1]
+    if n > n_slot:
+        return np.zeros(mask.shape[:-1] + (0, ), dtype=bool)
+    cumsum = np.zeros(mask.shape[:-1] + (n_slot + 1, ), dtype=np.int32)
+    np.cumsum(mask, axis=-1, out=cumsum[..., 1:])
+    return (cumsum[..., n:] - cumsum[..., :n_slot - n + 1]) == n
+
+
+def free_blocks(mask: np.ndarray) -> tuple:
+    """Search maximal blocks of consecutive available slots.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+
+    Returns:
+        tuple: (start indices, lengths) of blocks in ascending order of start index.
+
+    """
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    return starts, ends - starts
+
+
+def first_fit(mask: np.ndarray, n: int) -> int:
+    """Get the lowest feasible start index.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+        n (int): the number of required slots.
+
+    Returns:
+        int: index, or None if there is no feasible index.
+
+    """
+    fit = fit_mask(mask, n)
+    if not fit.any():
+        return None
+    return int(fit.argmax())
+
+
+def last_fit(mask: np.ndarray, n: int) -> int:
+    """Get the highest feasible start index.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+        n (int): the number of required slots.
+
+    Returns:
+        int: index, or None if there is no feasible index.
+
+    """
+    fit = fit_mask(mask, n)
+    if not fit.any():
+        return None
+    return fit.size - 1 - int(fit[::-1].argmax())
+
+
+def random_fit(mask: np.ndarray, n: int, rng=random) -> int:
+    """Get a feasible start index at random.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+        n (int): the number of required slots.
+        rng: random generator providing choice(), python's random module by default.
+
+    Returns:
+        int: index, or None if there is no feasible index.
+
+    """
+    indices = np.flatnonzero(fit_mask(mask, n))
+    if not indices.size:
+        return None
+    return int(rng.choice(indices.tolist()))
+
+
+def best_fit(mask: np.ndarray, n: int) -> int:
+    """Get the start index of the smallest block which n slots fit in.
+
+    Ties are broken by the lowest index.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+        n (int): the number of required slots.
+
+    Returns:
+        int: index, or None if there is no feasible index.
+
+    """
+    starts, lengths = free_blocks(mask)
+    is_fit = lengths >= n
+    if not is_fit.any():
+        return None
+    # blocks which n slots do not fit in are never the smallest
+    lengths = np.where(is_fit, lengths, mask.size + 1)
+    return int(starts[lengths.argmin()])
+
+
+def exact_fit(mask: np.ndarray, n: int) -> int:
+    """Get the start index of the block of exactly n slots, otherwise first-fit.
+
+    Args:
+        mask (np.ndarray): (n_slot, ) bool array. True is available.
+        n (int): the number of required slots.
+
+    Returns:
+        int: index, or None if there is no feasible index.
+
+    """
+    starts, lengths = free_blocks(mask)
+    exact = np.flatnonzero(lengths == n)
+    if exact.size:
+        return int(starts[exact[0]])
+    return first_fit(mask, n)
+
+
+def batch_first_fit(masks: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Get the lowest feasible start index of each row at once.
+
+    Args:
+        masks (np.ndarray): (n_batch, n_slot) bool array. True is available.
+        n (np.ndarray): (n_batch, ) the number of required slots of each row.
+
+    Returns:
+        np.ndarray: (n_batch, ) index of each row, -1 if there is no feasible index.
+
+    """
+    n_batch, n_slot = masks.shape
+    n = np.asarray(n, dtype=np.int64).reshape(n_batch, 1)
+    cumsum = np.zeros((n_batch, n_slot + 1), dtype=np.int32)
+    np.cumsum(masks, axis=1, out=cumsum[:, 1:])
+    # end of the window starting from each index
+    ends = np.arange(n_slot) + n
+    in_range = ends <= n_slot
+    window = np.take_along_axis(cumsum, np.minimum(ends, n_slot), axis=1) - cumsum[:, :n_slot]
+    fit = (window == n) & in_range
+    return np.where(fit.any(axis=1), fit.argmax(axis=1), -1)
+
+
+def batch_fit_blocks(masks: np.ndarray, n: np.ndarray) -> tuple:
+    """Summarize blocks which n slots fit in of each row at once.
+
+    Blocks are maximal runs of available slots whose length is at least n of the row,
+    i.e., the vectors found by rsarl.utils.k_consecutive_available_slot().
+
+    Args:
+        masks (np.ndarray): (n_batch, n_slot) bool array. True is available.
+        n (np.ndarray): (n_batch, ) the number of required slots of each row.
+
+    Returns:
+        tuple: (n_batch, ) int arrays of the number of blocks, start index and length 
+            of the first block, and total length of blocks. Start index and length are -1
+            if there is no block.
+
+    """
+    n_batch, n_slot = masks.shape
+    padded = np.zeros((n_batch, n_slot + 2), dtype=np.int8)
+    padded[:, 1:-1] = masks
+    diff = np.diff(padded, axis=1)
+    # starts and ends of blocks in row-major order, so that they are paired
+    batch_idx, starts = np.nonzero(diff == 1)
+    _, ends = np.nonzero(diff == -1)
+    lengths = ends - starts
+    is_fit = lengths >= np.asarray(n).reshape(-1)[batch_idx]
+    batch_idx, starts, lengths = batch_idx[is_fit], starts[is_fit], lengths[is_fit]
+
+    n_blocks = np.bincount(batch_idx, minlength=n_batch)
+    total = np.bincount(batch_idx, weights=lengths, minlength=n_batch).astype(np.int64)
+    first_start = np.full(n_batch, -1, dtype=np.int64)
+    first_length = np.full(n_batch, -1, dtype=np.int64)
+    # the first block of each row is written last
+    first_start[batch_idx[::-1]] = starts[::-1]
+    first_length[batch_idx[::-1]] = lengths[::-1]
+    return n_blocks, first_start, first_length, total
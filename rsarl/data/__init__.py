@@ -1,7 +1,7 @@
 
 from rsarl.data.action import Action
 from rsarl.data.request import Request
-from rsarl.data.observation import Observation
+from rsarl.data.observation import Observation, FeatureObservation
 from rsarl.data.experience import Experience
-from rsarl.data.db_datatype import DBEvaluation, DBExperience, DBExperiment
+from rsarl.data.db_datatype import DBEvaluation, DBEvaluationStats, DBExperience, DBExperiment
 
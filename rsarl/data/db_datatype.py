@@ -1,6 +1,7 @@
 
 
 import datetime
+import numpy as np
 from typing import NamedTuple
 
 
@@ -45,3 +46,15 @@ class DBExperience(NamedTuple):
     network: str
     slot_utilization: float
 
+
+
+class DBEvaluationStats(NamedTuple):
+    # statistics of a metric over envs, i-th element is of batch[i]
+    batch: np.ndarray
+    n_envs: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    # key is percentile in [0, 100]
+    percentiles: dict
@@ -12,6 +12,6 @@ class Experience(NamedTuple):
     n_slot: int
     is_success: bool
     reward: float
-    network: str
+    network: str # json or binary snapshot, or delta in json format
     slot_utilization: float
 
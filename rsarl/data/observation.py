@@ -6,3 +6,9 @@ from rsarl.networks import Network
 class Observation(NamedTuple):
     request: NamedTuple
     net: Network
+
+
+class FeatureObservation(NamedTuple):
+    request: NamedTuple
+    fvec: np.ndarray # feature vector for DRL agent
+    actions: list    # action of each output of DRL agent, None if not assignable
@@ -10,4 +10,5 @@ from rsarl.envs.utils import make_env
 # wrapper for pfrl
 from rsarl.envs.serial_vector_env import SerialVectorEnv, make_serial_vector_env
 from rsarl.envs.multiprocess_vector_env import MultiprocessVectorEnv, make_multiprocess_vector_env
+from rsarl.envs.batched_vector_env import BatchedVectorEnv, make_batched_vector_env
 
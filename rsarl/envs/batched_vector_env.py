@@ -0,0 +1,238 @@
+import numpy as np
+
+import pfrl
+from rsarl.data import Observation
+from rsarl.envs import make_env
+from rsarl.networks import ArrayNetwork
+
+
+class BatchedVectorEnv(pfrl.env.VectorEnv):
+    """VectorEnv where the spectrum state of all envs is stacked and stepped at once.
+
+    Slot and expiry tables of all envs are held as (n_envs, n_edges, n_slot) arrays,
+    and writes of assignment and release and updates of occupancy counters are vectorized over envs.
+    The network of each env is an ArrayNetwork whose arrays are views of the stacked ones,
+    and whose lightpaths and release events are registered as in ArrayNetwork.assign_path(),
+    so that agents and NetworkRecorder work on observations in the same way as other vector envs.
+    Features of all envs can be extracted at once by batch_preprocess() of agents, e.g., DeepRMSAv2Agent.
+
+    Note:
+        Envs must have ArrayNetwork of the same topology.
+        Reward is computed by compute_reward() of each env before assignment as in Env.step().
+
+    Args:
+        envs (list of Env): List of Env.
+
+    Attributes:
+        slot_table (np.ndarray): (n_envs, n_edges, n_slot) uint8 array. 1 is available, otherwise occupied.
+        expiry_table (np.ndarray): (n_envs, n_edges, n_slot) float array of absolute expiry time.
+        clock (np.ndarray): (n_envs, ) current simulation time of each env.
+
+    """
+
+    def __init__(self, envs):
+        self.envs = envs
+        self.nets = [env.net for env in envs]
+        if not all(isinstance(net, ArrayNetwork) for net in self.nets):
+            raise ValueError("BatchedVectorEnv requires ArrayNetwork")
+        net = self.nets[0]
+        self.n_edges, self.n_slot = net.n_edges, net.n_slot
+        self.edge_index = net.edge_index
+
+        # state of i-th env is placed at i * stride of the buffer
+        stride = -(-net.state_nbytes() // 8) * 8
+        self._buffer = bytearray(stride * self.num_envs)
+        for i, net in enumerate(self.nets):
+            net.bind_state(self._buffer, offset=i * stride)
+        # stacked views
+        for name, dtype, shape, offset in net.state_layout():
+            arr = np.ndarray(
+                (self.num_envs, ) + shape, dtype=dtype, buffer=self._buffer, offset=offset,
+                strides=(stride, ) + np.zeros(shape, dtype=dtype).strides)
+            setattr(self, name.lstrip('_'), arr)
+        # (n_envs, 1) -> (n_envs, )
+        self.clock = self.clock.reshape(-1)
+        self.n_occupied = self.n_occupied.reshape(-1)
+
+        self._rows_cache = {}
+        self.last_obs = [None] * self.num_envs
+
+
+    @property
+    def num_envs(self):
+        return len(self.envs)
+
+
+    def rows(self, path: list) -> np.ndarray:
+        key = tuple(path)
+        rows = self._rows_cache.get(key)
+        if rows is None:
+            rows = np.array(self.nets[0].path_rows(path), dtype=np.intp)
+            self._rows_cache[key] = rows
+        return rows
+
+
+    def path_slot_masks(self, rows: np.ndarray) -> np.ndarray:
+        """Calculate AND for slot table of paths of all envs at once.
+
+        Args:
+            rows (np.ndarray): (n_envs, n_paths, n_hops) row indices of edges on paths.
+                A path shorter than n_hops can be padded by its own row.
+
+        Returns:
+            np.ndarray: (n_envs, n_paths, n_slot) bool array.
+
+        """
+        env_idx = np.arange(self.num_envs).reshape(-1, 1, 1)
+        return self.slot_table[env_idx, rows].all(axis=2)
+
+
+    def resource_util(self) -> np.ndarray:
+        """Calculate slot utilization of whole network of all envs.
+
+        Returns:
+            np.ndarray: (n_envs, ) utilization.
+
+        """
+        return self.n_occupied / (self.n_edges * self.n_slot)
+
+
+    def _cells(self, items: list) -> tuple:
+        """Expand (env index, rows, slot index, the number of slots) of paths into cells.
+
+        Returns:
+            tuple: env, row and slot indices of cells, and the number of cells of each path.
+
+        """
+        env_idx, row_idx, slot_idx, lengths = [], [], [], []
+        for i, rows, start_idx, n_slot in items:
+            n = len(rows) * n_slot
+            env_idx.append(np.full(n, i))
+            row_idx.append(np.repeat(rows, n_slot))
+            slot_idx.append(np.tile(np.arange(start_idx, start_idx + n_slot), len(rows)))
+            lengths.append(n)
+        return np.concatenate(env_idx), np.concatenate(row_idx), np.concatenate(slot_idx), lengths
+
+
+    def _update_occupancy(self, env_idx: np.ndarray, row_idx: np.ndarray, slot_idx: np.ndarray, sign: int):
+        """Update occupancy counters of all envs when cells are assigned or released. """
+        np.add.at(self.n_occupied, env_idx, sign)
+        np.add.at(self.edge_occupancy, (env_idx, row_idx), sign)
+        np.add.at(self.slot_occupancy, (env_idx, slot_idx), sign)
+
+
+    def assign_paths(self, actions: list) -> np.ndarray:
+        """Assign paths of all envs at once if assignable.
+
+        Args:
+            actions (list): Action or None of each env.
+
+        Returns:
+            np.ndarray: (n_envs, ) bool array. assigned(True) or not(False)
+
+        """
+        is_success = np.zeros(self.num_envs, dtype=bool)
+        items = [
+            (i, self.rows(act.path), act.slot_idx, act.n_slot) for i, act in enumerate(actions)
+            if act is not None and act.n_slot > 0 
+            and 0 <= act.slot_idx and act.slot_idx + act.n_slot <= self.n_slot]
+        if not items:
+            return is_success
+
+        env_idx, row_idx, slot_idx, lengths = self._cells(items)
+        # all target slots of each action are available or not
+        offsets = np.cumsum([0] + lengths[:-1])
+        is_free = np.minimum.reduceat(self.slot_table[env_idx, row_idx, slot_idx], offsets) == 1
+        assigned = np.repeat(is_free, lengths)
+        env_idx, row_idx, slot_idx = env_idx[assigned], row_idx[assigned], slot_idx[assigned]
+
+        # register lightpaths so that they are released at expiry and recorded by NetworkRecorder
+        expiry = np.zeros(self.num_envs)
+        for (i, _, _, _), free in zip(items, is_free):
+            if not free:
+                continue
+            act, net = actions[i], self.nets[i]
+            lp = net.lightpaths.add(act.path, act.slot_idx, act.n_slot, net.clock, net.clock + act.duration)
+            net.scheduler.push(lp.expiry, lp.id)
+            expiry[i] = lp.expiry
+            is_success[i] = True
+
+        self.slot_table[env_idx, row_idx, slot_idx] = 0
+        self.expiry_table[env_idx, row_idx, slot_idx] = expiry[env_idx]
+        self._update_occupancy(env_idx, row_idx, slot_idx, 1)
+        return is_success
+
+
+    def spend_time(self, periods: np.ndarray):
+        """Spend time of all envs, releasing expired lightpaths.
+
+        Args:
+            periods (np.ndarray): (n_envs, ) time between requests.
+
+        """
+        self.clock += periods
+        items = []
+        for i, net in enumerate(self.nets):
+            for lightpath_id in net.scheduler.pop_expired(net.clock):
+                # already released by ArrayNetwork.release()
+                if lightpath_id not in net.lightpaths:
+                    continue
+                lp = net.lightpaths.pop(lightpath_id)
+                items.append((i, self.rows(lp.path), lp.slot_idx, lp.n_slot))
+        if not items:
+            return
+
+        env_idx, row_idx, slot_idx, _ = self._cells(items)
+        self.slot_table[env_idx, row_idx, slot_idx] = 1
+        self.expiry_table[env_idx, row_idx, slot_idx] = 0
+        self._update_occupancy(env_idx, row_idx, slot_idx, -1)
+
+
+    def step(self, actions):
+        rewards = [env.compute_reward(act) for env, act in zip(self.envs, actions)]
+        is_success = self.assign_paths(actions)
+
+        # Spend time until next request
+        self.spend_time(np.array([env.requester.time_interval() for env in self.envs]))
+
+        # Generate next path request
+        self.last_obs = [
+            Observation(request=env.requester.request(), net=net) for env, net in zip(self.envs, self.nets)]
+
+        dones = []
+        for env, obs in zip(self.envs, self.last_obs):
+            env.n_step += 1
+            env.last_obs = obs
+            dones.append(env.is_terminate())
+        infos = [
+            {"is_success": bool(s), "slot_utilization": float(u)} for s, u in zip(is_success, self.resource_util())]
+        return self.last_obs, rewards, dones, infos
+
+
+    def reset(self, mask=None):
+        if mask is None:
+            mask = np.zeros(self.num_envs)
+        for i, (m, env) in enumerate(zip(mask, self.envs)):
+            if not m:
+                self.last_obs[i] = env.reset()
+        return self.last_obs
+
+
+    def seed(self, seeds=None):
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        elif isinstance(seeds, int):
+            seeds = [seeds] * self.num_envs
+        return [env.seed(s) for env, s in zip(self.envs, seeds)]
+
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def make_batched_vector_env(env, n_env, base_seed, test):
+    process_seeds = np.arange(n_env) + base_seed * n_env
+    return BatchedVectorEnv(
+        [make_env(env, process_seeds[idx], test) for idx in range(n_env)]
+    )
@@ -1,4 +1,4 @@
-
+import copy
 from rsarl.data import Observation
 
 class Env(object):
@@ -33,11 +33,14 @@ class Env(object):
       self.n_step = 0
       
 
-    def assign_path(self, act):
+    def assign_path(self, act) -> int:
       """Assign path. 
+
+      Returns:
+        int: id of the established lightpath. 
       
       """
-      self.net.assign_path(
+      return self.net.assign_path(
         act.path, 
         act.slot_idx, 
         act.n_slot, 
@@ -114,6 +117,8 @@ class Env(object):
 
       info = {}
       info["is_success"] = is_assignable
+      # available even if observations are transformed in workers of vector env
+      info["slot_utilization"] = self.net.resource_util()
       return self.last_obs, reward, done, info
     
 
@@ -135,6 +140,20 @@ class Env(object):
       self.last_obs = Observation(request=req, net=self.net)
       return self.last_obs
 
+    def clone(self):
+      """Clone environment with cloned network and requester. 
+
+      Returns:
+        Env: cloned environment. 
+      
+      """
+      env = copy.copy(self)
+      env.net = self.net.clone()
+      env.requester = self.requester.clone()
+      if self.last_obs is not None:
+        env.last_obs = Observation(request=self.last_obs.request, net=env.net)
+      return env
+
     def seed(self, s):
       self.requester.seed(s)
 
@@ -1,28 +1,41 @@
 import signal
 import warnings
 from multiprocessing import Pipe, Process
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 from torch.distributions.utils import lazy_property
 
 import pfrl
 import functools
+from rsarl.data import Observation
 from rsarl.envs import make_env
+from rsarl.networks import ArrayNetwork
 
 
-def worker(remote, env_fn):
+def _step(env, cmd, data, action_mapper):
+    # map output of DRL agent to action on the network of this worker
+    act = data if cmd == "step" else action_mapper(env.last_obs, data)
+    ob, reward, done, info = env.step(act)
+    if cmd == "step_drlout":
+        info["action"] = act
+    return ob, reward, done, info
+
+
+def worker(remote, env_fn, obs_transform=None, action_mapper=None):
     # Ignore CTRL+C in the worker process
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     env = env_fn()
+    transform = obs_transform or (lambda ob: ob)
     try:
         while True:
             cmd, data = remote.recv()
-            if cmd == "step":
-                ob, reward, done, info = env.step(data)
-                remote.send((ob, reward, done, info))
+            if cmd in ("step", "step_drlout"):
+                ob, reward, done, info = _step(env, cmd, data, action_mapper)
+                remote.send((transform(ob), reward, done, info))
             elif cmd == "reset":
                 ob = env.reset()
-                remote.send(ob)
+                remote.send(transform(ob))
             elif cmd == "close":
                 remote.close()
                 break
@@ -34,9 +47,91 @@ def worker(remote, env_fn):
         env.close()
 
 
+def _lightpath_changes(net, known: set) -> tuple:
+    """Get lightpaths assigned and ids of lightpaths released since the last call.
+
+    known is updated to ids of the current lightpaths.
+
+    """
+    ids = net.lightpaths.ids()
+    assigned = [net.lightpaths[i] for i in ids - known]
+    released = list(known - ids)
+    known.clear()
+    known.update(ids)
+    return assigned, released
+
+
+def _apply_lightpath_changes(net, changes: tuple):
+    assigned, released = changes
+    for lightpath_id in released:
+        net.lightpaths.pop(lightpath_id)
+    for lp in assigned:
+        net.lightpaths.put(lp)
+
+
+def shared_memory_worker(remote, env_fn, shm_name, obs_transform=None, action_mapper=None):
+    """Worker whose network state is on the shared memory.
+
+    Only requests (or transformed observations), step counters and 
+    changes of lightpaths are sent to the parent process.
+
+    """
+    # Ignore CTRL+C in the worker process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = SharedMemory(name=shm_name)
+    env = env_fn()
+    env.net.bind_state(shm.buf)
+    transform = obs_transform or (lambda ob: ob.request)
+    # ids of lightpaths known by the parent process
+    known = set()
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd in ("step", "step_drlout"):
+                ob, reward, done, info = _step(env, cmd, data, action_mapper)
+                remote.send((transform(ob), env.n_step, _lightpath_changes(env.net, known), reward, done, info))
+            elif cmd == "reset":
+                ob = env.reset()
+                remote.send((transform(ob), env.n_step, _lightpath_changes(env.net, known)))
+            elif cmd == "close":
+                remote.close()
+                break
+            elif cmd == "seed":
+                remote.send(env.seed(data))
+            else:
+                raise NotImplementedError
+    finally:
+        env.close()
+        # release views before closing
+        del env
+        shm.close()
+
+
 class MultiprocessVectorEnv(pfrl.envs.MultiprocessVectorEnv):
+    """VectorEnv where each env is run in its own subprocess.
+
+    Args:
+        env_fns (list of callable): List of callables, each of which
+            returns Env that is run in its own subprocess.
+        shared_memory (bool): If True, slot and time tables of each env are placed
+            on shared memory instead of pickling the whole network on every step.
+            Networks of envs must be ArrayNetwork. Networks of observations are
+            read-only views in the parent process, where the arrays, clock
+            and occupancy counters are shared with the worker, and lightpaths are
+            synchronized on every step so that NetworkRecorder can record deltas.
+            Release events are not synchronized.
+        obs_transform (callable): If not None, observations are transformed in 
+            each worker and the results are returned instead, 
+            e.g., KSPDRLAgent.observation_transform().
+        action_mapper (callable): If not None, step_drlout() is available, which maps
+            outputs of DRL agent to actions in each worker, e.g., KSPDRLAgent.action_mapper().
+
+    Attributes:
+        n_steps (list): Step counter of each env, only in shared memory mode.
 
-    def __init__(self, env_fns):
+    """
+
+    def __init__(self, env_fns, shared_memory: bool=False, obs_transform=None, action_mapper=None):
         if np.__version__ == "1.16.0":
             warnings.warn(
                 """
@@ -46,12 +141,33 @@ See https://github.com/numpy/numpy/issues/12793 for details.
 """
             )  # NOQA
 
+        # nothing to close until workers are started
+        self.closed = True
         nenvs = len(env_fns)
+        self.shared_memory = shared_memory
+        self.obs_transform = obs_transform
+        self.action_mapper = action_mapper
+        if shared_memory:
+            # networks in the parent process to view the state of workers
+            self.views = [env_fn().net for env_fn in env_fns]
+            if not all(isinstance(net, ArrayNetwork) for net in self.views):
+                raise ValueError("shared_memory requires ArrayNetwork")
+            self.shms = [SharedMemory(create=True, size=net.state_nbytes()) for net in self.views]
+            for net, shm in zip(self.views, self.shms):
+                net.bind_state(shm.buf, readonly=True)
+
         self.remotes, self.work_remotes = zip(*[Pipe() for _ in range(nenvs)])
-        self.ps = [
-            Process(target=worker, args=(work_remote, env_fn))
-            for (work_remote, env_fn) in zip(self.work_remotes, env_fns)
-        ]
+        if shared_memory:
+            self.ps = [
+                Process(target=shared_memory_worker, args=(work_remote, env_fn, shm.name, obs_transform, action_mapper))
+                for (work_remote, env_fn, shm) in zip(self.work_remotes, env_fns, self.shms)
+            ]
+            self.n_steps = [0] * nenvs
+        else:
+            self.ps = [
+                Process(target=worker, args=(work_remote, env_fn, obs_transform, action_mapper))
+                for (work_remote, env_fn) in zip(self.work_remotes, env_fns)
+            ]
         for p in self.ps:
             p.start()
         self.last_obs = [None] * self.num_envs
@@ -61,16 +177,86 @@ See https://github.com/numpy/numpy/issues/12793 for details.
         if not self.closed:
             self.close()
 
+    def step(self, actions):
+        return self._step("step", actions)
+
+    def step_drlout(self, drl_outs):
+        """Step with outputs of DRL agent, which are mapped to actions in workers.
+
+        The mapped action is stored in info["action"].
+
+        Args:
+            drl_outs (list): output of DRL agent for each env, e.g., index of path.
+
+        """
+        if self.action_mapper is None:
+            raise ValueError("action_mapper is not given")
+        return self._step("step_drlout", drl_outs)
+
+    def _step(self, cmd, data):
+        self._assert_not_closed()
+        for remote, d in zip(self.remotes, data):
+            remote.send((cmd, d))
+        results = [remote.recv() for remote in self.remotes]
+        if not self.shared_memory:
+            self.last_obs, rews, dones, infos = zip(*results)
+            return self.last_obs, rews, dones, infos
+        obs, self.n_steps, changes, rews, dones, infos = map(list, zip(*results))
+        for net, c in zip(self.views, changes):
+            _apply_lightpath_changes(net, c)
+        self.last_obs = [self._observation(o, net) for o, net in zip(obs, self.views)]
+        return self.last_obs, rews, dones, infos
+
+    def _observation(self, ob, net):
+        # ob is a request unless transformed in the worker
+        if self.obs_transform is not None:
+            return ob
+        return Observation(request=ob, net=net)
+
+    def reset(self, mask=None):
+        if not self.shared_memory:
+            return super().reset(mask)
+        self._assert_not_closed()
+        if mask is None:
+            mask = np.zeros(self.num_envs)
+        for m, remote in zip(mask, self.remotes):
+            if not m:
+                remote.send(("reset", None))
+        obs = []
+        for i, (m, remote) in enumerate(zip(mask, self.remotes)):
+            if m:
+                obs.append(self.last_obs[i])
+            else:
+                ob, self.n_steps[i], changes = remote.recv()
+                _apply_lightpath_changes(self.views[i], changes)
+                obs.append(self._observation(ob, self.views[i]))
+        self.last_obs = obs
+        return obs
+
+    def close(self):
+        super().close()
+        if self.shared_memory:
+            # release views before unlinking
+            self.views = None
+            self.last_obs = None
+            for shm in self.shms:
+                shm.close()
+                shm.unlink()
+
     @lazy_property
     def spec(self):
         raise NotImplementedError
 
 
-def make_multiprocess_vector_env(env, n_env, base_seed, test):
+def make_multiprocess_vector_env(
+    env, n_env, base_seed, test, shared_memory=False, obs_transform=None, action_mapper=None):
     process_seeds = np.arange(n_env) + base_seed * n_env
     return MultiprocessVectorEnv(
         [
             functools.partial(make_env, env, process_seeds[idx], test)
             for idx in range(n_env)
-        ]
+        ],
+        shared_memory=shared_memory,
+        obs_transform=obs_transform,
+        action_mapper=action_mapper,
     )
\ No newline at end of file
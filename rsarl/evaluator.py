@@ -1,13 +1,49 @@
 
 
 import numpy as np
+from statistics import NormalDist
 from typing import NamedTuple
 from collections import defaultdict
 
 from rsarl.utils import list_to_str
-from rsarl.data import Experience
+from rsarl.data import Experience, FeatureObservation
+from rsarl.networks import NetworkRecorder
 
-def create_experience(req_id: int, obs, act, is_success: bool, reward: float) -> NamedTuple:
+def _make_recorder(snapshot_interval: int, binary_snapshot: bool):
+    if snapshot_interval is None and not binary_snapshot:
+        return None
+    # binary snapshot of every request by default
+    return NetworkRecorder(snapshot_interval or 1, binary_snapshot)
+
+
+def _networks(vec_env, obss) -> list:
+    """Get network of each env, which is the view of shared memory 
+    if observations are transformed in workers of vector env.
+
+    Raises:
+        ValueError: When observations are transformed and networks are not shared.
+
+    """
+    if not any(isinstance(obs, FeatureObservation) for obs in obss):
+        return [obs.net for obs in obss]
+    views = getattr(vec_env, "views", None)
+    if views is None:
+        raise ValueError(
+            "networks are required to record experiences but observations are transformed in workers, "
+            "use MultiprocessVectorEnv with shared_memory=True or streaming evaluation")
+    return views
+
+
+def create_experience(req_id: int, obs, act, is_success: bool, reward: float, recorder=None, net=None) -> NamedTuple:
+    """Create experience. 
+
+    Args:
+        recorder (NetworkRecorder): if given, network is recorded as 
+            a snapshot or delta; otherwise a full snapshot in json format. 
+        net (Network): network of the observation, obs.net if None.
+    """
+    net = obs.net if net is None else net
+    network = net.dump_json() if recorder is None else recorder.record(req_id, net)
     exp = Experience(
         request_id = req_id,
         # request info
@@ -23,16 +59,17 @@ def create_experience(req_id: int, obs, act, is_success: bool, reward: float) ->
         is_success = is_success,
         reward = reward,
         # pre-state
-        network = obs.net.dump_json(),
-        slot_utilization = obs.net.resource_util()
+        network = network,
+        slot_utilization = net.resource_util()
     )
     return exp
 
 
-def evaluation(env, agent, n_requests: int) -> tuple:
+def evaluation(env, agent, n_requests: int, snapshot_interval: int=None, binary_snapshot: bool=False) -> tuple:
     """
     """
     logs = []
+    recorder = _make_recorder(snapshot_interval, binary_snapshot)
     obs = env.last_obs
     for req_id in range(n_requests):
         # Get action from observation
@@ -40,7 +77,7 @@ def evaluation(env, agent, n_requests: int) -> tuple:
         # Do action and get next state
         next_obs, reward, done, info = env.step(act)
         # Store log
-        exp = create_experience(req_id, obs, act, info["is_success"], reward)
+        exp = create_experience(req_id, obs, act, info["is_success"], reward, recorder)
         logs.append(exp)
         # Store next state
         if done:
@@ -51,11 +88,13 @@ def evaluation(env, agent, n_requests: int) -> tuple:
     return logs
 
 
-def batch_evaluation(vec_env, agent, n_requests: int) -> tuple:
+def batch_evaluation(vec_env, agent, n_requests: int, snapshot_interval: int=None, binary_snapshot: bool=False) -> tuple:
     """
     """
     experience_lists = defaultdict(lambda: [])
+    recorders = defaultdict(lambda: _make_recorder(snapshot_interval, binary_snapshot))
     obss = vec_env.last_obs
+    nets = _networks(vec_env, obss)
     # Generate requests
     for req_id in range(n_requests):
         # Get action from observation
@@ -64,7 +103,7 @@ def batch_evaluation(vec_env, agent, n_requests: int) -> tuple:
         _, rewards, dones, infos = vec_env.step(acts)
         # Store log
         for i, (act, info, obs, rw) in enumerate(zip(acts, infos, obss, rewards)):
-            exp = create_experience(req_id, obs, act, info["is_success"], rw)
+            exp = create_experience(req_id, obs, act, info["is_success"], rw, recorders[i], nets[i])
             experience_lists[i].append(exp)
 
         # reset
@@ -74,6 +113,123 @@ def batch_evaluation(vec_env, agent, n_requests: int) -> tuple:
     return experience_lists
 
 
+class StreamingSummary():
+    """Accumulate metrics of evaluation of all envs without retaining experiences.
+
+    Args:
+        n_envs (int): The number of envs.
+        window_size (int): If not None, blocking probability is also recorded 
+            every window_size requests for confidence intervals.
+
+    Attributes:
+        n_requests (np.ndarray): (n_envs, ) the number of evaluated requests.
+        n_blocking (np.ndarray): (n_envs, ) the number of blocked requests.
+        sum_util (np.ndarray): (n_envs, ) sum of slot utilization.
+        total_rewards (np.ndarray): (n_envs, ) sum of rewards.
+
+    """
+
+    def __init__(self, n_envs: int, window_size: int=None):
+        self.window_size = window_size
+        self.n_requests = np.zeros(n_envs, dtype=np.int64)
+        self.n_blocking = np.zeros(n_envs, dtype=np.int64)
+        self.sum_util = np.zeros(n_envs)
+        self.total_rewards = np.zeros(n_envs)
+        # blocked requests of the current window and blocking probabilities of past windows
+        self._window_blocking = np.zeros(n_envs, dtype=np.int64)
+        self._window_bps = []
+
+
+    def update(self, is_success, utils, rewards):
+        """Add results of a request of each env.
+
+        Args:
+            is_success (list): assigned(True) or not(False) of each env.
+            utils (list): slot utilization of each env.
+            rewards (list): reward of each env.
+
+        """
+        is_blocked = np.logical_not(is_success)
+        self.n_requests += 1
+        self.n_blocking += is_blocked
+        self.sum_util += utils
+        self.total_rewards += rewards
+        if self.window_size is not None:
+            self._window_blocking += is_blocked
+            # all envs are updated at once
+            if self.n_requests[0] % self.window_size == 0:
+                self._window_bps.append(self._window_blocking / self.window_size * 100)
+                self._window_blocking[...] = 0
+
+
+    @property
+    def blocking_probs(self) -> np.ndarray:
+        return self.n_blocking / self.n_requests * 100
+
+
+    @property
+    def avg_utils(self) -> np.ndarray:
+        return self.sum_util / self.n_requests
+
+
+    @property
+    def window_blocking_probs(self) -> np.ndarray:
+        """(n_envs, n_windows) blocking probability of each complete window. """
+        return np.array(self._window_bps).reshape(-1, len(self.n_requests)).T
+
+
+    def confidence_interval(self, confidence: float=0.95) -> tuple:
+        """Confidence interval of blocking probability by the method of batch means over windows.
+
+        Args:
+            confidence (float): confidence level.
+
+        Returns:
+            tuple: (n_envs, ) arrays of mean of window blocking probabilities and half width of the interval.
+
+        """
+        bps = self.window_blocking_probs
+        if bps.shape[1] < 2:
+            raise ValueError("at least two complete windows are required")
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        half_width = z * bps.std(axis=1, ddof=1) / np.sqrt(bps.shape[1])
+        return bps.mean(axis=1), half_width
+
+
+    def summary(self) -> tuple:
+        """Metrics in the same format as batch_summary(). """
+        return list(self.blocking_probs), list(self.avg_utils), list(self.total_rewards)
+
+
+def batch_streaming_evaluation(vec_env, agent, n_requests: int, window_size: int=None) -> StreamingSummary:
+    """Evaluate the agent, accumulating metrics in constant memory.
+
+    Args:
+        window_size (int): size of windows of blocking probability. See StreamingSummary.
+
+    Returns:
+        StreamingSummary: accumulated metrics.
+
+    """
+    obss = vec_env.last_obs
+    stats = StreamingSummary(len(obss), window_size)
+    for _ in range(n_requests):
+        # Get action from observation
+        acts = agent.batch_act(obss)
+        # Do action and get next state
+        _, rewards, dones, infos = vec_env.step(acts)
+        # utilization after the step in the same way as create_experience()
+        utils = [
+            info["slot_utilization"] if "slot_utilization" in info else obs.net.resource_util()
+            for obs, info in zip(obss, infos)]
+        stats.update([info["is_success"] for info in infos], utils, rewards)
+        # reset
+        not_end = np.logical_not(dones)
+        obss = vec_env.reset(not_end)
+
+    return stats
+
+
 def warming_up(env, agent, n_requests: int):
     """
     """
@@ -139,9 +295,16 @@ def train(vec_env, agent, train_steps):
     obses = vec_env.last_obs
     resets = [False for _ in range(len(obses))]
 
+    # map outputs of DRL agent to actions in workers of vector env
+    step_drlout = getattr(vec_env, "action_mapper", None) is not None
+
     for _ in range(train_steps):
-        acts = agent.batch_act(obses)
-        obses, rews, dones, infos = vec_env.step(acts)
+        if step_drlout:
+            drl_outs = agent.batch_drl_act(obses)
+            obses, rews, dones, infos = vec_env.step_drlout(drl_outs)
+        else:
+            acts = agent.batch_act(obses)
+            obses, rews, dones, infos = vec_env.step(acts)
         agent.batch_observe(obses, rews, dones, resets)
         # Make mask(not_end). 0 if done/reset, 1 if pass
         end = np.logical_or(resets, dones)
@@ -157,9 +320,15 @@ def train_eval_loop(
     train_loop: int, 
 ):
     vec_env.reset()
-    for _ in range(n_loop):
-        train(vec_env, agent, train_loop)
-        evaluator(agent)
+    try:
+        for _ in range(n_loop):
+            train(vec_env, agent, train_loop)
+            evaluator(agent)
+    finally:
+        # logs written in background are lost at exit unless closed
+        close = getattr(evaluator, "close", None)
+        if close is not None:
+            close()
 
 
 class Evaluator():
@@ -170,20 +339,44 @@ class Evaluator():
         warming_up_steps=3000,
         evalutate_steps=10000,
         logger=None,
+        snapshot_interval=None,
+        binary_snapshot=False,
+        streaming=False,
+        window_size=None,
     ):
         self.env = test_env
         self.warming_up_steps = warming_up_steps
         self.evalutate_steps = evalutate_steps
         self.logger = logger
+        # record network as delta between snapshots if not None
+        self.snapshot_interval = snapshot_interval
+        # record snapshots in binary format
+        self.binary_snapshot = binary_snapshot
+        # accumulate metrics without experiences, which are not given to logger
+        self.streaming = streaming
+        self.window_size = window_size
+        # StreamingSummary of the last evaluation in streaming mode
+        self.last_summary = None
 
 
     def evaluate(self, agent):
         self.env.reset()
+        if not self.streaming:
+            # fail before warming up if experiences can not be recorded
+            _networks(self.env, self.env.last_obs)
         # eval
         batch_warming_up(self.env, agent, n_requests=self.warming_up_steps)
-        experiences = batch_evaluation(self.env, agent, n_requests=self.evalutate_steps)
-        # calc metrics
-        blocking_probs, avg_utils, total_rewards = batch_summary(experiences)
+        if self.streaming:
+            experiences = None
+            self.last_summary = batch_streaming_evaluation(
+                self.env, agent, n_requests=self.evalutate_steps, window_size=self.window_size)
+            blocking_probs, avg_utils, total_rewards = self.last_summary.summary()
+        else:
+            experiences = batch_evaluation(
+                self.env, agent, n_requests=self.evalutate_steps, 
+                snapshot_interval=self.snapshot_interval, binary_snapshot=self.binary_snapshot)
+            # calc metrics
+            blocking_probs, avg_utils, total_rewards = batch_summary(experiences)
         # logger
         if self.logger is not None:
             self.logger(agent, experiences, blocking_probs, avg_utils, total_rewards)
@@ -191,6 +384,13 @@ class Evaluator():
         return np.average(blocking_probs)
 
 
+    def close(self):
+        """Write the rest of logs and close the logger. """
+        close = getattr(self.logger, "close", None)
+        if close is not None:
+            close()
+
+
     def __call__(self, agent):
         if hasattr(agent, "drl"):
             with agent.drl.eval_mode():
@@ -0,0 +1,99 @@
+
+
+import io
+import numpy as np
+from rsarl.data import Experience
+
+# fixed-size columns and their dtypes. None of slot_index and n_slot is stored as -1.
+NUMERIC_COLUMNS = {
+    "request_id": np.int64,
+    "source": np.int32,
+    "destination": np.int32,
+    "bandwidth": np.int32,
+    "duration": np.float64,
+    "slot_index": np.int32,
+    "n_slot": np.int32,
+    "is_success": np.bool_,
+    "reward": np.float64,
+    "slot_utilization": np.float64,
+}
+
+
+def _pack_variable(values: list) -> tuple:
+    """Concatenate str or bytes values into a byte array with offsets. """
+    is_bytes = np.array([isinstance(v, bytes) for v in values], dtype=np.bool_)
+    is_none = np.array([v is None for v in values], dtype=np.bool_)
+    encoded = [b"" if v is None else v if isinstance(v, bytes) else v.encode() for v in values]
+    offsets = np.cumsum([0] + [len(v) for v in encoded], dtype=np.int64)
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return data, offsets, is_bytes, is_none
+
+
+def _unpack_variable(data: np.ndarray, offsets: np.ndarray, is_bytes: np.ndarray, is_none: np.ndarray) -> list:
+    buf = data.tobytes()
+    values = []
+    for start, end, b, n in zip(offsets[:-1], offsets[1:], is_bytes, is_none):
+        values.append(None if n else buf[start: end] if b else buf[start: end].decode())
+    return values
+
+
+def pack_experiences(experiences: list) -> bytes:
+    """Pack experiences into a blob of columnar arrays.
+
+    Args:
+        experiences (list): list of Experience.
+
+    Returns:
+        bytes: arrays in npz format.
+
+    """
+    arrays = {}
+    for name, dtype in NUMERIC_COLUMNS.items():
+        values = [getattr(exp, name) for exp in experiences]
+        arrays[name] = np.array([-1 if v is None else v for v in values], dtype=dtype)
+    for name in ("path", "network"):
+        data, offsets, is_bytes, is_none = _pack_variable([getattr(exp, name) for exp in experiences])
+        arrays[f"{name}_data"] = data
+        arrays[f"{name}_offsets"] = offsets
+        arrays[f"{name}_is_bytes"] = is_bytes
+        arrays[f"{name}_is_none"] = is_none
+    f = io.BytesIO()
+    np.savez(f, **arrays)
+    return f.getvalue()
+
+
+def unpack_columns(blob: bytes) -> dict:
+    """Unpack a blob into columns.
+
+    Args:
+        blob (bytes): blob generated by pack_experiences().
+
+    Returns:
+        dict: arrays of fixed-size columns, and lists of path and network.
+
+    """
+    with np.load(io.BytesIO(blob)) as f:
+        columns = {name: f[name] for name in NUMERIC_COLUMNS}
+        for name in ("path", "network"):
+            columns[name] = _unpack_variable(*[f[f"{name}_{k}"] for k in ("data", "offsets", "is_bytes", "is_none")])
+    return columns
+
+
+def unpack_experiences(blob: bytes) -> list:
+    """Unpack a blob into experiences.
+
+    Args:
+        blob (bytes): blob generated by pack_experiences().
+
+    Returns:
+        list: list of Experience.
+
+    """
+    columns = unpack_columns(blob)
+    experiences = []
+    for i in range(len(columns["request_id"])):
+        row = {name: columns[name][i].item() for name in NUMERIC_COLUMNS}
+        for name in ("slot_index", "n_slot"):
+            row[name] = None if row[name] == -1 else row[name]
+        experiences.append(Experience(path=columns["path"][i], network=columns["network"][i], **row))
+    return experiences
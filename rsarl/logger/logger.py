@@ -1,6 +1,12 @@
 
 import os
 import time
+import queue
+import atexit
+import shutil
+import tempfile
+import threading
+import functools
 import numpy as np
 from rsarl.logger import RSADB
 from torch.utils.tensorboard import SummaryWriter
@@ -29,8 +35,12 @@ class Logger():
         db_name = "rsa-rl.db",
         save_experience=False,
         is_overwrite=False,
+        experience_chunk=False,
         # tb params
         use_tensorboard=False, 
+        # background writer params
+        async_write=False,
+        queue_size=2,
     ):
 
         self.exp_name = exp_name
@@ -38,6 +48,8 @@ class Logger():
         self.save_agent = save_agent
         # prepare db
         self.save_experience = save_experience
+        # save experiences of all envs per batch as columnar chunks
+        self.experience_chunk = experience_chunk
         if save_experience:
             self.db = create_db(
                 exp_name,
@@ -53,6 +65,18 @@ class Logger():
         if self.use_tensorboard:
             self.writer = SummaryWriter(log_dir=f"./tb-logs/{self.exp_name}")
 
+        # db, tb and agent are written by the background thread if async_write.
+        # __call__ blocks when queue_size results are waiting to be written.
+        self.async_write = async_write
+        self._error = None
+        self._thread = None
+        if async_write:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+            # the daemon thread is killed at exit, so write the rest unless closed
+            atexit.register(self._flush_at_exit)
+
 
     def print_log(self, bps: list, utils: list, rewards: list):
         print('####################################################')
@@ -64,21 +88,51 @@ class Logger():
 
     def save_experiment(self, env, agent, hparam):
         assert self.save_experience
-        self.db.save_experiment(env, agent, hparam)
+        self._submit(functools.partial(self.db.save_experiment, env, agent, hparam))
+
+
+    def agent_dirname(self, n_steps: int=None) -> str:
+        n_steps = self.n_steps if n_steps is None else n_steps
+        return os.path.join("trained-agent", f"{n_steps}-{self.exp_name}")
 
 
     def save_drl_agent(self, agent):
         assert hasattr(agent, "drl")
-        dirname = os.path.join("trained-agent", f"{self.n_steps}-{self.exp_name}")  
+        agent.drl.save(self.agent_dirname())
+
+
+    def snapshot_drl_agent(self, agent) -> str:
+        """Save DRL agent into a temporary directory, which is moved by move_agent_snapshot().
+
+        The agent is saved by its save() in the current thread, so that the snapshot 
+        is not changed by training while it waits to be written.
+
+        Returns:
+            str: the temporary directory.
+
+        """
+        assert hasattr(agent, "drl")
+        os.makedirs("trained-agent", exist_ok=True)
+        # in the same file system as the destination
+        dirname = tempfile.mkdtemp(prefix=".snapshot-", dir="trained-agent")
         agent.drl.save(dirname)
+        return dirname
+
 
+    def move_agent_snapshot(self, snapshot_dir: str, n_steps: int=None):
+        shutil.copytree(snapshot_dir, self.agent_dirname(n_steps), dirs_exist_ok=True)
+        shutil.rmtree(snapshot_dir)
 
-    def record_db(self, experiences: dict, bps: list, utils: list, rewards: list):
+
+    def record_db(self, experiences: dict, bps: list, utils: list, rewards: list, n_steps: int=None):
+        n_steps = self.n_steps if n_steps is None else n_steps
         for i, (bp, util, rwd) in enumerate(zip(bps, utils, rewards)):
-            self.db.save_evaluation(i, self.n_steps, bp, util, rwd)
+            self.db.save_evaluation(i, n_steps, bp, util, rwd)
 
-        # save experiences
-        if np.min(bps) < self.min_bp:
+        # save experiences unless evaluated in streaming mode
+        if experiences is not None and self.experience_chunk:
+            self.db.save_experience_chunks(n_steps, experiences)
+        elif experiences is not None and np.min(bps) < self.min_bp:
             # self.min_bp = np.min(bps)
             # exp_id = int(np.argmin(bps))
             exp_id = 0
@@ -86,35 +140,140 @@ class Logger():
             self.db.save_or_update_experience(experiences[exp_id])
 
 
-    def record_tb(self, agent, bps: list, utils: list, rewards: list):
+    def record_tb(self, agent, bps: list, utils: list, rewards: list, n_steps: int=None, stats: list=None):
+        """Record metrics to tensorboard.
+
+        Args:
+            stats (list): statistics of DRL agent. Taken from the agent if None.
 
+        """
         assert (self.writer is not None) and self.use_tensorboard
+        n_steps = self.n_steps if n_steps is None else n_steps
         now = time.time()
 
         for i, (bp, util, rwd) in enumerate(zip(bps, utils, rewards)):
-            self.writer.add_scalar(f"env-bp/env{i}", bp, self.n_steps, now)
-            self.writer.add_scalar(f"env-util/env{i}", util, self.n_steps, now)
-            self.writer.add_scalar(f"env-reward/env{i}", rwd, self.n_steps, now)
+            self.writer.add_scalar(f"env-bp/env{i}", bp, n_steps, now)
+            self.writer.add_scalar(f"env-util/env{i}", util, n_steps, now)
+            self.writer.add_scalar(f"env-reward/env{i}", rwd, n_steps, now)
 
         # for DRL algorithms
-        if hasattr(agent, "drl"):        
-            for stat, value in agent.drl.get_statistics():
-                self.writer.add_scalar(f"agent/{stat}", value, self.n_steps, now)
+        if stats is None and hasattr(agent, "drl"):
+            stats = agent.drl.get_statistics()
+        for stat, value in stats or []:
+            self.writer.add_scalar(f"agent/{stat}", value, n_steps, now)
 
         self.writer.flush()
 
 
-    def __call__(self, agent, experiences: dict, blocking_probs: list, avg_utils: list, total_rewards: list):
-
-        # save evaluation
+    def _write(self, n_steps: int, experiences: dict, bps: list, utils: list, rewards: list, stats: list, snapshot_dir: str):
+        # save evaluation in a transaction
         if self.save_experience:
-            self.record_db(experiences, blocking_probs, avg_utils, total_rewards)
+            with self.db.transaction():
+                self.record_db(experiences, bps, utils, rewards, n_steps)
         # tb
         if self.use_tensorboard:
-            self.record_tb(agent, blocking_probs, avg_utils, total_rewards)
+            self.record_tb(None, bps, utils, rewards, n_steps, stats)
         # drl-agent
-        if self.save_agent:
+        if snapshot_dir is not None:
+            self.move_agent_snapshot(snapshot_dir, n_steps)
+
+
+    def _write_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                # skip the rest after an error, which is raised in the main thread
+                if self._error is None:
+                    job()
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to write logs in background") from error
+        if not self._thread.is_alive():
+            raise RuntimeError("Background writer of logs is not running")
+
+
+    def _put(self, job):
+        # block until the queue has space, unless the writer fails
+        while True:
+            self._raise_error()
+            try:
+                self._queue.put(job, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+    def _submit(self, job):
+        if self._thread is None:
+            job()
+            return
+        self._put(job)
+
+
+    def flush(self):
+        """Wait until all submitted results are written. """
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._put(done.set)
+        # the writer skips jobs after an error
+        while not done.wait(0.1):
+            self._raise_error()
+
+
+    def _flush_at_exit(self):
+        if self._thread is not None and self._thread.is_alive():
+            self.flush()
+
+
+    def close(self):
+        """Write the rest and close db and tensorboard writer. """
+        atexit.unregister(self._flush_at_exit)
+        try:
+            if self._thread is not None:
+                # stop the writer even after an error
+                while self._thread.is_alive():
+                    try:
+                        self._queue.put(None, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                self._thread.join()
+                error, self._error = self._error, None
+                self._thread = None
+                if error is not None:
+                    raise RuntimeError("Failed to write logs in background") from error
+        finally:
+            if self.save_experience:
+                self.db.close()
+            if self.use_tensorboard:
+                self.writer.close()
+
+
+    def __call__(self, agent, experiences: dict, blocking_probs: list, avg_utils: list, total_rewards: list):
+
+        # snapshot what the training loop changes after return
+        stats = None
+        if self.use_tensorboard and hasattr(agent, "drl"):
+            stats = list(agent.drl.get_statistics())
+        snapshot_dir = None
+        if self.save_agent and self.async_write:
+            snapshot_dir = self.snapshot_drl_agent(agent)
+        elif self.save_agent:
             self.save_drl_agent(agent)
+        # db, tb and agent
+        self._submit(functools.partial(
+            self._write, self.n_steps, experiences, list(blocking_probs), list(avg_utils), 
+            list(total_rewards), stats, snapshot_dir))
         # print
         self.print_log(blocking_probs, avg_utils, total_rewards)
         # count up
@@ -2,32 +2,49 @@
 
 import sys
 import json
+import numpy as np
 import datetime
 from typing import NamedTuple
 from collections import defaultdict
-from networkx.readwrite.json_graph import adjacency_graph
 
 from rsarl.utils import str_to_list
-from rsarl.data import Observation, Action, Request, DBExperience, DBExperiment, DBEvaluation
+from rsarl.networks import delta_base, replay
+from rsarl.data import Observation, Action, Request, DBExperience, DBExperiment, DBEvaluation, DBEvaluationStats
 from rsarl.agents import Agent
 from rsarl.logger import SqliteDB
+from rsarl.logger.experience_chunk import pack_experiences, unpack_columns, unpack_experiences
+
+# columns of evaluations which can be aggregated
+EVALUATION_METRICS = ("blocking_prob", "slot_utilization", "total_reward")
 
 class RSADB(SqliteDB):
+    """Database of experiments, evaluations and experiences.
+
+    Args:
+        exp_name (str): unique experiment name.
+        db_name (str): path of the database file.
+        **kwargs: options of SqliteDB, e.g., journal_mode, synchronous and cache_size.
+
+    """
 
-    def __init__(self, exp_name="", db_name="rsa-rl.db"):
-        super(RSADB, self).__init__(db_name)
+    def __init__(self, exp_name="", db_name="rsa-rl.db", **kwargs):
+        super(RSADB, self).__init__(db_name, **kwargs)
         # unique experiment name
         self.exp_name = exp_name
+        # ((experiment name, batch), experiences) of the chunk last read by the visualizer
+        self._chunk_cache = None
         # create tables if not exist
         self.create_experiment_table()
         self.create_evaluation_table()
         self.create_experience_table()
+        self.create_experience_chunk_table()
 
     def delete_experiment_info(self):
-        tables = ["experiments", "evaluations", "experiences"]
-        for table in tables:
-            sql = f""" delete from {table} where experiment_name = "{self.exp_name}" """
-            self.delete(sql)
+        tables = ["experiments", "evaluations", "experiences", "experience_chunks"]
+        with self.transaction():
+            for table in tables:
+                sql = f""" delete from {table} where experiment_name = ? """
+                self.delete(sql, (self.exp_name, ))
 
     def create_experiment_table(self):
         sql = """
@@ -58,6 +75,12 @@ class RSADB(SqliteDB):
                 )
             """
         self.create_table(sql)
+        # learning curves are read per batch
+        sql = """
+                CREATE INDEX IF NOT EXISTS 
+                evaluations_batch ON evaluations(experiment_name, batch)
+            """
+        self.create_table(sql)
 
     def create_experience_table(self):
         sql = """
@@ -74,13 +97,34 @@ class RSADB(SqliteDB):
                     n_slot INTEGER,
                     is_success BOOL,
                     reward INTEGER,
-                    network STRING,
+                    network BLOB,
                     slot_utilization REAL,
                     PRIMARY KEY (experiment_name, request_id)
                 )
             """
         self.create_table(sql)
 
+    def create_experience_chunk_table(self):
+        """Experiences of an env in an evaluation batch are stored as a blob of columnar arrays. 
+        """
+        sql = """
+                CREATE TABLE IF NOT EXISTS 
+                experience_chunks(
+                    experiment_name STRING,
+                    env_id INTEGER,
+                    batch INTEGER,
+                    n_requests INTEGER,
+                    data BLOB,
+                    PRIMARY KEY (experiment_name, env_id, batch)
+                )
+            """
+        self.create_table(sql)
+        sql = """
+                CREATE INDEX IF NOT EXISTS 
+                experience_chunks_batch ON experience_chunks(experiment_name, batch)
+            """
+        self.create_table(sql)
+
 
     def _insert(self, table_name: str, row: NamedTuple):
         sql = self._get_insert_sql(table_name, row)
@@ -94,15 +138,14 @@ class RSADB(SqliteDB):
         return sql
 
     def _experience_exist(self, target_exp_name: str) -> bool:
-        sql = f"""
-            select count(*)
-            from experiences 
-            where experiment_name = "{target_exp_name}"
+        sql = """
+            select exists(
+                select 1
+                from experiences 
+                where experiment_name = ?
+            )
             """
-        for row in self.select(sql):
-            count = row[0]
-
-        return True if count > 0 else False
+        return bool(self.select(sql, (target_exp_name, ))[0][0])
         
 
     def save_experiment(self, env, agent, hyper_params: dict):
@@ -170,14 +213,87 @@ class RSADB(SqliteDB):
         self.many_execute(sql, db_exp_list)
 
     def save_or_update_experience(self, experiences: list):
-        if self._experience_exist(self.exp_name):
-            self.update_experience(experiences)
-        else:
-            self.save_experience(experiences)
+        """Insert experiences, replacing those of the same request ids. """
+        db_exp_list = [DBExperience(
+            experiment_name=self.exp_name, **exp._asdict()) for exp in experiences]
+        sql = self._get_insert_sql("experiences", db_exp_list[0]).replace("INSERT", "INSERT OR REPLACE", 1)
+        self.many_execute(sql, db_exp_list)
+
+    def save_experience_chunks(self, batch: int, experiences: dict):
+        """Save experiences of all envs in a single transaction, one chunk per env. 
+
+        Args:
+            batch (int): evaluation batch.
+            experiences (dict): key is env id and value is list of Experience.
+
+        """
+        sql = """
+            INSERT OR REPLACE INTO experience_chunks (experiment_name, env_id, batch, n_requests, data) 
+            VALUES (?, ?, ?, ?, ?)
+            """
+        rows = [(self.exp_name, env_id, batch, len(exps), pack_experiences(exps)) 
+            for env_id, exps in experiences.items()]
+        self.many_execute(sql, rows)
+
+
+    def _select_chunk(self, target_exp_name: str, env_id: int, batch: int) -> bytes:
+        sql = """
+            select data
+            from experience_chunks
+            where experiment_name = ? and env_id = ? and batch = ?
+            """
+        rows = self.select(sql, (target_exp_name, env_id, batch))
+        if not rows:
+            raise KeyError(f"No experiences of env {env_id} in batch {batch} of {target_exp_name}")
+        return rows[0][0]
+
+
+    def get_experience_chunk(self, target_exp_name: str, env_id: int, batch: int) -> dict:
+        """Get experiences of the env in the batch as columns.
+
+        Returns:
+            dict: arrays of fixed-size columns, and lists of path and network.
+
+        """
+        return unpack_columns(self._select_chunk(target_exp_name, env_id, batch))
+
+
+    def get_chunk_experiences(self, target_exp_name: str, env_id: int, batch: int) -> list:
+        """Get experiences of the env in the batch.
+
+        Returns:
+            list: list of Experience.
+
+        """
+        return unpack_experiences(self._select_chunk(target_exp_name, env_id, batch))
+
+
+    def _latest_chunk_experiences(self, target_exp_name: str) -> list:
+        """Experiences of env 0 in the latest batch, which are shown instead of the experiences table. """
+        batches = self.get_chunk_batches(target_exp_name)
+        if not batches:
+            return []
+        key = (target_exp_name, batches[-1])
+        # the visualizer reads the same chunk for every request
+        cache = self._chunk_cache
+        if cache is None or cache[0] != key:
+            cache = (key, self.get_chunk_experiences(target_exp_name, 0, batches[-1]))
+            self._chunk_cache = cache
+        return cache[1]
+
+
+    def get_chunk_batches(self, target_exp_name: str) -> list:
+        sql = """
+            select distinct batch
+            from experience_chunks
+            where experiment_name = ?
+            order by batch
+            """
+        return [row[0] for row in self.select(sql, (target_exp_name, ))]
 
 
     def get_experiment_names(self) -> list:
-        sql = f"""
+        sql = """
             select experiment_name
             from experiments 
             """
@@ -189,69 +305,179 @@ class RSADB(SqliteDB):
     
 
     def get_experiment_settings(self, target_exp_name: str):
-        sql = f"""
+        sql = """
             select environment_name, 
                 network_name, 
                 agent_name, 
                 requester_name, 
                 hyper_parameters
             from experiments
-            where experiment_name = "{target_exp_name}"
+            where experiment_name = ?
         """
         
-        for env, net, agent, requester, hparams in self.select(sql):
+        for env, net, agent, requester, hparams in self.select(sql, (target_exp_name, )):
             return env, net, agent, requester, json.loads(hparams)
 
 
     def get_batches(self, target_exp_name: str):
-        sql = f"""
+        sql = """
                 select distinct batch  
                 from evaluations
-                where experiment_name = "{target_exp_name}"
+                where experiment_name = ?
+                order by batch
             """
         batch_list = []
-        for batch in self.select(sql):
+        for batch in self.select(sql, (target_exp_name, )):
             batch_list.append(batch[0])
 
         return batch_list
 
 
-    def get_bp_per_batch(self, target_exp_name: str, batches: list):
+    def get_bp_per_batch(self, target_exp_name: str, batches: list=None):
+        """Get blocking probabilities of all envs per batch by a single indexed scan.
+
+        Args:
+            target_exp_name (str): experiment name.
+            batches (list): target batches in order. All batches if None.
+
+        Returns:
+            defaultdict: key is batch and value is list of (blocking probability, ) of envs.
+
+        """
+        sql = """
+            select batch, blocking_prob
+            from evaluations
+            where experiment_name = ?
+            order by batch, env_id
+            """
+        all_bps = defaultdict(lambda: [])
+        for batch, bp in self.select(sql, (target_exp_name, )):
+            all_bps[batch].append((bp, ))
+
         bp_per_batch = defaultdict(lambda: [])
-        for batch in batches:
-            sql = f"""
-                select blocking_prob
-                from evaluations
-                where experiment_name = "{target_exp_name}"
-                and batch = {batch}
-                """
-            for bp in self.select(sql):
-                bp_per_batch[batch].append(bp)
-        
+        for batch in (all_bps if batches is None else batches):
+            if batch in all_bps:
+                bp_per_batch[batch] = all_bps[batch]
         return bp_per_batch
 
 
-    def get_act_history(self, target_exp_name:str, req_id: int):
+    def get_evaluation_stats(self, target_exp_name: str, metric: str="blocking_prob", 
+        percentiles: tuple=(25, 50, 75)) -> DBEvaluationStats:
+        """Aggregate the metric over envs per batch in a single query.
+
+        Std is the population std like np.std(), and percentiles are
+        linearly interpolated like np.percentile().
+
+        Args:
+            target_exp_name (str): experiment name.
+            metric (str): one of EVALUATION_METRICS.
+            percentiles (tuple): percentiles in [0, 100].
+
+        Returns:
+            DBEvaluationStats: statistics in order of batch.
+
+        """
+        if metric not in EVALUATION_METRICS:
+            raise ValueError(f"metric must be one of {EVALUATION_METRICS}")
+        params = {"exp_name": target_exp_name}
+        percentile_columns = []
+        for i, q in enumerate(percentiles):
+            if not 0 <= q <= 100:
+                raise ValueError("percentiles must be in [0, 100]")
+            params[f"q{i}"] = q / 100
+            # index of the value at the percentile among sorted values
+            pos = f"(:q{i} * (n - 1))"
+            lo = f"cast({pos} as integer)"
+            percentile_columns.append(f"""
+                , sum(case
+                    when rank = {lo} then value * (1 - ({pos} - {lo}))
+                    when rank = {lo} + 1 then value * ({pos} - {lo})
+                    else 0 end)""")
         sql = f"""
+            with ranked as (
+                select batch, 
+                    {metric} as value,
+                    avg({metric}) over w as mean,
+                    row_number() over (w order by {metric}) - 1 as rank,
+                    count(*) over w as n
+                from evaluations
+                where experiment_name = :exp_name
+                window w as (partition by batch)
+            )
+            select batch, 
+                count(*), 
+                avg(value), 
+                avg((value - mean) * (value - mean)), 
+                min(value), 
+                max(value)
+                {"".join(percentile_columns)}
+            from ranked
+            group by batch
+            order by batch
+            """
+        rows = self.select(sql, params)
+        columns = [np.array(c) for c in zip(*rows)] if rows else [np.empty(0)] * (6 + len(percentiles))
+        batch, n_envs, mean, var, min_values, max_values = columns[:6]
+        return DBEvaluationStats(
+            batch=batch.astype(np.int64),
+            n_envs=n_envs.astype(np.int64),
+            mean=mean.astype(np.float64),
+            std=np.sqrt(var.astype(np.float64)),
+            min=min_values.astype(np.float64),
+            max=max_values.astype(np.float64),
+            percentiles={q: c.astype(np.float64) for q, c in zip(percentiles, columns[6:])},
+        )
+
+
+    def get_act_history(self, target_exp_name:str, req_id: int):
+        sql = """
             select source, destination, bandwidth, duration, path, slot_index, n_slot, network
             from experiences 
-            where experiment_name = "{target_exp_name}"
-            and request_id = {req_id}
+            where experiment_name = ?
+            and request_id = ?
             """
-        db_row = self.select(sql)[0]
+        db_rows = self.select(sql, (target_exp_name, req_id))
+        # experiences saved as chunks
+        chunk = [] if db_rows else self._latest_chunk_experiences(target_exp_name)
+        if db_rows:
+            db_row = db_rows[0]
+        else:
+            exp = next((x for x in chunk if x.request_id == req_id), None)
+            if exp is None:
+                raise KeyError(f"request {req_id} of experiment {target_exp_name} is not found")
+            db_row = (exp.source, exp.destination, exp.bandwidth, exp.duration, 
+                exp.path, exp.slot_index, exp.n_slot, exp.network)
         path = str_to_list(db_row[4]) if db_row[4] is not None else None
         act = Action(path=path, slot_idx=db_row[5], n_slot=db_row[6], duration=db_row[3])
         req = Request(source=db_row[0], destination=db_row[1], bandwidth=db_row[2], duration=db_row[3])
-        G = adjacency_graph(json.loads(db_row[7]))
-        return act, req, G
+        # rebuild network from the snapshot and deltas
+        records = [db_row[7]]
+        base = delta_base(db_row[7])
+        if base is not None and db_rows:
+            sql = """
+                select network
+                from experiences 
+                where experiment_name = ?
+                and request_id >= ?
+                and request_id < ?
+                order by request_id
+                """
+            records = [row[0] for row in self.select(sql, (target_exp_name, base, req_id))] + records
+        elif base is not None:
+            records = [x.network for x in chunk if base <= x.request_id < req_id] + records
+        state = replay(records)
+        return act, req, state
 
     def get_n_request_to_evaluate(self, target_exp_name: str):
-        sql = f"""
+        sql = """
             select COUNT(*) 
             from experiences
-            where experiment_name == "{target_exp_name}"
+            where experiment_name = ?
             """
         
-        num = self.select(sql)[0][0]
+        num = self.select(sql, (target_exp_name, ))[0][0]
+        if num == 0:
+            # experiences saved as chunks
+            num = len(self._latest_chunk_experiences(target_exp_name))
         return num
 
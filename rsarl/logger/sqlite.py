@@ -1,59 +1,139 @@
-
-import sys
 import sqlite3
-from threading import Lock
+import weakref
+import threading
+from contextlib import contextmanager
+
+
+class _ThreadConnection():
+    """Connection held by thread-local storage, which is closed when the thread exits. """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        weakref.finalize(self, conn.close)
 
-lock = Lock()
 
 class SqliteDB():
+    """SQLite database with a write connection and per-thread read connections.
 
-    def __init__(self, db_name: str="rsa-rl"):
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
+    Args:
+        db_name (str): path of the database file.
+        journal_mode (str): journal mode, e.g., "WAL" to read while writing, or "DELETE".
+        synchronous (str): synchronous level, "OFF", "NORMAL" or "FULL".
+        cache_size (int): page cache size in pages if positive, or in KiB if negative.
+
+    """
+
+    def __init__(self, db_name: str="rsa-rl", journal_mode: str="WAL", synchronous: str="NORMAL", cache_size: int=-16000):
+        self.db_name = db_name
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        # in-memory database can not be shared by connections
+        self.is_memory = db_name == ":memory:" or db_name.startswith("file::memory:")
+        self.conn = self._connect()
+        self.conn.execute(f"PRAGMA journal_mode = {journal_mode}")
         self.cur = self.conn.cursor()
+        # writes are serialized, and a transaction holds the lock until the end
+        self._write_lock = threading.RLock()
+        self._depth = 0
+        self._local = threading.local()
+        # read connections of alive threads
+        self._read_conns = weakref.WeakSet()
 
-    def create_table(self, sql: str):
-        self.cur.execute(sql)
-        self.conn.commit()
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size}")
+        return conn
 
-    def delete(self, sql: str):
-        self.cur.execute(sql)
-        self.conn.commit()
+    def _read_conn(self) -> sqlite3.Connection:
+        """Connection to read in the current thread. """
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            self._read_conns.add(holder)
+        return holder.conn
+
+    def _commit(self):
+        # committed at the end of the outermost transaction
+        if self._depth == 0:
+            self.conn.commit()
+
+    def _write(self, sql: str, params, many: bool=False):
+        """Execute a write statement.
+
+        Raises:
+            sqlite3.Error: after rolling back, unless in a transaction, which rolls back instead.
+
+        """
+        with self._write_lock:
+            try:
+                if many:
+                    self.cur.executemany(sql, params)
+                else:
+                    self.cur.execute(sql, params)
+            except sqlite3.Error:
+                if self._depth == 0:
+                    self.conn.rollback()
+                raise
+            self._commit()
 
-    def select(self, sql: str) -> list:
-        tuple_list = []
-        
+    @contextmanager
+    def transaction(self):
+        """Context to commit writes at once at the end, or rollback them on error.
+
+        Transactions can be nested, and only the outermost one commits.
+
+        """
+        with self._write_lock:
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.rollback()
+                raise
+            self._depth -= 1
+            self._commit()
+
+    def _in_own_transaction(self) -> bool:
+        # RLock is owned by the current thread
+        if not self._write_lock.acquire(blocking=False):
+            return False
         try:
-            lock.acquire(True)
-            result = self.cur.execute(sql)
-            tuple_list = [e for e in result]
+            return self._depth > 0
         finally:
-            lock.release()
-        
-        return tuple_list
+            self._write_lock.release()
+
+    def create_table(self, sql: str):
+        self._write(sql, ())
+
+    def delete(self, sql: str, params: tuple=()):
+        self._write(sql, params)
+
+    def select(self, sql: str, params: tuple=()) -> list:
+        # uncommitted writes are visible only through the write connection
+        if self.is_memory or self._in_own_transaction():
+            with self._write_lock:
+                return self.conn.execute(sql, params).fetchall()
+        return self._read_conn().execute(sql, params).fetchall()
 
     def many_execute(self, sql: str, data: list):
         """RSADB use when update and insert *experiences*
         """
-        try:
-            self.cur.executemany(sql, data)
-        except sqlite3.Error as e:
-            print('sqlite3.Error occurred when many executing:', e.args[0])
-            self.close()
-            sys.exit(1)
-        
-        self.conn.commit()
+        self._write(sql, data, many=True)
 
     def insert(self, sql: str, row: tuple):
-        try:
-            self.cur.execute(sql, row)
-        except sqlite3.Error as e:
-            print('sqlite3.Error occurred when inserting:', e.args[0])
-            self.close()
-            sys.exit(1)
-
-        self.conn.commit()
+        self._write(sql, row)
 
     def close(self):
+        for holder in list(self._read_conns):
+            holder.conn.close()
+        self._read_conns = weakref.WeakSet()
+        self._local = threading.local()
         self.conn.commit()
         self.conn.close()
-
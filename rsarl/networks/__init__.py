@@ -1,5 +1,6 @@
-
 from rsarl.networks.network import Network
+from rsarl.networks.lightpath import Lightpath, LightpathTable
 from rsarl.networks.single_fiber_network import SingleFiberNetwork
-
-
+from rsarl.networks.array_network import ArrayNetwork
+from rsarl.networks.snapshot import NetworkState, dump_snapshot, load_snapshot
+from rsarl.networks.history import NetworkRecorder, delta_base, replay
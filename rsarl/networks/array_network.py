@@ -0,0 +1,410 @@
+
+
+import json
+import numpy as np
+import networkx as nx
+from bitarray import bitarray
+from networkx.readwrite.json_graph import adjacency_data
+
+from rsarl.networks import Network
+from rsarl.networks.scheduler import ReleaseScheduler
+from rsarl.networks.lightpath import Lightpath, LightpathTable
+from rsarl.utils import sort_tuple
+
+
+class ArrayNetwork(Network):
+    """Single fiber network whose spectrum state is held in NumPy arrays.
+
+    Provides the same API as SingleFiberNetwork, but slot and time of all edges
+    are stored in contiguous (n_edges, n_slot) arrays whose i-th row corresponds to
+    edge_list[i]. Thus, per-request operations only index the rows on the path
+    instead of rebuilding edge-attribute dicts of networkx.
+
+    Args:
+        topology_name (str): network topology name.
+        n_slot (int): The number of slots in each edge.
+        is_weight (bool): whether to consider distance or not
+
+    Attributes:
+        n_slot (int): The number of slots in each edge.
+        slot_table (np.ndarray): (n_edges, n_slot) uint8 array. 1 is available, otherwise occupied.
+        expiry_table (np.ndarray): (n_edges, n_slot) float array of absolute expiry time.
+        clock (float): Current simulation time.
+        lightpaths (LightpathTable): Established lightpaths.
+        scheduler (ReleaseScheduler): Expiry events of established lightpaths.
+
+    Note:
+        The arrays, clock and occupancy counters can be placed on an external buffer
+        (e.g., multiprocessing.shared_memory) by bind_state(), so that other processes
+        can read the state without copying.
+
+    """
+
+    def __init__(self, topology_name: str, n_slot: int, is_weight: bool):
+        super().__init__(topology_name, n_slot, is_weight)
+        # edge weight in row order
+        weight_dict = nx.get_edge_attributes(self.G, name='weight')
+        self.weight = np.array(
+            [weight_dict.get(e, 1) for e in self.edge_list], dtype=np.int64)
+        # cache of path -> row indices
+        self._rows_cache = {}
+        self.lightpaths = LightpathTable()
+        self._allocate_state()
+        self.init_graph()
+
+
+    def state_layout(self) -> list:
+        """Get layout of arrays on the buffer of bind_state().
+
+        Returns:
+            list: (attribute name, dtype, shape, offset in bytes) of each array.
+
+        """
+        specs = [
+            # 8-byte aligned first
+            ('_clock', np.float64, (1, )),
+            ('_n_occupied', np.int64, (1, )),
+            ('edge_occupancy', np.int64, (self.n_edges, )),
+            ('slot_occupancy', np.int64, (self.n_slot, )),
+            ('expiry_table', np.float64, (self.n_edges, self.n_slot)),
+            ('slot_table', np.uint8, (self.n_edges, self.n_slot)),
+        ]
+        layout = []
+        offset = 0
+        for name, dtype, shape in specs:
+            layout.append((name, dtype, shape, offset))
+            offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+        return layout
+
+
+    def state_nbytes(self) -> int:
+        """Get the size of buffer required by bind_state().
+
+        Returns:
+            int: size in bytes
+
+        """
+        name, dtype, shape, offset = self.state_layout()[-1]
+        return offset + np.dtype(dtype).itemsize * int(np.prod(shape))
+
+
+    def _allocate_state(self, buffer=None, offset: int=0) -> dict:
+        arrays = {}
+        for name, dtype, shape, array_offset in self.state_layout():
+            if buffer is None:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset + array_offset)
+        self.__dict__.update(arrays)
+        return arrays
+
+
+    def bind_state(self, buffer, readonly: bool=False, offset: int=0):
+        """Place slot table, expiry table, clock and occupancy counters on the buffer.
+
+        Args:
+            buffer: writable buffer whose size is at least offset + state_nbytes(),
+                e.g., SharedMemory.buf
+            readonly (bool): If True, the state is not copied into the buffer and
+                the arrays are read-only views of state written by another network.
+            offset (int): start of the state in the buffer.
+
+        """
+        current = {name: getattr(self, name) for name, _, _, _ in self.state_layout()}
+        arrays = self._allocate_state(buffer, offset)
+        for name, arr in arrays.items():
+            if readonly:
+                arr.flags.writeable = False
+            else:
+                arr[...] = current[name]
+
+
+    def copy_state(self):
+        """Replace arrays, lightpaths and release events by their copies.
+
+        Graph, edge weights and cache of rows are shared with the original.
+
+        """
+        current = {name: getattr(self, name) for name, _, _, _ in self.state_layout()}
+        for name, arr in self._allocate_state().items():
+            arr[...] = current[name]
+        self.lightpaths = self.lightpaths.copy()
+        self.scheduler = self.scheduler.copy()
+
+
+    @property
+    def clock(self) -> float:
+        """float: Current simulation time. """
+        return float(self._clock[0])
+
+
+    @clock.setter
+    def clock(self, value: float):
+        self._clock[0] = value
+
+
+    @property
+    def n_occupied(self) -> int:
+        """int: The number of occupied slots in whole network. """
+        return int(self._n_occupied[0])
+
+
+    @n_occupied.setter
+    def n_occupied(self, value: int):
+        self._n_occupied[0] = value
+
+
+    def init_graph(self):
+        """ Initialize slot and time tables.
+
+        """
+        self.slot_table[...] = 1
+        self.expiry_table[...] = 0
+        self.clock = 0.
+        self.scheduler = ReleaseScheduler()
+        self.lightpaths.clear()
+        self.init_occupancy()
+
+
+    def init_occupancy(self):
+        """Initialize occupancy counters in place.
+
+        """
+        self.n_occupied = 0
+        self.edge_occupancy[...] = 0
+        self.slot_occupancy[...] = 0
+
+
+    @property
+    def time_table(self) -> np.ndarray:
+        """np.ndarray: (n_edges, n_slot) array of remaining time. """
+        return np.maximum(self.expiry_table - self.clock, 0)
+
+
+    @property
+    def slot(self):
+        """dict: copy of slot table of each edge in list format. """
+        return dict(zip(self.edge_list, self.slot_table.tolist()))
+
+
+    @property
+    def time(self):
+        """dict: copy of remaining time of each edge in list format. """
+        return dict(zip(self.edge_list, self.time_table.tolist()))
+
+
+    def rows(self, path: list) -> np.ndarray:
+        """Get cached row indices of edges on the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            np.ndarray: row indices of edges on the path.
+
+        """
+        key = tuple(path)
+        rows = self._rows_cache.get(key)
+        if rows is None:
+            rows = np.array(self.path_rows(path), dtype=np.intp)
+            self._rows_cache[key] = rows
+        return rows
+
+
+    def spend_time(self, period: float):
+        """Spend time between requests, releasing expired paths.
+
+            Args:
+                period (float): Time between requests.
+
+        """
+        self.clock += period
+        for lightpath_id in self.scheduler.pop_expired(self.clock):
+            # already released by self.release()
+            if lightpath_id not in self.lightpaths:
+                continue
+            self.release(lightpath_id)
+
+
+    def release(self, lightpath_id: int) -> Lightpath:
+        """Tear down the lightpath (mark its FS' as available).
+
+        Args:
+            lightpath_id (int): id of the lightpath.
+
+        Returns:
+            Lightpath: released lightpath.
+
+        Raises:
+            KeyError: When the lightpath is not established.
+
+        """
+        lp = self.lightpaths.pop(lightpath_id)
+        rows = self.rows(lp.path)
+        self.slot_table[rows, lp.slot_idx: lp.slot_idx + lp.n_slot] = 1
+        self.expiry_table[rows, lp.slot_idx: lp.slot_idx + lp.n_slot] = 0
+        self.update_occupancy(rows, lp.slot_idx, lp.n_slot, -1)
+        return lp
+
+
+    def distance(self, path: list) -> int:
+        """Calculate distance of the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            int: distance of the target path.
+
+        """
+        return int(self.weight[self.rows(path)].sum())
+
+
+    def path_slot_array(self, path: list) -> np.ndarray:
+        """Calculate AND for slot table of edges on the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            np.ndarray: bool array whose size is n_slot.
+
+        """
+        return np.logical_and.reduce(self.slot_table[self.rows(path)], axis=0)
+
+
+    def slot_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Gather slot of edges by row indices.
+
+        Args:
+            rows (np.ndarray): int array of row indices in any shape.
+
+        Returns:
+            np.ndarray: uint8 array whose shape is rows.shape + (n_slot, ).
+
+        """
+        return self.slot_table[rows]
+
+
+    def path_slot(self, path: list) -> bitarray:
+        """Calculate AND for slot table of edges on the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            bitarray:
+
+        """
+        path_slot = bitarray()
+        path_slot.pack(self.path_slot_array(path).tobytes())
+        return path_slot
+
+
+    def adj_path_slot(self, path:list):
+        """Get slot of adjacent edges on the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            adj_path_slot_list: list of adjacent path slot by bitarray
+
+        """
+        adj_path_slot_list = []
+
+        on_path = set(self.rows(path).tolist())
+        for base_node in path:
+            # search neighbors
+            for node_id in self.G[base_node]:
+                row = self.edge_index[sort_tuple((node_id, base_node))]
+                if row in on_path:
+                    continue
+                slot = bitarray()
+                slot.pack(self.slot_table[row].astype(bool).tobytes())
+                adj_path_slot_list.append(slot)
+
+        return adj_path_slot_list
+
+
+    def is_assignable(self, path: list, start_idx: int, n_req_slot: int) -> bool:
+        """Check target path is assignable or not.
+
+        Args:
+            path (list): List of node-ids.
+            start_idx (int): start index of slot table.
+            n_req_slot (int): required number of slot to assign path.
+
+        Returns:
+            bool: target path is assignable(True) or not(False)
+
+        """
+        # exceed the amount of slots
+        if start_idx + n_req_slot > self.n_slot:
+            return False
+
+        # check whether target slots are already occupied or not
+        block = self.slot_table[self.rows(path), start_idx: start_idx + n_req_slot]
+        return bool(block.all())
+
+
+    def assign_path(self, path: list, start_idx: int, n_req_slot: int, duration: float) -> int:
+        """Assign path, updating slot table (mark allocated FS' as occupied).
+
+        Note:
+            Slot 1 is available, otherwise occupied.
+
+        Args:
+            path (list): List of node-ids.
+            start_idx (int): start index of slot table.
+            n_req_slot (int): required number of slot to assign path.
+            duration (float): required duration time to path.
+
+        Returns:
+            int: id of the established lightpath.
+
+        Raises:
+            ValueError: When target slot is already occupied, return ValueError.
+
+        """
+        rows = self.rows(path)
+        end_idx = start_idx + n_req_slot
+        if not self.slot_table[rows, start_idx: end_idx].all():
+            raise ValueError(f"Target slot is already occupied. slot[{path}][{start_idx}: {end_idx}]")
+
+        lp = self.lightpaths.add(path, start_idx, n_req_slot, self.clock, self.clock + duration)
+        self.slot_table[rows, start_idx: end_idx] = 0
+        self.expiry_table[rows, start_idx: end_idx] = lp.expiry
+        self.scheduler.push(lp.expiry, lp.id)
+        self.update_occupancy(rows, start_idx, n_req_slot, 1)
+        return lp.id
+
+
+    def to_arrays(self) -> tuple:
+        """Copy slot and time tables.
+
+        Returns:
+            tuple: (n_edges, n_slot) arrays of slot and remaining time.
+
+        """
+        return self.slot_table.copy(), self.time_table
+
+
+    def to_graph(self) -> nx.Graph:
+        """Copy graph with attributes, 'slot' and 'time', of current state.
+
+        Returns:
+            networkx.classes.graph.Graph: graph in the same format as SingleFiberNetwork.G
+
+        """
+        G = self.G.copy()
+        nx.set_edge_attributes(G, name='slot', values=self.slot)
+        nx.set_edge_attributes(G, name='time', values=self.time)
+        return G
+
+
+    def dump_json(self) -> str:
+        """Dump data in json format
+
+        """
+        return json.dumps(adjacency_data(self.to_graph()))
@@ -0,0 +1,122 @@
+
+
+import json
+import numpy as np
+
+from rsarl.utils import path_to_edges
+from rsarl.networks.snapshot import NetworkState, dump_snapshot, is_snapshot, load_snapshot, load_json_snapshot
+
+
+DELTA_PREFIX = '{"base": '
+
+
+class NetworkRecorder(object):
+    """Record network states as periodic snapshots and deltas between them.
+
+    A snapshot is the full graph dumped by Network.dump_json(), or 
+    the binary snapshot by dump_snapshot() if binary is True. Other records
+    are compact deltas from the previous record: the elapsed time and
+    the lightpaths assigned and released in the meantime.
+    The state of any record can be rebuilt by replay().
+
+    Args:
+        snapshot_interval (int): The number of requests between snapshots.
+        binary (bool): whether to record snapshots in binary format or not.
+
+    """
+
+    def __init__(self, snapshot_interval: int=100, binary: bool=False):
+        assert snapshot_interval > 0
+        self.snapshot_interval = snapshot_interval
+        self.binary = binary
+        self.base = None
+        self.clock = 0.
+        self.lightpaths = {}
+
+
+    def record(self, req_id: int, net) -> str:
+        """Record the current state of network.
+
+        Args:
+            req_id (int): request id of the record.
+            net (Network): network whose lightpaths are registered.
+
+        Returns:
+            str or bytes: delta in json format, or snapshot.
+
+        """
+        lightpaths = {lp.id: lp for lp in net.lightpaths}
+
+        if self.base is None \
+            or req_id - self.base >= self.snapshot_interval \
+            or net.clock < self.clock: # reset
+            self.base = req_id
+            record = dump_snapshot(net) if self.binary else net.dump_json()
+        else:
+            assigned = [lightpaths[i] for i in lightpaths.keys() - self.lightpaths.keys()]
+            released = [self.lightpaths[i] for i in self.lightpaths.keys() - lightpaths.keys()]
+            record = json.dumps({
+                "base": self.base,
+                "elapsed": net.clock - self.clock,
+                "assigned": [
+                    [lp.path, lp.slot_idx, lp.n_slot, lp.expiry - net.clock] for lp in assigned],
+                "released": [
+                    [lp.path, lp.slot_idx, lp.n_slot] for lp in released],
+            })
+
+        self.clock = net.clock
+        self.lightpaths = lightpaths
+        return record
+
+
+def delta_base(record) -> int:
+    """Get request id of the snapshot which the delta is based on.
+
+    Args:
+        record (str or bytes): record generated by NetworkRecorder.
+
+    Returns:
+        int: request id of the snapshot, or None if the record is a snapshot.
+
+    """
+    if not isinstance(record, str) or not record.startswith(DELTA_PREFIX):
+        return None
+    return json.loads(record)["base"]
+
+
+def replay(records: list) -> NetworkState:
+    """Rebuild network state from a snapshot and the following deltas.
+
+    Args:
+        records (list): a snapshot followed by deltas in order of request id.
+
+    Returns:
+        NetworkState: arrays of network state.
+
+    """
+    if is_snapshot(records[0]):
+        state = load_snapshot(records[0])
+    else:
+        state = load_json_snapshot(records[0])
+    if len(records) == 1:
+        return state
+
+    edge_index = {e: i for i, e in enumerate(state.edges)}
+    slot = state.slot.copy()
+    time = state.time.astype(np.float64)
+
+    for record in records[1:]:
+        delta = json.loads(record)
+        for path, slot_idx, n_slot in delta["released"]:
+            rows = [edge_index[e] for e in path_to_edges(path)]
+            slot[rows, slot_idx: slot_idx + n_slot] = 1
+            time[rows, slot_idx: slot_idx + n_slot] = 0
+
+        time = np.maximum(time - delta["elapsed"], 0)
+
+        for path, slot_idx, n_slot, remaining in delta["assigned"]:
+            rows = [edge_index[e] for e in path_to_edges(path)]
+            slot[rows, slot_idx: slot_idx + n_slot] = 0
+            time[rows, slot_idx: slot_idx + n_slot] = remaining
+
+    return state._replace(slot=slot, time=time.astype(np.float32))
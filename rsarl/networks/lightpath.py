@@ -0,0 +1,118 @@
+
+
+from typing import NamedTuple
+
+
+class Lightpath(NamedTuple):
+    id: int
+    path: list
+    slot_idx: int
+    n_slot: int
+    start_time: float
+    expiry: float
+
+
+class LightpathTable(object):
+    """Table of established lightpaths.
+
+    Lightpath ids are unique through the lifetime of the table, i.e.,
+    they are not reused even after clear().
+
+    """
+
+    def __init__(self):
+        self._lightpaths = {}
+        self._next_id = 0
+
+
+    def __len__(self) -> int:
+        return len(self._lightpaths)
+
+
+    def __contains__(self, lightpath_id: int) -> bool:
+        return lightpath_id in self._lightpaths
+
+
+    def __getitem__(self, lightpath_id: int) -> Lightpath:
+        return self._lightpaths[lightpath_id]
+
+
+    def __iter__(self):
+        return iter(self._lightpaths.values())
+
+
+    def ids(self) -> set:
+        """Get ids of established lightpaths.
+
+        Returns:
+            set: lightpath ids
+
+        """
+        return set(self._lightpaths)
+
+
+    def add(self, path: list, slot_idx: int, n_slot: int, start_time: float, expiry: float) -> Lightpath:
+        """Register a new lightpath.
+
+        Args:
+            path (list): List of node-ids.
+            slot_idx (int): start index of slot table.
+            n_slot (int): the number of occupied slots.
+            start_time (float): time when the lightpath is established.
+            expiry (float): time when the lightpath is released.
+
+        Returns:
+            Lightpath: registered lightpath.
+
+        """
+        lightpath = Lightpath(self._next_id, path, slot_idx, n_slot, start_time, expiry)
+        self._lightpaths[lightpath.id] = lightpath
+        self._next_id += 1
+        return lightpath
+
+
+    def put(self, lightpath: Lightpath):
+        """Register a lightpath established in another table, keeping its id.
+
+        Args:
+            lightpath (Lightpath): lightpath to register.
+
+        """
+        self._lightpaths[lightpath.id] = lightpath
+        self._next_id = max(self._next_id, lightpath.id + 1)
+
+
+    def pop(self, lightpath_id: int) -> Lightpath:
+        """Remove a lightpath from the table.
+
+        Args:
+            lightpath_id (int): id of the lightpath.
+
+        Returns:
+            Lightpath: removed lightpath.
+
+        Raises:
+            KeyError: When the lightpath is not established.
+
+        """
+        return self._lightpaths.pop(lightpath_id)
+
+
+    def copy(self):
+        """Copy the table.
+
+        Returns:
+            LightpathTable: table of the same lightpaths and next id.
+
+        """
+        table = LightpathTable()
+        table._lightpaths = dict(self._lightpaths)
+        table._next_id = self._next_id
+        return table
+
+
+    def clear(self):
+        """Remove all lightpaths.
+
+        """
+        self._lightpaths.clear()
@@ -1,8 +1,11 @@
 
+import copy
 import json
+import numpy as np
 import networkx as nx
 from networkx.readwrite.json_graph import adjacency_graph, adjacency_data
 
+from rsarl.utils import path_to_edges
 from rsarl.networks.topology_factory import TopologyFactory
 
 
@@ -17,6 +20,11 @@ class Network(object):
 		n_slot (int): The number of slots in each edge.
 		is_weight (bool): Generate weighted network or not.
 		G (networkx.classes.graph.Graph): Graph object generated by networkx. 
+		edge_list (list): Edges of G, the i-th edge is stored in the i-th row of slot tables.
+		edge_index (dict): Map from edge to its row index in slot tables.
+		n_occupied (int): The number of occupied slots in whole network.
+		edge_occupancy (np.ndarray): The number of occupied slots in each edge.
+		slot_occupancy (np.ndarray): The number of edges occupying each slot index.
 
 	"""
 
@@ -49,14 +57,101 @@ class Network(object):
 
 		# add prop
 		self.n_edges = len(self.G.edges())
+		# edge <-> row index
+		self.edge_list = list(self.G.edges())
+		self.edge_index = {e: i for i, e in enumerate(self.edge_list)}
 		# add node attributes
 		nx.set_node_attributes(self.G, name='position', values=nodes_pos_dict)
 
 
+	def path_rows(self, path: list) -> list:
+		"""Convert path to row indices of its edges. 
+
+			Args:
+				path (list): List of node-ids.
+
+			Returns:
+				list: row indices of edges on the path.
+		"""
+		return [self.edge_index[e] for e in path_to_edges(path)]
+
+
 	def init_graph(self):
 		raise NotImplementedError
 
 
+	def init_occupancy(self):
+		"""Initialize occupancy counters. 
+
+		"""
+		self.n_occupied = 0
+		self.edge_occupancy = np.zeros(self.n_edges, dtype=np.int64)
+		self.slot_occupancy = np.zeros(self.n_slot, dtype=np.int64)
+
+
+	def update_occupancy(self, rows: list, slot_idx: int, n_slot: int, sign: int):
+		"""Update occupancy counters when slots are assigned or released. 
+
+			Args:
+				rows (list): row indices of edges on the path.
+				slot_idx (int): start index of slot table.
+				n_slot (int): the number of assigned/released slots.
+				sign (int): 1 when assigned, -1 when released.
+		"""
+		self.n_occupied += sign * len(rows) * n_slot
+		self.edge_occupancy[rows] += sign * n_slot
+		self.slot_occupancy[slot_idx: slot_idx + n_slot] += sign * len(rows)
+
+
+	def resource_util(self) -> float:
+		"""Calculate slot utilization of whole network. 
+
+			Returns:
+				float: utilization of slot table in whole network.
+		"""
+		return self.n_occupied / (self.n_edges * self.n_slot)
+
+
+	def edge_util(self) -> np.ndarray:
+		"""Calculate slot utilization of each edge. 
+
+			Returns:
+				np.ndarray: utilization whose i-th element is of edge_list[i].
+		"""
+		return self.edge_occupancy / self.n_slot
+
+
+	def slot_index_util(self) -> np.ndarray:
+		"""Calculate utilization of each slot index over all edges. 
+
+			Returns:
+				np.ndarray: utilization whose size is n_slot.
+		"""
+		return self.slot_occupancy / self.n_edges
+
+
+	def clone(self):
+		"""Clone network. 
+
+			Immutable structures, e.g., topology, node positions and edge weights,
+			are shared with the clone, and only the mutable state is copied.
+
+			Returns:
+				Network: cloned network.
+		"""
+		net = copy.copy(self)
+		net.copy_state()
+		return net
+
+
+	def copy_state(self):
+		"""Replace mutable state by its copy. It is called on a shallow copy by clone().
+
+		"""
+		self.edge_occupancy = self.edge_occupancy.copy()
+		self.slot_occupancy = self.slot_occupancy.copy()
+
+
 	def dump_json(self) -> str:
 		"""Dump data in json format
 
@@ -0,0 +1,81 @@
+
+
+import heapq
+
+
+class ReleaseScheduler(object):
+    """Event queue of lightpath releases.
+
+    Holds a heap of absolute expiry times so that spending time only touches
+    the lightpaths which actually expire, instead of scanning every slot.
+
+    Note:
+        Items with the same expiry time are released in order of pushing.
+
+    """
+
+    def __init__(self):
+        self.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+    def copy(self):
+        """Copy the scheduler.
+
+        Returns:
+            ReleaseScheduler: scheduler of the same releases.
+
+        """
+        scheduler = ReleaseScheduler()
+        scheduler._heap = list(self._heap)
+        scheduler._n_pushed = self._n_pushed
+        return scheduler
+
+
+    def clear(self):
+        """Remove all scheduled releases.
+
+        """
+        self._heap = []
+        self._n_pushed = 0
+
+
+    def push(self, expiry: float, item):
+        """Schedule release of item.
+
+        Args:
+            expiry (float): absolute time when the item is released.
+            item: the released object, e.g., lightpath.
+
+        """
+        heapq.heappush(self._heap, (expiry, self._n_pushed, item))
+        self._n_pushed += 1
+
+
+    def next_expiry(self) -> float:
+        """Get the earliest expiry time.
+
+        Returns:
+            float: the earliest expiry time, or None if nothing is scheduled.
+
+        """
+        return self._heap[0][0] if self._heap else None
+
+
+    def pop_expired(self, clock: float) -> list:
+        """Pop all items whose expiry time has come.
+
+        Args:
+            clock (float): current simulation time.
+
+        Returns:
+            list: expired items in order of expiry time.
+
+        """
+        expired = []
+        while self._heap and self._heap[0][0] <= clock:
+            expired.append(heapq.heappop(self._heap)[2])
+        return expired
@@ -6,6 +6,8 @@ import networkx as nx
 from bitarray import bitarray
 
 from rsarl.networks import Network
+from rsarl.networks.scheduler import ReleaseScheduler
+from rsarl.networks.lightpath import Lightpath, LightpathTable
 from rsarl.utils import sort_tuple, path_to_edges
 
 
@@ -19,12 +21,16 @@ class SingleFiberNetwork(Network):
 
     Attributes:
         n_slot (int): The number of slots in each edge.
+        clock (float): Current simulation time.
+        lightpaths (LightpathTable): Established lightpaths.
+        scheduler (ReleaseScheduler): Expiry events of established lightpaths.
 
     """
 
     def __init__(self, topology_name: str, n_slot: int, is_weight: bool):
         super().__init__(topology_name, n_slot, is_weight)
-        self.add_attribute_to_graph()
+        self.lightpaths = LightpathTable()
+        self.init_graph()
 
 
     def add_attribute_to_graph(self): 
@@ -32,6 +38,8 @@ class SingleFiberNetwork(Network):
 
             Note:
                 Slot 1 is available, otherwise occupied.
+                Attribute 'time' is the remaining time, which is refreshed
+                from expiry times when accessed via self.time or dump_json().
 
         """
         # add attr
@@ -42,12 +50,33 @@ class SingleFiberNetwork(Network):
         # add edge attributes
         nx.set_edge_attributes(self.G, name='slot', values=slot_dict)
         nx.set_edge_attributes(self.G, name='time', values=time_dict)
+        # absolute expiry time of each slot
+        self.expiry = {e: [0. for x in range(self.n_slot)] for e in self.G.edges()}
+        # simulation clock & release events
+        self.clock = 0.
+        self.scheduler = ReleaseScheduler()
 
     def init_graph(self):
         """ Initialize attribute, slot and time.
 
         """
         self.add_attribute_to_graph()
+        self.lightpaths.clear()
+        self.init_occupancy()
+
+
+    def copy_state(self):
+        """Replace slot, time and expiry lists, lightpaths and release events by their copies.
+
+        """
+        super().copy_state()
+        self.G = self.G.copy()
+        for _, _, attr in self.G.edges(data=True):
+            attr['slot'] = list(attr['slot'])
+            attr['time'] = list(attr['time'])
+        self.expiry = {e: list(v) for e, v in self.expiry.items()}
+        self.lightpaths = self.lightpaths.copy()
+        self.scheduler = self.scheduler.copy()
 
 
     @property
@@ -57,27 +86,53 @@ class SingleFiberNetwork(Network):
 
     @property
     def time(self):
+        self.sync_time()
         return nx.get_edge_attributes(self.G, name='time')
 
 
+    def sync_time(self):
+        """Update attribute 'time' to the remaining time at current clock. 
+
+        """
+        for (u, v), expiry in self.expiry.items():
+            self.G[u][v]['time'][:] = [max(t - self.clock, 0) for t in expiry]
+
+
     def spend_time(self, period: float):
-        """Spend time between requests. 
+        """Spend time between requests, releasing expired paths. 
 
             Args:
                 period (float): Time between requests. 
         
         """
-        slot_dict = nx.get_edge_attributes(self.G, name='slot')
-        time_dict = nx.get_edge_attributes(self.G, name='time')
+        self.clock += period
+        for lightpath_id in self.scheduler.pop_expired(self.clock):
+            # already released by self.release()
+            if lightpath_id not in self.lightpaths:
+                continue
+            self.release(lightpath_id)
 
-        for e in self.G.edges():
-            for s in range(self.n_slot):
-                if time_dict[e][s] > period:
-                    time_dict[e][s] -= period
 
-                elif time_dict[e][s] > 0:
-                    time_dict[e][s] = 0
-                    slot_dict[e][s] = 1
+    def release(self, lightpath_id: int) -> Lightpath:
+        """Tear down the lightpath (mark its FS' as available). 
+
+        Args:
+            lightpath_id (int): id of the lightpath.
+
+        Returns:
+            Lightpath: released lightpath.
+
+        Raises:
+            KeyError: When the lightpath is not established.
+
+        """
+        lp = self.lightpaths.pop(lightpath_id)
+        end_idx = lp.slot_idx + lp.n_slot
+        for u, v in path_to_edges(lp.path):
+            self.G[u][v]['slot'][lp.slot_idx: end_idx] = itertools.repeat(1, lp.n_slot)
+            self.expiry[(u, v)][lp.slot_idx: end_idx] = itertools.repeat(0., lp.n_slot)
+        self.update_occupancy(self.path_rows(lp.path), lp.slot_idx, lp.n_slot, -1)
+        return lp
 
 
     def distance(self, path: list) -> int:
@@ -92,7 +147,8 @@ class SingleFiberNetwork(Network):
         """
         edges = path_to_edges(path)
         weight_dict = nx.get_edge_attributes(self.G, name='weight')
-        distance = sum([weight_dict[sort_tuple(e)] for e in edges])
+        # hop count in unweighted network
+        distance = sum([weight_dict.get(sort_tuple(e), 1) for e in edges])
         return distance
 
 
@@ -116,6 +172,37 @@ class SingleFiberNetwork(Network):
         return path_slot
 
 
+    def path_slot_array(self, path: list) -> np.ndarray:
+        """Calculate AND for slot table of edges on the path.
+
+        Args:
+            path (list): List of node-ids.
+
+        Returns:
+            np.ndarray: bool array whose size is n_slot.
+
+        """
+        slots = [self.G.edges[e]['slot'] for e in path_to_edges(path)]
+        return np.logical_and.reduce(np.array(slots, dtype=bool), axis=0)
+
+
+    def slot_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Gather slot of edges by row indices.
+
+        Args:
+            rows (np.ndarray): int array of row indices in any shape.
+
+        Returns:
+            np.ndarray: uint8 array whose shape is rows.shape + (n_slot, ).
+
+        """
+        rows = np.asarray(rows)
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        slots = np.array(
+            [self.G.edges[self.edge_list[r]]['slot'] for r in unique_rows], dtype=np.uint8)
+        return slots[inverse.reshape(rows.shape)]
+
+
     def adj_path_slot(self, path:list):
         """Get slot of adjacent edges on the path.
 
@@ -166,7 +253,7 @@ class SingleFiberNetwork(Network):
         return True
 
 
-    def assign_path(self, path: list, start_idx: int, n_req_slot: int, duration: float):
+    def assign_path(self, path: list, start_idx: int, n_req_slot: int, duration: float) -> int:
         """Assign path, updating slot table (mark allocated FS' as occupied). 
 
         Note:
@@ -178,32 +265,45 @@ class SingleFiberNetwork(Network):
             n_req_slot (int): required number of slot to assign path. 
             duration (float): required duration time to path. 
 
+        Returns:
+            int: id of the established lightpath.
+
         Raises:
             ValueError: When target slot is already occupied, return ValueError. 
 
         """
         edges = path_to_edges(path)
         slot_dict = nx.get_edge_attributes(self.G, name='slot')
-        time_dict = nx.get_edge_attributes(self.G, name='time')
 
         for e in edges:
             if 0 in slot_dict[e][start_idx: start_idx + n_req_slot]:
                 raise ValueError(f"Target slot is already occupied. slot[{e}][{start_idx}: {start_idx + n_req_slot}]")
-            else: 
-                slot_dict[e][start_idx: start_idx + n_req_slot] = itertools.repeat(0, n_req_slot)
-                time_dict[e][start_idx: start_idx + n_req_slot] = itertools.repeat(duration, n_req_slot)
+
+        lp = self.lightpaths.add(path, start_idx, n_req_slot, self.clock, self.clock + duration)
+        for e in edges:
+            slot_dict[e][start_idx: start_idx + n_req_slot] = itertools.repeat(0, n_req_slot)
+            self.expiry[e][start_idx: start_idx + n_req_slot] = itertools.repeat(lp.expiry, n_req_slot)
+
+        self.scheduler.push(lp.expiry, lp.id)
+        self.update_occupancy(self.path_rows(path), start_idx, n_req_slot, 1)
+        return lp.id
 
 
-    def resource_util(self) -> float:
-        """Calculate slot utilization of whole network. 
+    def to_arrays(self) -> tuple:
+        """Convert slot and time to arrays whose i-th row is of edge_list[i]. 
 
         Returns:
-            float: utilization of slot table in whole network.
-        
+            tuple: (n_edges, n_slot) arrays of slot and remaining time. 
+
         """
-        slot_dict = nx.get_edge_attributes(self.G, name='slot')
-        table = list(slot_dict.values())
-        slot_arr = np.array(table)
-        return 1.0 - np.sum(slot_arr) / slot_arr.size
+        slot = np.array([self.G.edges[e]['slot'] for e in self.edge_list], dtype=np.uint8)
+        expiry = np.array([self.expiry[e] for e in self.edge_list], dtype=np.float64)
+        return slot, np.maximum(expiry - self.clock, 0)
 
 
+    def dump_json(self) -> str:
+        """Dump data in json format
+
+        """
+        self.sync_time()
+        return super().dump_json()
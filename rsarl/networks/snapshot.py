@@ -0,0 +1,125 @@
+
+
+import json
+import zlib
+import struct
+import numpy as np
+import networkx as nx
+from typing import NamedTuple
+from networkx.readwrite.json_graph import adjacency_graph
+
+
+MAGIC = b"RSAN"
+VERSION = 1
+# header: magic, version, flags, n_nodes, n_edges, n_slot
+HEADER = struct.Struct("<4sBBHHH")
+# flags
+ZLIB_COMPRESSED = 1
+
+
+class NetworkState(NamedTuple):
+    positions: np.ndarray # (n_nodes, 2) position of each node
+    edges: list           # edges, the i-th edge corresponds to the i-th row of tables
+    slot: np.ndarray      # (n_edges, n_slot) 1 is available, otherwise occupied
+    time: np.ndarray      # (n_edges, n_slot) remaining time
+
+
+def dump_snapshot(net, compress: bool=True) -> bytes:
+    """Dump network state in binary format.
+
+    The body consists of node positions, edges, bit-packed slot table and
+    float32 time table, optionally compressed by zlib.
+
+    Args:
+        net (Network): target network.
+        compress (bool): whether to compress the body or not.
+
+    Returns:
+        bytes: binary snapshot
+
+    """
+    slot, time = net.to_arrays()
+    pos_dict = nx.get_node_attributes(net.G, name='position')
+    positions = np.array([pos_dict[n] for n in range(net.n_nodes)], dtype=np.float32)
+
+    body = b"".join([
+        positions.tobytes(),
+        np.array(net.edge_list, dtype=np.uint16).tobytes(),
+        np.packbits(slot.astype(bool), axis=1).tobytes(),
+        time.astype(np.float32).tobytes(),
+    ])
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= ZLIB_COMPRESSED
+
+    header = HEADER.pack(MAGIC, VERSION, flags, net.n_nodes, net.n_edges, net.n_slot)
+    return header + body
+
+
+def is_snapshot(record) -> bool:
+    """Check whether the record is a binary snapshot or not.
+
+    Args:
+        record (bytes or str): record of network.
+
+    Returns:
+        bool: binary snapshot(True) or not(False)
+
+    """
+    return isinstance(record, bytes) and record.startswith(MAGIC)
+
+
+def load_snapshot(blob: bytes) -> NetworkState:
+    """Load network state from binary snapshot.
+
+    Args:
+        blob (bytes): binary snapshot generated by dump_snapshot().
+
+    Returns:
+        NetworkState: arrays of network state.
+
+    Raises:
+        ValueError: When the blob is not a snapshot of supported version.
+
+    """
+    magic, version, flags, n_nodes, n_edges, n_slot = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a network snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    body = blob[HEADER.size:]
+    if flags & ZLIB_COMPRESSED:
+        body = zlib.decompress(body)
+
+    # split body
+    sizes = [n_nodes * 2 * 4, n_edges * 2 * 2, n_edges * ((n_slot + 7) // 8), n_edges * n_slot * 4]
+    offsets = np.cumsum([0] + sizes)
+    chunks = [body[offsets[i]: offsets[i + 1]] for i in range(len(sizes))]
+
+    positions = np.frombuffer(chunks[0], dtype=np.float32).reshape(n_nodes, 2)
+    edges = [tuple(e) for e in np.frombuffer(chunks[1], dtype=np.uint16).reshape(n_edges, 2).tolist()]
+    packed = np.frombuffer(chunks[2], dtype=np.uint8).reshape(n_edges, -1)
+    slot = np.unpackbits(packed, axis=1, count=n_slot)
+    time = np.frombuffer(chunks[3], dtype=np.float32).reshape(n_edges, n_slot)
+    return NetworkState(positions, edges, slot, time)
+
+
+def load_json_snapshot(data: str) -> NetworkState:
+    """Load network state from graph dumped by Network.dump_json().
+
+    Args:
+        data (str): Graph in json format
+
+    Returns:
+        NetworkState: arrays of network state.
+
+    """
+    G = adjacency_graph(json.loads(data))
+    pos_dict = nx.get_node_attributes(G, name='position')
+    positions = np.array([pos_dict[n] for n in sorted(G.nodes())], dtype=np.float32)
+    edges = list(G.edges())
+    slot = np.array([G.edges[e]['slot'] for e in edges], dtype=np.uint8)
+    time = np.array([G.edges[e]['time'] for e in edges], dtype=np.float32)
+    return NetworkState(positions, edges, slot, time)
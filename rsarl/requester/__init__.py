@@ -3,3 +3,7 @@
 from rsarl.requester.requester import Requester
 from rsarl.requester.uniform_requester import UniformRequester
 from rsarl.requester.nonuniform_requester import NonuniformRequester
+from rsarl.requester.trace import RequestTrace, generate_trace
+from rsarl.requester.trace_requester import TraceRequester
+from rsarl.requester.load_profile import LoadProfile, ConstantLoad, DiurnalLoad, StepLoad
+from rsarl.requester.traffic_matrix_requester import TrafficMatrixRequester
@@ -0,0 +1,68 @@
+
+
+import numpy as np
+
+
+class AliasTable:
+    """Alias tables of Walker's method for O(1) sampling from discrete distributions.
+
+    Args:
+        weights (np.ndarray): (n_outcomes, ) non-negative weights of a distribution,
+            or (n_rows, n_outcomes) weights whose rows are distributions.
+
+    Attributes:
+        prob (np.ndarray): (n_rows, n_outcomes) probability to take the outcome itself.
+        alias (np.ndarray): (n_rows, n_outcomes) outcome taken otherwise.
+
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        self.is_conditional = weights.ndim == 2
+        weights = np.atleast_2d(weights)
+        if np.any(weights < 0) or np.any(weights.sum(axis=1) <= 0):
+            raise ValueError("weights must be non-negative and have positive sum")
+        self.n_outcomes = weights.shape[1]
+        self.prob = np.ones(weights.shape)
+        self.alias = np.tile(np.arange(self.n_outcomes), (len(weights), 1))
+        for i, w in enumerate(weights):
+            self._build(w * self.n_outcomes / w.sum(), self.prob[i], self.alias[i])
+
+
+    @staticmethod
+    def _build(scaled: np.ndarray, prob: np.ndarray, alias: np.ndarray):
+        # Vose's method
+        scaled = scaled.tolist()
+        small = [i for i, p in enumerate(scaled) if p < 1.]
+        large = [i for i, p in enumerate(scaled) if p >= 1.]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1. - scaled[s]
+            (small if scaled[l] < 1. else large).append(l)
+        # remainders are 1 up to rounding errors
+        for i in small + large:
+            prob[i] = 1.
+
+
+    def draw(self, rand_generator: np.random.RandomState, size: int, rows: np.ndarray=None) -> np.ndarray:
+        """Draw outcomes at once.
+
+        Args:
+            rand_generator (np.random.RandomState): pseudo-random number generator.
+            size (int): The number of outcomes.
+            rows (np.ndarray): (size, ) distribution to draw each outcome from.
+                Required if weights are conditional.
+
+        Returns:
+            np.ndarray: (size, ) drawn outcomes.
+
+        """
+        if rows is None:
+            if self.is_conditional:
+                raise ValueError("rows are required for conditional weights")
+            rows = np.zeros(size, dtype=np.intp)
+        col = rand_generator.randint(0, self.n_outcomes, size)
+        take = rand_generator.random_sample(size) < self.prob[rows, col]
+        return np.where(take, col, self.alias[rows, col])
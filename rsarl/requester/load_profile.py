@@ -0,0 +1,92 @@
+
+
+import numpy as np
+from abc import ABCMeta, abstractmethod
+
+
+class LoadProfile(metaclass=ABCMeta):
+    """Multiplier of the request arrival rate over simulation time.
+
+    Attributes:
+        peak (float): upper bound of the multiplier.
+
+    """
+
+    @abstractmethod
+    def __call__(self, t: np.ndarray) -> np.ndarray:
+        """Get multipliers at times.
+
+        Args:
+            t (np.ndarray): simulation times.
+
+        Returns:
+            np.ndarray: non-negative multipliers whose shape is t.shape.
+
+        """
+        raise NotImplementedError
+
+
+class ConstantLoad(LoadProfile):
+    """Constant load.
+
+    Args:
+        level (float): multiplier.
+
+    """
+
+    def __init__(self, level: float=1.):
+        if level <= 0:
+            raise ValueError("level must be positive")
+        self.level = level
+        self.peak = level
+
+    def __call__(self, t):
+        return np.full(np.shape(t), self.level)
+
+
+class DiurnalLoad(LoadProfile):
+    """Sinusoidal load, i.e., 1 + amplitude * sin(2 pi t / period + phase).
+
+    Args:
+        period (float): period in simulation time, e.g., a day.
+        amplitude (float): amplitude in [0, 1].
+        phase (float): phase in radians.
+
+    """
+
+    def __init__(self, period: float, amplitude: float=0.5, phase: float=0.):
+        if not 0 <= amplitude <= 1:
+            raise ValueError("amplitude must be in [0, 1]")
+        self.period = period
+        self.amplitude = amplitude
+        self.phase = phase
+        self.peak = 1. + amplitude
+
+    def __call__(self, t):
+        return 1. + self.amplitude * np.sin(2 * np.pi * np.asarray(t) / self.period + self.phase)
+
+
+class StepLoad(LoadProfile):
+    """Piecewise constant load changing at given times.
+
+    Args:
+        times (list): increasing times when the load changes.
+        levels (list): multipliers before times[0], between times[i-1] and times[i] and after times[-1],
+            i.e., len(levels) == len(times) + 1. The last level must be positive, 
+            otherwise no request arrives after times[-1].
+
+    """
+
+    def __init__(self, times: list, levels: list):
+        if len(levels) != len(times) + 1:
+            raise ValueError("len(levels) must be len(times) + 1")
+        if np.any(np.diff(times) < 0) or min(levels) < 0 or max(levels) <= 0:
+            raise ValueError("times must be increasing and levels must be non-negative")
+        if levels[-1] <= 0:
+            raise ValueError("the last level must be positive")
+        self.times = np.asarray(times, dtype=np.float64)
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.peak = float(self.levels.max())
+
+    def __call__(self, t):
+        return self.levels[np.searchsorted(self.times, t, side='right')]
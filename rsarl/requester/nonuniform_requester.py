@@ -1,7 +1,7 @@
 
-import random
 import numpy as np
 from rsarl.requester import Requester
+from rsarl.requester.alias_table import AliasTable
 from rsarl.data import Request
 
 class NonuniformRequester(Requester):
@@ -9,16 +9,22 @@ class NonuniformRequester(Requester):
 
     The requester generate requests according to nonuniform distribution. 
 
+    The source is selected according to node_select_prob, and then the destination is 
+    selected according to node_select_prob except for the source. 
+    Pairs are drawn by alias tables in bulk and buffered. 
+
     Args:
         n_nodes (int): The number of nodes in used network. 
+        node_select_prob (list): weight to select each node. 
         seed (int): seed to initialize the pseudo-random number generator. 
+        buffer_size (int): The number of pairs drawn at once. 
 
     Attributes:
         avg_service_time (int): average service time per request
         avg_request_arrival_rate (int): average number of requests per unit time
 
     """
-    def __init__(self, n_nodes, node_select_prob, avg_service_time, avg_request_arrival_rate, seed=0):
+    def __init__(self, n_nodes, node_select_prob, avg_service_time, avg_request_arrival_rate, seed=0, buffer_size=1024):
 
         assert len(node_select_prob) == n_nodes
 
@@ -28,6 +34,41 @@ class NonuniformRequester(Requester):
         self.avg_request_arrival_rate = avg_request_arrival_rate
         #
         self.node_select_prob = node_select_prob
+        # i-th row is the weights of destinations from source i
+        dst_weights = np.tile(np.asarray(node_select_prob, dtype=np.float64), (n_nodes, 1))
+        np.fill_diagonal(dst_weights, 0.)
+        self.source_table = AliasTable(node_select_prob)
+        self.destination_table = AliasTable(dst_weights)
+        # buffered pairs
+        self.buffer_size = buffer_size
+        self._clear_buffer()
+
+
+    def _clear_buffer(self):
+        self._pair_buffer = np.empty((0, 2), dtype=np.int64)
+        self._buffer_idx = 0
+
+
+    def init(self):
+        super().init()
+        self._clear_buffer()
+
+
+    def seed(self, s):
+        super().seed(s)
+        self._clear_buffer()
+
+
+    def sample_pairs(self, n: int) -> np.ndarray:
+        """Draw n pairs of source-destination nodes at once. 
+
+        Returns:
+            np.ndarray: (n, 2) array of source and destination nodes. 
+
+        """
+        s = self.source_table.draw(self.rand_generator, n)
+        d = self.destination_table.draw(self.rand_generator, n, rows=s)
+        return np.stack([s, d], axis=1)
 
 
     def source_destination(self):
@@ -37,13 +78,12 @@ class NonuniformRequester(Requester):
             tuple: a pair of sourde-destination nodes. 
 
         """
-        s = random.choices(self.nodes, weights=self.node_select_prob)[0]
-        # delete prob of source node
-        copy_node_select_prob = np.copy(self.node_select_prob)
-        copy_node_select_prob[s] = 0.
-        copy_node_select_prob = copy_node_select_prob / np.sum(copy_node_select_prob)
-        d = random.choices(self.nodes, weights=copy_node_select_prob)[0]
-        return s, d
+        if self._buffer_idx >= len(self._pair_buffer):
+            self._pair_buffer = self.sample_pairs(self.buffer_size)
+            self._buffer_idx = 0
+        s, d = self._pair_buffer[self._buffer_idx]
+        self._buffer_idx += 1
+        return int(s), int(d)
 
     def duration(self) -> float:
         """Generate duration time. 
@@ -73,6 +113,23 @@ class NonuniformRequester(Requester):
         return self.rand_generator.exponential(1 / self.avg_request_arrival_rate)
 
 
+    def sample(self, n: int) -> dict:
+        """Draw n requests and time intervals before them at once.
+
+        Returns:
+            dict: columns of RequestTrace.
+
+        """
+        pairs = self.sample_pairs(n)
+        return dict(
+            source=pairs[:, 0],
+            destination=pairs[:, 1],
+            bandwidth=self.rand_generator.randint(25, 101, n),
+            duration=self.rand_generator.exponential(self.avg_service_time, n),
+            interval=self.rand_generator.exponential(1 / self.avg_request_arrival_rate, n),
+        )
+
+
     def request(self):
         """Generate request. 
 
@@ -1,4 +1,5 @@
 
+import copy
 import random
 import itertools
 import numpy as np
@@ -33,6 +34,36 @@ class Requester(metaclass=ABCMeta):
         self.rand_generator = np.random.RandomState(self._seed)
 
 
+    def clone(self):
+        """Clone requester. 
+
+            Node pairs and demand settings are shared with the clone, 
+            and only the state of random generator is copied.
+        """
+        requester = copy.copy(self)
+        requester.rand_generator = np.random.RandomState()
+        requester.rand_generator.set_state(self.rand_generator.get_state())
+        return requester
+
+
+    def sample(self, n: int) -> dict:
+        """Draw n requests and time intervals before them at once.
+
+            Requests are drawn one by one unless overridden by vectorized sampling. 
+
+            Returns:
+                dict: columns of RequestTrace, i.e., arrays of source, destination, 
+                    bandwidth, duration and interval. 
+        """
+        intervals, requests = [], []
+        for _ in range(n):
+            intervals.append(self.time_interval())
+            requests.append(self.request())
+        s, d, bandwidth, duration = zip(*requests) if requests else ([], [], [], [])
+        return dict(source=np.array(s), destination=np.array(d), bandwidth=np.array(bandwidth), 
+            duration=np.array(duration), interval=np.array(intervals))
+
+
     @abstractmethod
     def request(self):
         raise NotImplementedError
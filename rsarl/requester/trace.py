@@ -0,0 +1,119 @@
+
+
+import os
+import numpy as np
+from rsarl.data import Request
+
+
+class RequestTrace:
+    """Sequence of requests stored as columnar arrays.
+
+    The i-th request is (source[i], destination[i], bandwidth[i], duration[i])
+    and interval[i] is the time between the (i-1)-th and the i-th requests.
+    interval[0] is not used in replay since the first request is generated at reset.
+
+    Args:
+        n_nodes (int): The number of nodes in used network.
+        source (np.ndarray): source node of each request.
+        destination (np.ndarray): destination node of each request.
+        bandwidth (np.ndarray): bandwidth of each request.
+        duration (np.ndarray): duration time of each request.
+        interval (np.ndarray): time interval before each request.
+
+    """
+
+    FIELDS = ("source", "destination", "bandwidth", "duration", "interval")
+    DTYPES = (np.int32, np.int32, np.int32, np.float64, np.float64)
+
+    def __init__(self, n_nodes, source, destination, bandwidth, duration, interval):
+        self.n_nodes = int(n_nodes)
+        self.source = source
+        self.destination = destination
+        self.bandwidth = bandwidth
+        self.duration = duration
+        self.interval = interval
+        if any(len(getattr(self, f)) != len(source) for f in self.FIELDS):
+            raise ValueError("all columns must have the same length")
+
+
+    @classmethod
+    def empty(cls, n_nodes: int, n_requests: int):
+        """Allocate a trace whose columns are to be filled. """
+        return cls(n_nodes, *[np.zeros(n_requests, dtype=t) for t in cls.DTYPES])
+
+
+    def __len__(self):
+        return len(self.source)
+
+
+    def __getitem__(self, idx: int) -> Request:
+        return Request(
+            int(self.source[idx]), int(self.destination[idx]),
+            int(self.bandwidth[idx]), float(self.duration[idx]))
+
+
+    def columns(self) -> dict:
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+
+    def save(self, path: str):
+        """Save the trace.
+
+        Args:
+            path (str): .npz file if the path ends with '.npz'. Otherwise, the path is
+                a directory where each column is saved as .npy file, which can be memory-mapped.
+
+        """
+        if path.endswith(".npz"):
+            np.savez(path, n_nodes=self.n_nodes, **self.columns())
+            return
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "n_nodes.npy"), np.array(self.n_nodes))
+        for f, col in self.columns().items():
+            np.save(os.path.join(path, f"{f}.npy"), col)
+
+
+    @classmethod
+    def load(cls, path: str, mmap: bool=False):
+        """Load the trace saved by save().
+
+        Args:
+            path (str): .npz file or directory of .npy files.
+            mmap (bool): If True, columns of a directory are memory-mapped in read-only mode
+                instead of being read into memory. Ignored for .npz file.
+
+        Returns:
+            RequestTrace: loaded trace.
+
+        """
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                return cls(data["n_nodes"], *[data[f] for f in cls.FIELDS])
+        mmap_mode = "r" if mmap else None
+        n_nodes = np.load(os.path.join(path, "n_nodes.npy"))
+        return cls(n_nodes, *[np.load(os.path.join(path, f"{f}.npy"), mmap_mode=mmap_mode) for f in cls.FIELDS])
+
+
+def generate_trace(requester, n_requests: int, chunk_size: int=65536) -> RequestTrace:
+    """Generate a trace with the requester, drawing chunk_size requests at once.
+
+    Note:
+        Samples are drawn by Requester.sample(), so the trace is reproducible
+        with the seed of the requester and chunk_size but not the same as the sequence of request().
+
+    Args:
+        requester (Requester): requester to draw requests from.
+        n_requests (int): The number of requests.
+        chunk_size (int): The number of requests drawn at once.
+
+    Returns:
+        RequestTrace: generated trace.
+
+    """
+    trace = RequestTrace.empty(requester.n_nodes, n_requests)
+    columns = trace.columns()
+    for start in range(0, n_requests, chunk_size):
+        end = min(start + chunk_size, n_requests)
+        for f, col in requester.sample(end - start).items():
+            columns[f][start: end] = col
+    return trace
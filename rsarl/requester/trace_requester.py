@@ -0,0 +1,56 @@
+
+
+from rsarl.requester import Requester
+from rsarl.requester.trace import RequestTrace
+
+class TraceRequester(Requester):
+    """Trace Requester class
+
+    The requester replays requests of the trace from the beginning after init(), 
+    so that all envs and agents are evaluated on the identical sequence of requests. 
+
+    Note:
+        The trace does not depend on the seed, i.e., seed() does not change requests. 
+
+    Args:
+        trace (RequestTrace): trace to replay. 
+        seed (int): seed to initialize the pseudo-random number generator. 
+
+    Attributes:
+        cursor (int): index of the next request in the trace. 
+
+    """
+    def __init__(self, trace: RequestTrace, seed=0):
+        super().__init__(trace.n_nodes, seed)
+        self.trace = trace
+        self.cursor = 0
+
+    def init(self):
+        super().init()
+        self.cursor = 0
+
+    def _check_cursor(self):
+        if self.cursor >= len(self.trace):
+            raise IndexError(f"All {len(self.trace)} requests of the trace are replayed")
+
+    def time_interval(self):
+        """Time interval before the next request
+
+        Returns:
+        float: time interval
+        
+        """
+        self._check_cursor()
+        return float(self.trace.interval[self.cursor])
+
+    def request(self):
+        """Next request of the trace. 
+
+        Returns:
+            networkingrl.data.Request: request in namedtuple format. 
+
+        """
+        self._check_cursor()
+        req = self.trace[self.cursor]
+        self.cursor += 1
+        return req
@@ -0,0 +1,165 @@
+
+
+import numpy as np
+from rsarl.requester import Requester
+from rsarl.requester.alias_table import AliasTable
+from rsarl.requester.load_profile import LoadProfile, ConstantLoad
+from rsarl.data import Request
+
+class TrafficMatrixRequester(Requester):
+    """Traffic Matrix Requester class
+
+    The requester generates requests whose source-destination pairs follow the traffic matrix,
+    and whose arrivals follow a Poisson process with the rate avg_request_arrival_rate * load_profile(t).
+    The time-varying process is sampled by thinning, and requests are generated in batches.
+
+    Note:
+        The first request after init() arrives at time 0.
+
+    Args:
+        n_nodes (int): The number of nodes in used network.
+        traffic_matrix (np.ndarray): (n_nodes, n_nodes) non-negative weight of each pair.
+            Diagonal elements are ignored.
+        avg_service_time (int): average service time per request
+        avg_request_arrival_rate (int): average number of requests per unit time at load 1
+        load_profile (LoadProfile): multiplier of arrival rate over time. Constant if None.
+        seed (int): seed to initialize the pseudo-random number generator.
+        batch_size (int): The number of requests generated at once.
+        max_rejections (int): The maximum number of consecutive candidates rejected by thinning,
+            which guards against a load profile staying at 0.
+
+    Attributes:
+        clock (float): arrival time of the latest request.
+
+    """
+    def __init__(self, n_nodes, traffic_matrix, avg_service_time, avg_request_arrival_rate,
+        load_profile: LoadProfile=None, seed=0, batch_size=1024, max_rejections=10**7):
+        traffic_matrix = np.array(traffic_matrix, dtype=np.float64)
+        assert traffic_matrix.shape == (n_nodes, n_nodes)
+
+        super().__init__(n_nodes, seed)
+        # demand settings
+        self.avg_service_time = avg_service_time
+        self.avg_request_arrival_rate = avg_request_arrival_rate
+        self.load_profile = load_profile or ConstantLoad()
+        np.fill_diagonal(traffic_matrix, 0.)
+        self.traffic_matrix = traffic_matrix
+        self.pair_table = AliasTable(traffic_matrix.reshape(-1))
+        #
+        self.batch_size = batch_size
+        self.max_rejections = max_rejections
+        self._clear_batch()
+
+
+    def _clear_batch(self):
+        self.clock = 0.
+        self._last_arrival = None
+        self._batch = self._empty_columns()
+        self._batch_idx = 0
+
+
+    @staticmethod
+    def _empty_columns() -> dict:
+        return dict(source=np.empty(0, dtype=np.int64), destination=np.empty(0, dtype=np.int64),
+            bandwidth=np.empty(0, dtype=np.int64), duration=np.empty(0), interval=np.empty(0))
+
+
+    def init(self):
+        super().init()
+        self._clear_batch()
+
+
+    def seed(self, s):
+        super().seed(s)
+        self._clear_batch()
+
+
+    def arrival_times(self, n: int) -> np.ndarray:
+        """Generate next n arrival times by thinning.
+
+        Returns:
+            np.ndarray: (n, ) increasing arrival times.
+
+        Raises:
+            ValueError: When more than max_rejections candidates are rejected in a row.
+
+        """
+        times = []
+        t = self._last_arrival
+        if t is None:
+            times.append(np.zeros(min(n, 1)))
+            t = 0.
+        n_left = n - sum(len(a) for a in times)
+        peak = self.load_profile.peak
+        n_rejected = 0
+        while n_left > 0:
+            # candidates of the homogeneous process at peak rate
+            n_cand = int(np.ceil(n_left * peak)) + 16
+            gaps = self.rand_generator.exponential(1 / (self.avg_request_arrival_rate * peak), n_cand)
+            cand = t + np.cumsum(gaps)
+            accepted = cand[self.rand_generator.random_sample(n_cand) * peak < self.load_profile(cand)]
+            # candidates rejected in a row
+            n_rejected = n_rejected + n_cand if len(accepted) == 0 else 0
+            if n_rejected > self.max_rejections:
+                raise ValueError(f"{n_rejected} candidates are rejected in a row at time {t}, load profile may stay at 0")
+            accepted = accepted[:n_left]
+            times.append(accepted)
+            n_left -= len(accepted)
+            # the process is memoryless, so rejected candidates after the last one can be discarded
+            t = accepted[-1] if n_left == 0 else cand[-1]
+        times = np.concatenate(times) if times else np.empty(0)
+        if len(times):
+            self._last_arrival = times[-1]
+        return times
+
+
+    def sample(self, n: int) -> dict:
+        """Draw n requests and time intervals before them at once.
+
+        Returns:
+            dict: columns of RequestTrace.
+
+        """
+        prev = self._last_arrival
+        times = self.arrival_times(n)
+        pairs = self.pair_table.draw(self.rand_generator, n)
+        return dict(
+            source=pairs // self.n_nodes,
+            destination=pairs % self.n_nodes,
+            bandwidth=self.rand_generator.randint(25, 101, n),
+            duration=self.rand_generator.exponential(self.avg_service_time, n),
+            interval=np.diff(times, prepend=times[:1] if prev is None else prev),
+        )
+
+
+    def _next_batch(self):
+        if self._batch_idx >= len(self._batch["source"]):
+            self._batch = self.sample(self.batch_size)
+            self._batch_idx = 0
+
+
+    def time_interval(self):
+        """Generate time interval between requests
+
+        Returns:
+        float: time interval
+
+        """
+        self._next_batch()
+        return float(self._batch["interval"][self._batch_idx])
+
+
+    def request(self):
+        """Generate request.
+
+        Returns:
+            networkingrl.data.Request: request in namedtuple format.
+
+        """
+        self._next_batch()
+        i = self._batch_idx
+        self._batch_idx += 1
+        self.clock += float(self._batch["interval"][i])
+        return Request(
+            int(self._batch["source"][i]), int(self._batch["destination"][i]),
+            int(self._batch["bandwidth"][i]), float(self._batch["duration"][i]))
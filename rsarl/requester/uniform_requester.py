@@ -24,6 +24,7 @@ class UniformRequester(Requester):
         # demand settings
         self.avg_service_time = avg_service_time
         self.avg_request_arrival_rate = avg_request_arrival_rate
+        self._pair_array = np.array(self.pairs)
 
     def source_destination(self):
         """Generate a random pair of nodes. 
@@ -64,6 +65,23 @@ class UniformRequester(Requester):
         return self.rand_generator.exponential(1 / self.avg_request_arrival_rate)
 
 
+    def sample(self, n: int) -> dict:
+        """Draw n requests and time intervals before them at once.
+
+        Returns:
+            dict: columns of RequestTrace.
+
+        """
+        pairs = self._pair_array[self.rand_generator.randint(0, len(self.pairs), n)]
+        return dict(
+            source=pairs[:, 0],
+            destination=pairs[:, 1],
+            bandwidth=self.rand_generator.randint(25, 101, n),
+            duration=self.rand_generator.exponential(self.avg_service_time, n),
+            interval=self.rand_generator.exponential(1 / self.avg_request_arrival_rate, n),
+        )
+
+
     def request(self):
         """Generate request. 
 
@@ -46,15 +46,16 @@ def count_misalignment(net, path: list, start_idx: int, req_n_slot: int):
     
     misalign_change = 0
     for e in edges:
+        target_slot = bitarray(net.slot_rows(net.edge_index[e]).tolist())
         # search neighbors
         for node in list(e):
-            for neighbor, attr in net.G[node].items():
-                if sort_tuple((neighbor, node)) in edges:
+            for neighbor in net.G[node]:
+                neighbor_edge = sort_tuple((neighbor, node))
+                if neighbor_edge in edges:
                     continue
                     
                 # calc misalignment
-                target_slot = bitarray(net.slot[e])
-                neighbor_slot = bitarray(attr["slot"])
+                neighbor_slot = bitarray(net.slot_rows(net.edge_index[neighbor_edge]).tolist())
                 # sum up
                 misalign_change += misalignment(target_slot, neighbor_slot, start_idx, req_n_slot)
                 
@@ -1,6 +1,6 @@
 
 from bitarray import bitarray
-from rsarl.utils import path_to_edges, k_consecutive_available_slot
+from rsarl.utils import k_consecutive_available_slot
 
 
 def is_cut(slot_vec: bitarray, start_idx: int, req_n_slot: int):
@@ -48,8 +48,9 @@ def count_cut(net, path: list, start_idx: int, n_req_slot: int):
 
     """
     count = 0
-    for e in path_to_edges(path):
-        slot = bitarray(net.slot[e])
+    # gather rows on the path only instead of converting the whole slot table
+    for row in net.slot_rows(net.path_rows(path)):
+        slot = bitarray(row.tolist())
         if is_cut(slot, start_idx, n_req_slot):
             count += 1
             
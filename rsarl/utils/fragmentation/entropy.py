@@ -2,7 +2,7 @@
 
 import numpy as np
 from bitarray import bitarray
-from rsarl.utils import path_to_edges, assignable_indices, k_consecutive_available_slot, copy_and_assign_slot
+from rsarl.utils import assignable_indices, k_consecutive_available_slot, copy_and_assign_slot
 
 
 def entropy(path_slot: bitarray) -> float:
@@ -79,11 +79,9 @@ def edge_based_entropy(net, path: list, n_req_slot: int) -> np.ndarray:
             n_req_slot (int): required number of slot to assign path. 
     
     """
-    slot_dict = net.slot
-    edges = path_to_edges(path)
     total_entropy = np.zeros(net.n_slot,)
-    for e in edges:
-        path_slot = bitarray(slot_dict[e])
+    for row in net.slot_rows(net.path_rows(path)):
+        path_slot = bitarray(row.tolist())
         path_vec_ent = _path_based_entropy(path_slot, n_req_slot)
         total_entropy += path_vec_ent
 
@@ -1,6 +1,5 @@
 
 import numpy as np
-import networkx as nx
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 from rsarl.utils import path_to_edges
@@ -8,28 +7,24 @@ from rsarl.utils import path_to_edges
 # color map
 cmap = plt.get_cmap("tab10")
 
-def gen_slot_table(G, act):
-    edge_dict = nx.get_edge_attributes(G, name="slot")
-    n_slot = len(list(edge_dict.values())[0])
-    
+def gen_slot_table(state, act):
+    """
+    Args:
+        state (NetworkState): arrays of network state
+        act (Action): assigned action
+    """
+    n_slot = state.slot.shape[1]
+    slot_data = state.slot.astype(np.float32)
+
     # assigned path
     if act.path is not None:
-        assigned_edges = path_to_edges(act.path)
+        edge_index = {e: i for i, e in enumerate(state.edges)}
+        rows = [edge_index[e] for e in path_to_edges(act.path)]
+        slot_data[rows, act.slot_idx: act.slot_idx + act.n_slot] = 0.5
 
     # edge-name list
-    edges = []
-    slot_data=[]
-    duration_data=[]
-    # slot table values (1: available 0: occupied)
-    for e, attr in G.edges.items():
-        slot = attr["slot"]
-        if act.path is not None and e in assigned_edges:
-            for s in range(act.slot_idx, act.slot_idx + act.n_slot):
-                slot[s] = 0.5
-        
-        edges.append(f"{e}")
-        slot_data.append(slot)
-        duration_data.append(attr["time"])
+    edges = [f"{e}" for e in state.edges]
+    duration_data = state.time
 
     # make heatmap
     # slot utilization table
@@ -71,8 +66,13 @@ def gen_slot_table(G, act):
     return go.Figure(data=[slot_util, duration], layout=layout)
 
 
-def gen_network_topology(G, act):
-    node_pos_dict = nx.get_node_attributes(G, name='position')
+def gen_network_topology(state, act):
+    """
+    Args:
+        state (NetworkState): arrays of network state
+        act (Action): assigned action
+    """
+    node_pos_dict = dict(enumerate(state.positions.tolist()))
     """
         Add edges
     """
@@ -83,7 +83,7 @@ def gen_network_topology(G, act):
     # Add edges
     edge_x = []
     edge_y = []
-    for e in G.edges():
+    for e in state.edges:
         if act.path is not None and e in path_edges:
             continue
 
@@ -153,7 +153,7 @@ def gen_network_topology(G, act):
         Hover nodes
     """
     node_text = []
-    for n in G.nodes():
+    for n in node_pos_dict.keys():
         node_text.append(f'Node id: {n}')
     node_trace.text = node_text
 
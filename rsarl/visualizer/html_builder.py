@@ -10,7 +10,6 @@ import numpy as np
 from pathlib import Path
 from collections import defaultdict
 from collections import OrderedDict
-from rsarl.utils import get_mean_std
 from rsarl.visualizer import gen_network_topology, gen_slot_table, gen_blocking_prob_line_graph
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
@@ -51,11 +50,11 @@ def set_callback(exp_name):
         # getch experiment name
         encoded_exp_name = slider_val_text.split(":")[0]
         exp_name = _id_decode(encoded_exp_name)
-        act, req, G = db.get_act_history(exp_name, req_id)
+        act, req, state = db.get_act_history(exp_name, req_id)
 
         # build figure
-        net_figure = gen_network_topology(G, act)
-        slot_figure = gen_slot_table(G, act)
+        net_figure = gen_network_topology(state, act)
+        slot_figure = gen_slot_table(state, act)
 
         # build label
         request_slider_label = f"[{req_id}-th Request] source: {req.source} -> destination: {req.destination}, bandwidth: {req.bandwidth}"
@@ -128,13 +127,10 @@ def insert_exp_info(exp_names: list, div):
             exp_metrics.append(build_exp_setting_table(exp_dict))
 
             # ---- Blocking Probability in Summary Section ---- #
-            # calc blocking prob
-            batches = db.get_batches(exp_name)
-            bp_per_batch = db.get_bp_per_batch(exp_name, batches)
+            # blocking prob aggregated over envs in db
+            stats = db.get_evaluation_stats(exp_name)
             # prepare coordinates for list of line graph
-            x = np.array(list(bp_per_batch.keys()))
-            y_mean, y_std = get_mean_std(bp_per_batch)
-            bp_list.append((exp_name, x, y_mean, y_std))
+            bp_list.append((exp_name, stats.batch, stats.mean, stats.std))
 
         # build blocking prob figure
         bp_figure = gen_blocking_prob_line_graph(bp_list)
@@ -307,10 +303,10 @@ def build_summary():
 
 def build_experiment(exp_name: str, req_id: int=0):
     # generate initial figure (first seed, request-id is 0)
-    act, req, G = db.get_act_history(exp_name, req_id)
+    act, req, state = db.get_act_history(exp_name, req_id)
     # build figure
-    net_figure = gen_network_topology(G, act)
-    slot_figure = gen_slot_table(G, act)
+    net_figure = gen_network_topology(state, act)
+    slot_figure = gen_slot_table(state, act)
     # build label
     request_slider_label = f"[{req_id}-th Request] source: {req.source} -> destination: {req.destination}, bandwidth: {req.bandwidth}"
     # remove .
@@ -0,0 +1,66 @@
+
+
+import os
+import pytest
+from rsarl.networks import SingleFiberNetwork
+from rsarl.algorithms import Routing, build_ksp_table, all_pairs_k_shortest_paths
+from rsarl.utils import path_to_edges
+
+
+@pytest.mark.parametrize("is_weight", [True, False])
+def test_all_pairs_k_shortest_paths(is_weight):
+    net = SingleFiberNetwork("nsf", n_slot=10, is_weight=is_weight)
+    k = 5
+    path_table = all_pairs_k_shortest_paths(net, k)
+    assert len(path_table) == net.n_nodes * (net.n_nodes - 1) // 2
+
+    for (s, d), paths in path_table.items():
+        expect = Routing.k_shortest_paths(net, s, d, k, is_weight=is_weight)
+        # same lengths as networkx, paths of equal length may be in different order
+        assert [net.distance(p) for p in paths] == [net.distance(p) for p in expect]
+        assert len(set(map(tuple, paths))) == len(paths)
+        for path in paths:
+            assert path[0] == s and path[-1] == d
+            assert len(set(path)) == len(path)
+            assert all(net.G.has_edge(*e) for e in path_to_edges(path))
+
+
+def test_build_ksp_table_cache(net, tmp_path):
+    path_table = build_ksp_table(net, 3, cache_dir=str(tmp_path))
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+
+    # load from cache
+    assert build_ksp_table(net, 3, cache_dir=str(tmp_path)) == path_table
+    assert os.listdir(tmp_path) == files
+    # different k is another cache
+    build_ksp_table(net, 2, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+    # different algorithm is another cache
+    assert build_ksp_table(net, 3, cache_dir=str(tmp_path), algorithm="yen") == all_pairs_k_shortest_paths(net, 3)
+    assert len(os.listdir(tmp_path)) == 3
+
+
+@pytest.mark.parametrize("is_weight", [True, False])
+def test_build_ksp_table_networkx_order(is_weight):
+    net = SingleFiberNetwork("nsf", n_slot=10, is_weight=is_weight)
+    path_table = build_ksp_table(net, 5)
+    for (s, d), paths in path_table.items():
+        assert paths == Routing.k_shortest_paths(net, s, d, 5, is_weight=is_weight)
+    with pytest.raises(ValueError):
+        build_ksp_table(net, 5, algorithm="dijkstra")
+
+
+def test_all_pairs_k_shortest_paths_parallel(net):
+    path_table = all_pairs_k_shortest_paths(net, 3)
+    parallel_table = all_pairs_k_shortest_paths(net, 3, n_workers=2)
+    assert parallel_table == path_table
+    # deterministic order of pairs
+    assert list(parallel_table) == list(path_table)
+
+
+def test_build_ksp_table_networkx_parallel(net):
+    path_table = build_ksp_table(net, 3)
+    parallel_table = build_ksp_table(net, 3, n_workers=2)
+    assert parallel_table == path_table
+    assert list(parallel_table) == list(path_table)
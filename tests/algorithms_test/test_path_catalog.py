@@ -0,0 +1,68 @@
+
+
+import pytest
+import numpy as np
+from rsarl.algorithms import PathCatalog, Routing, SpectrumAssignment
+from rsarl.utils import cal_slot, sort_tuple
+from rsarl.networks import SingleFiberNetwork
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_path_catalog(net_name, request):
+    net = request.getfixturevalue(net_name)
+    path_table = {(0, 13): Routing.k_shortest_paths(net, 0, 13, 3, is_weight=True)}
+    catalog = PathCatalog(net, path_table, max_bandwidth=100)
+
+    # not sorted pair is also available
+    assert catalog[(13, 0)] is catalog[(0, 13)]
+    net.assign_path(path_table[(0, 13)][0], 2, 3, 1.)
+    for cand, path in zip(catalog[(0, 13)], path_table[(0, 13)]):
+        assert cand.path == path
+        assert cand.distance == net.distance(path)
+        assert np.array_equal(cand.rows, net.path_rows(path))
+        assert np.array_equal(cand.slot_mask(net), net.path_slot_array(path))
+        for bandwidth in [25, 100, 200]:
+            assert cand.n_req_slot(bandwidth) == cal_slot(bandwidth, cand.distance)
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_batch_first_fit(net_name, request):
+    net = request.getfixturevalue(net_name)
+    sds = [(0, 13), (2, 7), (5, 1)]
+    path_table = {
+        sort_tuple(sd): Routing.k_shortest_paths(net, *sort_tuple(sd), 3, is_weight=True) for sd in sds}
+    catalog = PathCatalog(net, path_table)
+    # occupy some slots
+    path = catalog[(0, 13)][0].path
+    net.assign_path(path, 0, 3, 10)
+    net.assign_path(path, 5, 2, 10)
+
+    bandwidths = [25, 100, 200]
+    slot_idx, n_req_slot = catalog.batch_first_fit([net] * len(sds), sds, bandwidths)
+    for b, (sd, bandwidth) in enumerate(zip(sds, bandwidths)):
+        for i, cand in enumerate(catalog[sd]):
+            n = cand.n_req_slot(bandwidth)
+            idx = SpectrumAssignment.first_fit(net.path_slot_array(cand.path), n)
+            assert n_req_slot[b, i] == n
+            assert slot_idx[b, i] == (-1 if idx is None else idx)
+
+
+def test_path_catalog_unweighted():
+    net = SingleFiberNetwork("nsf", n_slot=10, is_weight=False)
+    path_table = {(0, 13): Routing.k_shortest_paths(net, 0, 13, 3, is_weight=False)}
+    catalog = PathCatalog(net, path_table)
+    # distance is hop count
+    for cand in catalog[(0, 13)]:
+        assert cand.distance == len(cand.path) - 1
+
+
+def test_path_catalog_guard(net):
+    path_table = {(0, 13): Routing.k_shortest_paths(net, 0, 13, 3, is_weight=True)}
+    catalog = PathCatalog(net, path_table, max_bandwidth=100, guard=1)
+    for cand in catalog[(0, 13)]:
+        # above max_bandwidth is calculated on demand with the guard
+        for bandwidth in [100, 200]:
+            assert cand.n_req_slot(bandwidth) == cal_slot(bandwidth, cand.distance, 1)
+    n_req_slot = catalog.batch_n_req_slot([(0, 13), (13, 0)], [100, 200])
+    assert n_req_slot.tolist() == [
+        [cal_slot(b, c.distance, 1) for c in catalog[(0, 13)]] for b in [100, 200]]
@@ -0,0 +1,87 @@
+
+
+import random
+import pytest
+import numpy as np
+from bitarray import bitarray
+from rsarl.algorithms import sa_kernel, SpectrumAssignment
+from rsarl.utils import assignable_indices, k_consecutive_available_slot
+
+
+def brute_force(slot: list, n: int) -> tuple:
+    """ feasible indices and (start, length) of free blocks """
+    indices = [i for i in range(len(slot) - n + 1) if all(slot[i: i + n])]
+    blocks, i = [], 0
+    while i < len(slot):
+        if slot[i]:
+            j = i
+            while j < len(slot) and slot[j]:
+                j += 1
+            blocks.append((i, j - i))
+            i = j
+        else:
+            i += 1
+    return indices, blocks
+
+
+slot_test_data = [
+    ([1, 1, 1, 1, 1], 5),
+    ([0, 0, 0, 0, 0], 1),
+    ([1, 0, 1, 1, 0, 1, 1, 1, 0, 1], 2),
+    ([1, 1, 1, 0, 1, 1, 0, 1, 1, 1], 2),
+    ([1, 1, 1, 0, 1, 1, 0, 1, 1, 1], 3),
+    ([1, 1, 1, 0, 1, 1, 0, 1, 1, 1], 11),
+]
+@pytest.mark.parametrize("slot, n", slot_test_data)
+def test_sa_kernel(slot, n):
+    indices, blocks = brute_force(slot, n)
+    fits = [b for b in blocks if b[1] >= n]
+    exact = [b for b in blocks if b[1] == n]
+    mask = sa_kernel.to_mask(bitarray(slot))
+
+    assert np.flatnonzero(sa_kernel.fit_mask(mask, n)).tolist() == indices
+    assert sa_kernel.first_fit(mask, n) == (indices[0] if indices else None)
+    assert sa_kernel.last_fit(mask, n) == (indices[-1] if indices else None)
+    assert sa_kernel.best_fit(mask, n) == (min(fits, key=lambda b: b[1])[0] if fits else None)
+    assert sa_kernel.exact_fit(mask, n) == (exact[0][0] if exact else sa_kernel.first_fit(mask, n))
+    random_idx = sa_kernel.random_fit(mask, n)
+    assert random_idx in indices if indices else random_idx is None
+
+
+def test_spectrum_assignment_compatibility():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        slot = bitarray(rng.integers(0, 2, 20).tolist())
+        n = int(rng.integers(1, 5))
+        indices = assignable_indices(slot, n)
+        mask = np.array(slot.tolist(), dtype=np.uint8)
+        # bitarray and ndarray give the same result
+        assert SpectrumAssignment.first_fit(slot, n) == SpectrumAssignment.first_fit(mask, n)
+        assert SpectrumAssignment.first_fit(slot, n) == (indices[0] if indices else None)
+        # same random sequence as choosing from assignable indices
+        random.seed(n)
+        expect = random.choice(indices) if indices else None
+        random.seed(n)
+        assert SpectrumAssignment.random(slot, n) == expect
+
+
+def test_batch_first_fit():
+    rng = np.random.default_rng(1)
+    masks = rng.integers(0, 2, (50, 20)).astype(bool)
+    n = rng.integers(1, 6, 50)
+    expect = [sa_kernel.first_fit(m, i) for m, i in zip(masks, n)]
+    expect = [-1 if idx is None else idx for idx in expect]
+    assert sa_kernel.batch_first_fit(masks, n).tolist() == expect
+
+
+def test_batch_fit_blocks():
+    rng = np.random.default_rng(2)
+    masks = rng.integers(0, 2, (50, 20)).astype(bool)
+    n = rng.integers(1, 6, 50)
+    n_blocks, start, length, total = sa_kernel.batch_fit_blocks(masks, n)
+    for b, (m, i) in enumerate(zip(masks, n)):
+        slot = bitarray(m.tolist())
+        n_found, starts, lengths = k_consecutive_available_slot(slot, i)
+        assert n_blocks[b] == n_found
+        assert total[b] == sum(lengths)
+        assert (start[b], length[b]) == ((starts[0], lengths[0]) if n_found else (-1, -1))
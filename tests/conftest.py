@@ -1,9 +1,11 @@
 
 
 import pytest
-from rsarl.networks import SingleFiberNetwork
+from rsarl.networks import SingleFiberNetwork, ArrayNetwork
 from rsarl.envs import DeepRMSAEnv
 from rsarl.requester import UniformRequester
+from rsarl.agents import KSPAgentFactory
+from rsarl.agents.drl_agents import DeepRMSAv2Agent
 
 n_slot = 10
 n_nodes = 14
@@ -14,6 +16,12 @@ def net():
     return _net
 
 
+@pytest.fixture
+def array_net():
+    _net = ArrayNetwork("nsf", n_slot=n_slot, is_weight=True)
+    return _net
+
+
 @pytest.fixture
 def requester():
     _requester = UniformRequester(n_nodes, 10, 12)
@@ -28,3 +36,30 @@ def env():
     return _env
 
 
+@pytest.fixture
+def array_env():
+    net = ArrayNetwork("nsf", n_slot=n_slot, is_weight=True)
+    requester = UniformRequester(n_nodes, 10, 12)
+    _env = DeepRMSAEnv(net, requester)
+    return _env
+
+
+@pytest.fixture
+def ff_agent(array_env):
+    _agent = KSPAgentFactory.create("ff", 3)
+    _agent.prepare_ksp_table(array_env.net)
+    return _agent
+
+
+class FirstPathDRL:
+    """ choose the shortest path always """
+
+    def batch_act(self, batch_obs):
+        return [0 for _ in batch_obs]
+
+
+@pytest.fixture
+def deeprmsa_agent(array_env):
+    _agent = DeepRMSAv2Agent(3, FirstPathDRL())
+    _agent.prepare_ksp_table(array_env.net)
+    return _agent
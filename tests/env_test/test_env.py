@@ -11,3 +11,16 @@ from rsarl.envs import DeepRMSAEnv
 
 
     
+
+
+def test_clone(env):
+    obs = env.reset()
+    clone = env.clone()
+    assert clone.net is not env.net and clone.requester is not env.requester
+    assert clone.last_obs.net is clone.net
+
+    # the same sequence of requests
+    for _ in range(10):
+        next_obs, _, _, _ = env.step(None)
+        clone_obs, _, _, _ = clone.step(None)
+        assert next_obs.request == clone_obs.request
@@ -0,0 +1,166 @@
+
+
+import gc
+import pytest
+import numpy as np
+from rsarl.networks import NetworkRecorder, delta_base, replay
+from rsarl.envs import make_serial_vector_env, make_multiprocess_vector_env, make_batched_vector_env
+from rsarl.data import FeatureObservation
+
+
+def run(vec_env, agent, n_requests):
+    obss = vec_env.reset()
+    for _ in range(n_requests):
+        acts = agent.batch_act(obss)
+        obss, _, dones, _ = vec_env.step(acts)
+        obss = vec_env.reset(np.logical_not(dones))
+    return obss
+
+
+def test_shared_memory_vector_env(array_env, ff_agent):
+    env, agent = array_env, ff_agent
+
+    serial_obss = run(make_serial_vector_env(env, 2, 0, False), agent, 30)
+    vec_env = make_multiprocess_vector_env(env, 2, 0, False, shared_memory=True)
+    try:
+        obss = run(vec_env, agent, 30)
+        assert vec_env.n_steps == [30, 30]
+        for obs, serial_obs in zip(obss, serial_obss):
+            assert obs.request == serial_obs.request
+            assert np.array_equal(obs.net.slot_table, serial_obs.net.slot_table)
+            assert np.array_equal(obs.net.time_table, serial_obs.net.time_table)
+            assert obs.net.resource_util() == serial_obs.net.resource_util()
+            assert list(obs.net.lightpaths) == list(serial_obs.net.lightpaths)
+            # read-only views
+            with pytest.raises(ValueError):
+                obs.net.slot_table[0, 0] = 0
+    finally:
+        vec_env.close()
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_shared_memory_requires_array_network(env):
+    with pytest.raises(ValueError):
+        make_multiprocess_vector_env(env, 1, 0, False, shared_memory=True)
+    # nothing to close
+    gc.collect()
+
+
+def test_shared_memory_recorder(array_env, ff_agent):
+    env, agent, net = array_env, ff_agent, array_env.net
+    env.episode_step = 12
+
+    vec_env = make_multiprocess_vector_env(env, 1, 0, False, shared_memory=True)
+    recorder = NetworkRecorder(snapshot_interval=100)
+    try:
+        obss = vec_env.reset()
+        records = []
+        for req_id in range(30):
+            records.append(recorder.record(req_id, obss[0].net))
+            # deltas are rebuilt from lightpaths synchronized with the worker
+            base = delta_base(records[-1])
+            state = replay(records[req_id if base is None else base:])
+            slot = obss[0].net.slot_table
+            assert np.array_equal(state.slot, slot[[net.edge_index[e] for e in state.edges]])
+            obss, _, dones, _ = vec_env.step(agent.batch_act(obss))
+            obss = vec_env.reset(np.logical_not(dones))
+    finally:
+        vec_env.close()
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_worker_observation_transform(shared_memory, array_env, deeprmsa_agent):
+    env, agent = array_env, deeprmsa_agent
+
+    serial_env = make_serial_vector_env(env, 2, 0, False)
+    vec_env = make_multiprocess_vector_env(
+        env, 2, 0, False, shared_memory=shared_memory, obs_transform=agent.observation_transform())
+    try:
+        serial_obss, obss = serial_env.reset(), vec_env.reset()
+        for _ in range(20):
+            for obs, serial_obs in zip(obss, serial_obss):
+                assert isinstance(obs, FeatureObservation)
+                assert np.array_equal(obs.fvec, agent.preprocess(serial_obs))
+            acts = agent.batch_act(obss)
+            assert acts == agent.batch_act(serial_obss)
+            serial_obss, _, _, _ = serial_env.step(acts)
+            obss, _, _, _ = vec_env.step(acts)
+    finally:
+        vec_env.close()
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_worker_action_mapping(shared_memory, array_env, deeprmsa_agent):
+    env, agent = array_env, deeprmsa_agent
+
+    serial_env = make_serial_vector_env(env, 2, 0, False)
+    vec_env = make_multiprocess_vector_env(
+        env, 2, 0, False, shared_memory=shared_memory, 
+        obs_transform=agent.observation_transform(), action_mapper=agent.action_mapper())
+    try:
+        serial_obss, obss = serial_env.reset(), vec_env.reset()
+        for _ in range(20):
+            acts = agent.batch_act(serial_obss)
+            serial_obss, serial_rews, _, serial_infos = serial_env.step(acts)
+            obss, rews, _, infos = vec_env.step_drlout(agent.batch_drl_act(obss))
+            assert [info["action"] for info in infos] == acts
+            assert list(rews) == list(serial_rews)
+            assert [info["is_success"] for info in infos] == [info["is_success"] for info in serial_infos]
+    finally:
+        vec_env.close()
+
+
+def test_batched_vector_env(array_env, ff_agent):
+    env, agent = array_env, ff_agent
+    env.episode_step = 20
+
+    serial_env = make_serial_vector_env(env, 3, 0, False)
+    batched_env = make_batched_vector_env(env, 3, 0, False)
+    serial_obss, obss = serial_env.reset(), batched_env.reset()
+    for _ in range(50):
+        acts = agent.batch_act(obss)
+        assert acts == agent.batch_act(serial_obss)
+        serial_obss, serial_rews, serial_dones, serial_infos = serial_env.step(acts)
+        obss, rews, dones, infos = batched_env.step(acts)
+        assert list(rews) == list(serial_rews)
+        assert list(dones) == list(serial_dones)
+        assert infos == list(serial_infos)
+        for obs, serial_obs in zip(obss, serial_obss):
+            assert obs.request == serial_obs.request
+            assert np.array_equal(obs.net.slot_table, serial_obs.net.slot_table)
+            assert np.allclose(obs.net.time_table, serial_obs.net.time_table)
+            assert np.array_equal(obs.net.edge_occupancy, serial_obs.net.edge_occupancy)
+            assert [lp[1:] for lp in obs.net.lightpaths] == [lp[1:] for lp in serial_obs.net.lightpaths]
+        assert batched_env.resource_util().tolist() == [o.net.resource_util() for o in serial_obss]
+        serial_obss = serial_env.reset(np.logical_not(serial_dones))
+        obss = batched_env.reset(np.logical_not(dones))
+
+    # slot of paths of all envs at once
+    path = agent.path_catalog[(0, 13)][0]
+    rows = np.tile(path.rows, (3, 1, 1))
+    masks = batched_env.path_slot_masks(rows)
+    for mask, obs in zip(masks, obss):
+        assert np.array_equal(mask[0], obs.net.path_slot_array(path.path))
+
+
+def test_batched_vector_env_features(array_env, deeprmsa_agent):
+    env, agent, net = array_env, deeprmsa_agent, array_env.net
+
+    batched_env = make_batched_vector_env(env, 3, 0, False)
+    recorders = [NetworkRecorder(snapshot_interval=5) for _ in range(3)]
+    records = [[] for _ in range(3)]
+    obss = batched_env.reset()
+    for req_id in range(30):
+        fvecs = agent.batch_preprocess(obss)
+        for fvec, obs in zip(fvecs, obss):
+            assert np.array_equal(fvec, agent.preprocess(obs))
+        for recorder, rec, obs in zip(recorders, records, obss):
+            rec.append(recorder.record(req_id, obs.net))
+        slots = batched_env.slot_table.copy()
+        obss, _, _, _ = batched_env.step(agent.batch_act(obss))
+
+    # deltas are rebuilt from registered lightpaths
+    for rec, slot in zip(records, slots):
+        assert delta_base(rec[-1]) == 25
+        state = replay(rec[25:])
+        assert np.array_equal(state.slot, slot[[net.edge_index[e] for e in state.edges]])
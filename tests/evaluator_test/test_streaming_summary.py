@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from rsarl.networks import SingleFiberNetwork
+from rsarl.requester import UniformRequester
+from rsarl.envs import DeepRMSAEnv, make_serial_vector_env, make_multiprocess_vector_env
+from rsarl.agents import KSPAgentFactory
+from rsarl.evaluator import (
+    StreamingSummary, Evaluator, batch_evaluation, batch_streaming_evaluation, batch_summary)
+
+
+def make_vec_env_and_agent():
+    net = SingleFiberNetwork("nsf", n_slot=10, is_weight=True)
+    env = DeepRMSAEnv(net, UniformRequester(net.n_nodes, 10, 12))
+    agent = KSPAgentFactory.create("ff", 3)
+    agent.prepare_ksp_table(net)
+    return make_serial_vector_env(env, 2, 0, False), agent
+
+
+def test_streaming_evaluation():
+    vec_env, agent = make_vec_env_and_agent()
+    vec_env.reset()
+    expected = batch_summary(batch_evaluation(vec_env, agent, 200))
+    vec_env.reset()
+    stats = batch_streaming_evaluation(vec_env, agent, 200, window_size=50)
+    for values, expected_values in zip(stats.summary(), expected):
+        assert values == pytest.approx(expected_values)
+    assert stats.window_blocking_probs.shape == (2, 4)
+    assert np.allclose(stats.window_blocking_probs.mean(axis=1), stats.blocking_probs)
+
+
+def test_confidence_interval():
+    stats = StreamingSummary(2, window_size=2)
+    with pytest.raises(ValueError):
+        stats.confidence_interval()
+    for is_success in [[True, False], [False, False], [True, True], [True, False]]:
+        stats.update(is_success, [0.1, 0.2], [1., -1.])
+    assert list(stats.blocking_probs) == [25., 75.]
+    assert list(stats.avg_utils) == pytest.approx([0.1, 0.2])
+    assert list(stats.total_rewards) == [4., -4.]
+    mean, half_width = stats.confidence_interval()
+    assert list(mean) == [25., 75.]
+    assert half_width[0] == pytest.approx(1.959964 * 25 * np.sqrt(2) / np.sqrt(2))
+
+
+def test_streaming_evaluator():
+    vec_env, agent = make_vec_env_and_agent()
+    logs = []
+    evaluator = Evaluator(
+        vec_env, warming_up_steps=10, evalutate_steps=100, streaming=True, window_size=20,
+        logger=lambda agent, exps, *metrics: logs.append((exps, metrics)))
+    bp = evaluator.evaluate(agent)
+    assert logs[0][0] is None
+    assert bp == pytest.approx(np.mean(logs[0][1][0]))
+    assert evaluator.last_summary.window_blocking_probs.shape == (2, 5)
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_evaluation_with_obs_transform(shared_memory, array_env, deeprmsa_agent):
+    env, agent = array_env, deeprmsa_agent
+
+    serial_env = make_serial_vector_env(env, 2, 0, False)
+    serial_env.reset()
+    expected = batch_evaluation(serial_env, agent, 100)
+    vec_env = make_multiprocess_vector_env(
+        env, 2, 0, False, shared_memory=shared_memory, obs_transform=agent.observation_transform())
+    try:
+        vec_env.reset()
+        stats = batch_streaming_evaluation(vec_env, agent, 100)
+        for values, expected_values in zip(stats.summary(), batch_summary(expected)):
+            assert values == pytest.approx(expected_values)
+
+        evaluator = Evaluator(vec_env, warming_up_steps=0, evalutate_steps=100)
+        if not shared_memory:
+            # networks to record are not available
+            with pytest.raises(ValueError):
+                evaluator.evaluate(agent)
+            return
+        logs = []
+        evaluator.logger = lambda agent, exps, *metrics: logs.append(exps)
+        evaluator.evaluate(agent)
+        assert logs[0][0] == expected[0] and logs[0][1] == expected[1]
+    finally:
+        vec_env.close()
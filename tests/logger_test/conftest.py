@@ -0,0 +1,17 @@
+import pytest
+from rsarl.data import Experience
+
+
+def _make_experiences(n, offset=0):
+    return [Experience(
+        request_id=i, source=1, destination=i % 5 + 2, bandwidth=50, duration=1.5 * i,
+        path=None if i % 3 == 0 else "1,2,3", slot_index=None if i % 3 == 0 else i,
+        n_slot=None if i % 3 == 0 else 4, is_success=i % 3 != 0, reward=1. if i % 3 else -1.,
+        network=b"\x00\x01binary" if i == 0 else f'{{"delta": {i + offset}}}', slot_utilization=0.1 * i)
+        for i in range(n)]
+
+
+@pytest.fixture
+def make_experiences():
+    """ make_experiences(n, offset=0) creates n experiences whose deltas are shifted by offset """
+    return _make_experiences
@@ -0,0 +1,60 @@
+import pytest
+from rsarl.algorithms import Routing
+from rsarl.logger import RSADB
+from rsarl.networks import NetworkRecorder
+from rsarl.logger.experience_chunk import pack_experiences, unpack_columns, unpack_experiences
+
+
+def test_pack_experiences(make_experiences):
+    exps = make_experiences(10)
+    assert unpack_experiences(pack_experiences(exps)) == exps
+    columns = unpack_columns(pack_experiences(exps))
+    assert list(columns["is_success"]) == [e.is_success for e in exps]
+    assert columns["network"][0] == b"\x00\x01binary"
+    assert unpack_experiences(pack_experiences([])) == []
+
+
+def test_save_experience_chunks(tmp_path, make_experiences):
+    db = RSADB("exp", str(tmp_path / "test.db"))
+    exps = {0: make_experiences(10), 1: make_experiences(10, offset=1)}
+    db.save_experience_chunks(1, exps)
+    db.save_experience_chunks(2, {0: make_experiences(5)})
+    # overwritten
+    db.save_experience_chunks(2, {0: make_experiences(6)})
+    assert db.get_chunk_batches("exp") == [1, 2]
+    assert db.get_chunk_experiences("exp", 1, 1) == exps[1]
+    assert len(db.get_experience_chunk("exp", 0, 2)["request_id"]) == 6
+    with pytest.raises(KeyError):
+        db.get_experience_chunk("exp", 1, 2)
+    db.delete_experiment_info()
+    assert db.get_chunk_batches("exp") == []
+    db.close()
+
+
+def test_chunk_act_history(tmp_path, net, make_experiences):
+    recorder = NetworkRecorder(snapshot_interval=4)
+    exps = make_experiences(10)
+    path = Routing.shortest_path(net, 0, 5)
+    for i, exp in enumerate(exps):
+        if exp.path is not None and net.is_assignable(path, exp.slot_index % 6, 4):
+            net.assign_path(path, exp.slot_index % 6, 4, 2.)
+        net.spend_time(0.3)
+        exps[i] = exp._replace(network=recorder.record(i, net))
+        if i == 7:
+            slot, _ = net.to_arrays()
+            slot = slot.copy()
+    db = RSADB("exp", str(tmp_path / "test.db"))
+    db.save_experience_chunks(1, {0: make_experiences(3)})
+    db.save_experience_chunks(2, {0: exps})
+    # read from the latest chunk since experiences table is empty
+    assert db.get_n_request_to_evaluate("exp") == 10
+    act, req, state = db.get_act_history("exp", 7)
+    assert act.path == [1, 2, 3] and act.slot_idx == 7 and act.n_slot == 4
+    assert req.destination == exps[7].destination and req.duration == exps[7].duration
+    rows = [net.edge_index[e] for e in state.edges]
+    assert (state.slot == slot[rows]).all()
+    act, _, _ = db.get_act_history("exp", 9)
+    assert act.path is None and act.slot_idx is None
+    with pytest.raises(KeyError, match="request 10"):
+        db.get_act_history("exp", 10)
+    db.close()
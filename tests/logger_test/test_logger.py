@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import threading
+import pytest
+import torch
+from pfrl.agent import AttributeSavingMixin
+from rsarl import evaluator as evaluator_module
+from rsarl.envs import SerialVectorEnv
+from rsarl.evaluator import Evaluator, train_eval_loop
+from rsarl.logger import Logger, RSADB
+
+
+class DummyDRL(AttributeSavingMixin):
+    saved_attributes = ("model", "optimizer")
+
+    def __init__(self):
+        self.model = torch.nn.Linear(2, 1)
+        self.optimizer = torch.optim.SGD(self.model.parameters(), lr=0.1)
+
+    def get_statistics(self):
+        return [("loss", 0.)]
+
+
+class DummyAgent():
+    def __init__(self):
+        self.drl = DummyDRL()
+
+
+def test_async_logger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", save_agent=True, db_name="test.db", save_experience=True, async_write=True, queue_size=1)
+    agent = DummyAgent()
+
+    # block the writer to check back-pressure
+    started, release = threading.Event(), threading.Event()
+    record_db = logger.record_db
+    def blocking_record_db(*args):
+        started.set()
+        release.wait()
+        record_db(*args)
+    monkeypatch.setattr(logger, "record_db", blocking_record_db)
+
+    logger(agent, None, [1.], [0.1], [1.])
+    started.wait()
+    # the agent is snapshotted in foreground
+    weight = agent.drl.model.weight.detach().clone()
+    with torch.no_grad():
+        agent.drl.model.weight += 1.
+    logger(agent, None, [2.], [0.2], [2.])
+    third = threading.Thread(target=logger, args=(agent, None, [3.], [0.3], [3.]))
+    third.start()
+    third.join(timeout=0.2)
+    # blocked as the queue is full
+    assert third.is_alive()
+    release.set()
+    third.join()
+    logger.close()
+
+    db = RSADB("exp", "test.db")
+    assert db.select("select batch, blocking_prob from evaluations order by batch") == [(1, 1.), (2, 2.), (3, 3.)]
+    state = torch.load(os.path.join("trained-agent", "1-exp", "model.pt"))
+    assert torch.equal(state["weight"], weight)
+    assert os.path.exists(os.path.join("trained-agent", "3-exp", "optimizer.pt"))
+    # loadable by pfrl
+    DummyDRL().load(os.path.join("trained-agent", "2-exp"))
+    # temporary snapshots are moved
+    assert sorted(os.listdir("trained-agent")) == ["1-exp", "2-exp", "3-exp"]
+
+
+def test_async_logger_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", db_name="test.db", save_experience=True, async_write=True)
+    def fail(*args):
+        raise ValueError("failed")
+    monkeypatch.setattr(logger.db, "save_evaluation", fail)
+    logger(None, None, [1.], [0.1], [1.])
+    with pytest.raises(RuntimeError):
+        logger.flush()
+    logger.close()
+
+
+def test_agent_snapshot_without_training(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", save_agent=True, async_write=True)
+    agent = DummyAgent()
+    logger(agent, None, [1.], [0.1], [1.])
+    # written at exit without close()
+    logger._flush_at_exit()
+    assert os.listdir("trained-agent") == ["1-exp"]
+    DummyDRL().load(os.path.join("trained-agent", "1-exp"))
+    Evaluator(None, logger=logger).close()
+    assert logger._thread is None
+
+
+class CountingEvaluator():
+    def __init__(self, logger):
+        self.logger = logger
+        self.n_calls = 0
+
+    def __call__(self, agent):
+        self.n_calls += 1
+        self.logger(agent, None, [1.], [0.1], [1.])
+        if self.n_calls == 2:
+            raise KeyboardInterrupt
+
+    def close(self):
+        self.logger.close()
+
+
+def test_train_eval_loop_closes_logger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", db_name="test.db", save_experience=True, async_write=True)
+    evaluator = CountingEvaluator(logger)
+    monkeypatch.setattr(evaluator_module, "train", lambda *args: None)
+    with pytest.raises(KeyboardInterrupt):
+        train_eval_loop(SerialVectorEnv([]), DummyAgent(), evaluator, 3, 1)
+    # closed even when the loop is interrupted
+    assert logger._thread is None
+    assert RSADB("exp", "test.db").get_batches("exp") == [1, 2]
+
+
+class DummyEnv():
+    class net:
+        name = "nsf"
+    class requester:
+        pass
+
+
+def test_async_logger_db_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", db_name="test.db", save_experience=True, async_write=True, queue_size=1)
+    logger.save_experiment(DummyEnv(), DummyAgent(), {})
+    # duplicated primary key of experiments
+    logger.save_experiment(DummyEnv(), DummyAgent(), {})
+    with pytest.raises(RuntimeError) as e:
+        logger.flush()
+    assert isinstance(e.value.__cause__, sqlite3.IntegrityError)
+    # the writer is still running and the db is usable
+    logger(None, None, [1.], [0.1], [1.])
+    logger.close()
+    assert RSADB("exp", "test.db").get_batches("exp") == [1]
+
+
+def test_async_logger_dead_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = Logger("exp", db_name="test.db", save_experience=True, async_write=True, queue_size=1)
+    def exit_writer(*args):
+        raise SystemExit(1)
+    monkeypatch.setattr(logger.db, "save_evaluation", exit_writer)
+    logger(None, None, [1.], [0.1], [1.])
+    # SystemExit does not kill the writer silently
+    with pytest.raises(RuntimeError) as e:
+        logger.flush()
+    assert isinstance(e.value.__cause__, SystemExit)
+
+    # fail fast instead of blocking on the queue after the writer stopped
+    logger._queue.put(None)
+    logger._thread.join()
+    with pytest.raises(RuntimeError):
+        for _ in range(3):
+            logger(None, None, [1.], [0.1], [1.])
+    with pytest.raises(RuntimeError):
+        logger.flush()
+    logger.close()
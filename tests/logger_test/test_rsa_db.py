@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+from rsarl.logger import RSADB
+from rsarl.utils import get_mean_std
+
+
+def test_bp_per_batch(tmp_path):
+    # quotes in experiment name are not interpreted as SQL
+    exp_name = 'exp "1"'
+    db = RSADB(exp_name, str(tmp_path / "test.db"))
+    other = RSADB("other", str(tmp_path / "test.db"))
+    for batch in [1, 2, 3]:
+        for env_id in [1, 0]:
+            db.save_evaluation(env_id, batch, batch * 10. + env_id + 0.123456789012345678, 0.1, 1.)
+        other.save_evaluation(0, batch, 99., 0.1, 1.)
+
+    assert db.get_batches(exp_name) == [1, 2, 3]
+    bp_per_batch = db.get_bp_per_batch(exp_name, [3, 1])
+    assert list(bp_per_batch.items()) == [(3, [(30.123456789012345, ), (31.123456789012345, )]), (1, [(10.123456789012346, ), (11.123456789012346, )])]
+    assert list(db.get_bp_per_batch(exp_name)) == [1, 2, 3]
+    stats = db.get_evaluation_stats(exp_name, percentiles=())
+    assert list(stats.batch) == [1, 2, 3]
+    assert list(stats.min) == [10.123456789012346, 20.123456789012345, 30.123456789012345]
+    # indexed scan
+    plan = db.select(
+        "EXPLAIN QUERY PLAN select batch, blocking_prob from evaluations where experiment_name = ? order by batch, env_id", 
+        (exp_name, ))
+    assert "USING INDEX evaluations_batch" in str(plan)
+
+    db.delete_experiment_info()
+    assert db.get_batches(exp_name) == []
+    assert other.get_batches("other") == [1, 2, 3]
+    db.close()
+    other.close()
+
+
+def test_save_or_update_experience(tmp_path, make_experiences):
+    db = RSADB("exp", str(tmp_path / "test.db"))
+    assert not db._experience_exist("exp")
+    db.save_or_update_experience(make_experiences(5))
+    assert db._experience_exist("exp")
+    db.save_or_update_experience(make_experiences(8, offset=1))
+    assert db.get_n_request_to_evaluate("exp") == 8
+    assert db.select("select network from experiences where experiment_name = ? and request_id = ?", ("exp", 4)) == [('{"delta": 5}', )]
+    db.close()
+
+
+def test_evaluation_stats(tmp_path):
+    db = RSADB("exp", str(tmp_path / "test.db"))
+    rng = np.random.RandomState(0)
+    values = {batch: rng.rand(n) * 100 for batch, n in [(1, 1), (2, 2), (3, 5), (4, 8)]}
+    with db.transaction():
+        for batch, bps in values.items():
+            for env_id, bp in enumerate(bps):
+                db.save_evaluation(env_id, batch, bp, bp / 100, -bp)
+    RSADB("other", str(tmp_path / "test.db")).save_evaluation(0, 1, 100., 1., 0.)
+
+    stats = db.get_evaluation_stats("exp", percentiles=(0, 10, 50, 95, 100))
+    assert list(stats.batch) == [1, 2, 3, 4]
+    assert list(stats.n_envs) == [1, 2, 5, 8]
+    for i, bps in enumerate(values.values()):
+        assert stats.mean[i] == pytest.approx(np.mean(bps))
+        assert stats.std[i] == pytest.approx(np.std(bps), abs=1e-9)
+        assert stats.min[i] == np.min(bps) and stats.max[i] == np.max(bps)
+        for q, p in stats.percentiles.items():
+            assert p[i] == pytest.approx(np.percentile(bps, q))
+    # same as mean and std of bp per batch
+    y_mean, y_std = get_mean_std(db.get_bp_per_batch("exp"))
+    assert np.allclose(stats.mean, y_mean) and np.allclose(stats.std, y_std)
+
+    rewards = db.get_evaluation_stats("exp", metric="total_reward", percentiles=())
+    assert np.allclose(rewards.max, -stats.min)
+    assert db.get_evaluation_stats("none").batch.shape == (0, )
+    with pytest.raises(ValueError):
+        db.get_evaluation_stats("exp", metric="batch; drop table evaluations")
+    db.close()
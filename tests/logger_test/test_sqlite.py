@@ -0,0 +1,86 @@
+import gc
+import sqlite3
+import threading
+import pytest
+from rsarl.logger import SqliteDB
+
+
+def make_db(path, **kwargs):
+    db = SqliteDB(path, **kwargs)
+    db.create_table("CREATE TABLE IF NOT EXISTS t(x INTEGER)")
+    return db
+
+
+def test_pragmas(tmp_path):
+    db = make_db(str(tmp_path / "test.db"), synchronous="OFF", cache_size=100)
+    assert db.select("PRAGMA journal_mode") == [("wal", )]
+    assert db.conn.execute("PRAGMA synchronous").fetchone() == (0, )
+    assert db.conn.execute("PRAGMA cache_size").fetchone() == (100, )
+    db.close()
+
+
+def test_transaction(tmp_path):
+    db = make_db(str(tmp_path / "test.db"))
+    with db.transaction():
+        db.insert("INSERT INTO t VALUES (?)", (1, ))
+        with db.transaction():
+            db.insert("INSERT INTO t VALUES (?)", (2, ))
+        # visible in the thread of transaction
+        assert db.select("SELECT count(*) FROM t") == [(2, )]
+        # not committed yet
+        result = []
+        reader = threading.Thread(target=lambda: result.append(db.select("SELECT count(*) FROM t")))
+        reader.start()
+        reader.join()
+        assert result == [[(0, )]]
+    assert db.select("SELECT count(*) FROM t") == [(2, )]
+
+    with pytest.raises(ValueError):
+        with db.transaction():
+            db.insert("INSERT INTO t VALUES (?)", (3, ))
+            raise ValueError
+    assert db.select("SELECT x FROM t ORDER BY x") == [(1, ), (2, )]
+    db.close()
+
+
+def test_memory_db():
+    db = make_db(":memory:")
+    db.insert("INSERT INTO t VALUES (?)", (1, ))
+    assert db.select("SELECT x FROM t WHERE x = ?", (1, )) == [(1, )]
+    db.close()
+
+
+def test_write_error(tmp_path):
+    db = make_db(str(tmp_path / "test.db"))
+    db.create_table("CREATE TABLE IF NOT EXISTS u(x INTEGER PRIMARY KEY)")
+    db.insert("INSERT INTO u VALUES (?)", (1, ))
+    # the original error is raised and rolled back in the transaction
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction():
+            db.insert("INSERT INTO u VALUES (?)", (2, ))
+            db.many_execute("INSERT INTO u VALUES (?)", [(3, ), (1, )])
+    assert db.select("SELECT x FROM u") == [(1, )]
+    # still available
+    with pytest.raises(sqlite3.IntegrityError):
+        db.insert("INSERT INTO u VALUES (?)", (1, ))
+    db.insert("INSERT INTO u VALUES (?)", (4, ))
+    assert db.select("SELECT x FROM u ORDER BY x") == [(1, ), (4, )]
+    db.close()
+
+
+def test_read_connections_of_finished_threads(tmp_path):
+    db = make_db(str(tmp_path / "test.db"))
+    conns = []
+    def read():
+        db.select("SELECT count(*) FROM t")
+        conns.append(db._local.holder.conn)
+    for _ in range(50):
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join()
+    gc.collect()
+    assert len(db._read_conns) == 0
+    # closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        conns[0].execute("SELECT 1")
+    db.close()
@@ -0,0 +1,104 @@
+
+import json
+import pytest
+import random
+import numpy as np
+import networkx as nx
+from bitarray import bitarray
+from networkx.readwrite.json_graph import adjacency_graph
+
+from rsarl.utils import path_to_edges
+from rsarl.algorithms import Routing
+from rsarl.networks import SingleFiberNetwork, ArrayNetwork
+
+
+def test_distance(array_net):
+    for _ in range(10):
+        s, d = random.randint(0, array_net.n_nodes - 1), random.randint(0, array_net.n_nodes - 1)
+        path = Routing.shortest_path(array_net, s, d)
+
+        distance = array_net.distance(path)
+        ans_distance = nx.dijkstra_path_length(array_net.G, s, d, weight="weight")
+        assert distance == ans_distance
+
+
+def test_assign_and_spend_time(array_net):
+    s, d = 0, 3
+    path = Routing.shortest_path(array_net, s, d)
+    array_net.assign_path(path, 0, 3, 2.0)
+
+    # occupied slots can not be assigned again
+    assert array_net.is_assignable(path, start_idx=2, n_req_slot=2) is False
+    assert array_net.is_assignable(path, start_idx=3, n_req_slot=2) is True
+    with pytest.raises(ValueError):
+        array_net.assign_path(path, 1, 2, 1.0)
+
+    array_net.spend_time(1.2)
+    path_edges = path_to_edges(path)
+    slot_dict = array_net.slot
+    time_dict = array_net.time
+    for e in array_net.G.edges():
+        if e in path_edges:
+            assert slot_dict[e] == [0,0,0,1,1,1,1,1,1,1]
+            assert time_dict[e] == pytest.approx([0.8,0.8,0.8,0,0,0,0,0,0,0])
+        else:
+            assert slot_dict[e] == [1 for _ in range(array_net.n_slot)]
+
+    assert array_net.path_slot(path) == bitarray([0,0,0,1,1,1,1,1,1,1])
+    # release
+    array_net.spend_time(1.0)
+    assert array_net.path_slot(path) == bitarray([1 for _ in range(array_net.n_slot)])
+    assert array_net.resource_util() == 0.0
+
+
+def test_same_as_single_fiber_network():
+    rand = random.Random(0)
+    nets = [SingleFiberNetwork("nsf", 16, True), ArrayNetwork("nsf", 16, True)]
+    for _ in range(300):
+        s, d = rand.sample(range(nets[0].n_nodes), 2)
+        path = Routing.shortest_path(nets[0], s, d)
+        start_idx, n_req_slot = rand.randint(0, 15), rand.randint(1, 4)
+        duration, interval = rand.uniform(1, 10), rand.uniform(0, 1)
+
+        results = [net.is_assignable(path, start_idx, n_req_slot) for net in nets]
+        assert results[0] == results[1]
+        for net in nets:
+            if results[0]:
+                net.assign_path(path, start_idx, n_req_slot, duration)
+            net.spend_time(interval)
+
+        assert nets[0].path_slot(path) == nets[1].path_slot(path)
+        assert nets[0].distance(path) == nets[1].distance(path)
+        assert nets[0].adj_path_slot(path) == nets[1].adj_path_slot(path)
+        assert nets[0].resource_util() == pytest.approx(nets[1].resource_util())
+        assert nets[0].slot == nets[1].slot
+
+
+def test_dump_json(array_net):
+    path = Routing.shortest_path(array_net, 0, 3)
+    array_net.assign_path(path, 0, 3, 2.0)
+    G = adjacency_graph(json.loads(array_net.dump_json()))
+    assert nx.get_edge_attributes(G, "slot") == array_net.slot
+
+
+def test_bind_state(array_net):
+    path = [0, 1, 2]
+    array_net.assign_path(path, 0, 2, 5.)
+    array_net.spend_time(1.)
+
+    buffer = bytearray(array_net.state_nbytes())
+    array_net.bind_state(buffer)
+    view = ArrayNetwork("nsf", n_slot=10, is_weight=True)
+    view.bind_state(buffer, readonly=True)
+    # current state is copied into the buffer
+    assert np.array_equal(view.slot_table, array_net.slot_table)
+    assert view.clock == 1.
+
+    array_net.assign_path(path, 3, 2, 5.)
+    array_net.spend_time(2.)
+    assert np.array_equal(view.slot_table, array_net.slot_table)
+    assert np.array_equal(view.time_table, array_net.time_table)
+    assert view.resource_util() == array_net.resource_util()
+
+    array_net.init_graph()
+    assert view.slot_table.all() and view.n_occupied == 0 and view.clock == 0.
@@ -0,0 +1,35 @@
+
+import random
+import pytest
+import numpy as np
+
+from rsarl.algorithms import Routing
+from rsarl.networks import NetworkRecorder, delta_base, replay
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+@pytest.mark.parametrize("binary", [False, True])
+def test_replay(net_name, binary, request):
+    net = request.getfixturevalue(net_name)
+    rand = random.Random(0)
+    recorder = NetworkRecorder(snapshot_interval=5, binary=binary)
+
+    records = []
+    for req_id in range(20):
+        s, d = rand.sample(range(net.n_nodes), 2)
+        path = Routing.shortest_path(net, s, d)
+        start_idx = rand.randint(0, net.n_slot - 2)
+        if net.is_assignable(path, start_idx, 2):
+            net.assign_path(path, start_idx, 2, rand.uniform(0.5, 3.0))
+        net.spend_time(rand.uniform(0, 0.5))
+
+        records.append(recorder.record(req_id, net))
+        # snapshot at every 5 requests
+        base = delta_base(records[-1])
+        assert base == (None if req_id % 5 == 0 else req_id - req_id % 5)
+
+        state = replay(records[req_id - req_id % 5:])
+        slot, time = net.to_arrays()
+        rows = [net.edge_index[e] for e in state.edges]
+        assert (state.slot == slot[rows]).all()
+        np.testing.assert_allclose(state.time, time[rows], atol=1e-5)
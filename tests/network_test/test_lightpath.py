@@ -0,0 +1,35 @@
+
+import pytest
+from rsarl.algorithms import Routing
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_release(net_name, request):
+    net = request.getfixturevalue(net_name)
+    path = Routing.shortest_path(net, 0, 3)
+    lp_id1 = net.assign_path(path, 0, 2, 5.0)
+    lp_id2 = net.assign_path(path, 2, 3, 5.0)
+    assert lp_id1 != lp_id2
+    assert net.lightpaths[lp_id2].slot_idx == 2
+    assert net.lightpaths[lp_id2].expiry == 5.0
+
+    # tear down before expiry
+    lp = net.release(lp_id1)
+    assert lp.path == path
+    assert lp_id1 not in net.lightpaths
+    assert net.is_assignable(path, 0, 2)
+    with pytest.raises(KeyError):
+        net.release(lp_id1)
+
+    # the remaining one expires as scheduled
+    net.spend_time(5.0)
+    assert len(net.lightpaths) == 0
+    assert net.path_slot(path).all()
+
+
+def test_ids_are_not_reused(array_net):
+    path = Routing.shortest_path(array_net, 0, 3)
+    lp_id = array_net.assign_path(path, 0, 2, 5.0)
+    array_net.init_graph()
+    assert len(array_net.lightpaths) == 0
+    assert array_net.assign_path(path, 0, 2, 5.0) != lp_id
@@ -26,3 +26,23 @@ def test_dump_and_load(net):
         assert pre_time_dict[e] == time_dict[e]
 
 
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_clone(net_name, request):
+    net = request.getfixturevalue(net_name)
+    net.assign_path([0, 1, 2], 0, 2, 5.)
+    net.spend_time(1.)
+    clone = net.clone()
+    # immutable structures are shared
+    assert clone.edge_list is net.edge_list
+    assert clone.slot == net.slot and clone.time == net.time
+    assert clone.resource_util() == net.resource_util()
+
+    # state is independent
+    clone.assign_path([0, 1, 2], 3, 2, 5.)
+    clone.spend_time(5.)
+    assert net.slot[(0, 1)][:5] == [0, 0, 1, 1, 1]
+    assert clone.slot[(0, 1)][:5] == [1, 1, 1, 1, 1]
+    assert len(net.lightpaths) == 1 and len(clone.lightpaths) == 0
+    assert net.resource_util() > 0 and clone.resource_util() == 0
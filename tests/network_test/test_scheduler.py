@@ -0,0 +1,35 @@
+
+import pytest
+from rsarl.algorithms import Routing
+from rsarl.networks.scheduler import ReleaseScheduler
+
+
+def test_pop_expired():
+    scheduler = ReleaseScheduler()
+    scheduler.push(3.0, "c")
+    scheduler.push(1.0, "a")
+    scheduler.push(2.0, "b")
+    scheduler.push(2.0, "b2")
+
+    assert scheduler.next_expiry() == 1.0
+    assert scheduler.pop_expired(0.5) == []
+    assert scheduler.pop_expired(2.0) == ["a", "b", "b2"]
+    assert len(scheduler) == 1
+    scheduler.clear()
+    assert scheduler.next_expiry() is None
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_release_only_expired(net_name, request):
+    net = request.getfixturevalue(net_name)
+    path = Routing.shortest_path(net, 0, 3)
+    net.assign_path(path, 0, 2, 1.0)
+    net.assign_path(path, 2, 2, 3.0)
+
+    net.spend_time(1.0)
+    assert net.path_slot(path).tolist()[:4] == [1, 1, 0, 0]
+    assert net.time[tuple(sorted(path[:2]))][:4] == pytest.approx([0, 0, 2.0, 2.0])
+
+    net.spend_time(2.5)
+    assert net.path_slot(path).all()
+    assert len(net.scheduler) == 0
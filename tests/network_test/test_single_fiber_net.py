@@ -206,16 +206,23 @@ def check_assign_path(net):
             assert time_dict[e] == init_time, f"Assign wrong path in time: {time_dict[e]} != {init_time}"
 
 
-def test_resource_util(net):
-    slot_dict = net.slot
-    time_dict = net.time
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+def test_resource_util(net_name, request):
+    net = request.getfixturevalue(net_name)
     # Occupy half slots of all edges
     ans_slot = [1,1,1,1,1,0,0,0,0,0]
-    ans_time = [1,1,1,1,1,0,0,0,0,0]
-    for e in net.G.edges():
-        for s in range(net.n_slot):
-            slot_dict[e][s] = ans_slot[s]
-            time_dict[e][s] = ans_time[s]
+    lp_ids = [net.assign_path(list(e), 5, 5, 1.0) for e in net.G.edges()]
+    for v in net.slot.values():
+        assert v == ans_slot
 
     assert net.resource_util() == 0.5, f"Failure to calculate resource util: {net.resource_util()} != 0.5"
+    assert (net.edge_util() == 0.5).all()
+    assert net.slot_index_util().tolist() == ans_slot[::-1]
+
+    # release
+    net.release(lp_ids[0])
+    assert net.resource_util() == (net.n_edges - 1) * 5 / (net.n_edges * net.n_slot)
+    assert net.edge_util()[0] == 0
+    net.spend_time(1.0)
+    assert net.resource_util() == 0.0
 
@@ -0,0 +1,38 @@
+
+import json
+import pytest
+import numpy as np
+
+from rsarl.algorithms import Routing
+from rsarl.networks import dump_snapshot, load_snapshot
+from rsarl.networks.snapshot import load_json_snapshot
+
+
+@pytest.mark.parametrize("net_name", ["net", "array_net"])
+@pytest.mark.parametrize("compress", [False, True])
+def test_dump_and_load(net_name, compress, request):
+    net = request.getfixturevalue(net_name)
+    path = Routing.shortest_path(net, 0, 3)
+    net.assign_path(path, 1, 3, 2.0)
+    net.spend_time(0.5)
+
+    blob = dump_snapshot(net, compress=compress)
+    state = load_snapshot(blob)
+    slot, time = net.to_arrays()
+    assert state.edges == net.edge_list
+    assert (state.slot == slot).all()
+    np.testing.assert_allclose(state.time, time)
+    assert state.positions.shape == (net.n_nodes, 2)
+
+    # same as json format
+    json_state = load_json_snapshot(net.dump_json())
+    assert json_state.edges == state.edges
+    assert (json_state.slot == state.slot).all()
+    np.testing.assert_allclose(json_state.positions, state.positions)
+
+
+def test_invalid_snapshot(array_net):
+    blob = bytearray(dump_snapshot(array_net))
+    blob[4] = 255 # version
+    with pytest.raises(ValueError):
+        load_snapshot(bytes(blob))
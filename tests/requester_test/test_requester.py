@@ -1,6 +1,7 @@
 
 import copy
-from rsarl.requester import UniformRequester
+import numpy as np
+from rsarl.requester import UniformRequester, NonuniformRequester
 
 def test_requester():
     n_nodes = 10
@@ -40,3 +41,27 @@ def test_requester():
     assert bandwidth == bandwidth2
     assert duration == duration2
 
+
+
+def test_nonuniform_requester():
+    n_nodes = 5
+    prob = [0.4, 0.3, 0.2, 0.1, 0.]
+    requester1 = NonuniformRequester(n_nodes, prob, 10, 12, seed=0, buffer_size=16)
+    requester2 = NonuniformRequester(n_nodes, prob, 10, 12, seed=0, buffer_size=16)
+    reqs = [requester1.request() for _ in range(40)]
+    # reproducible with the seed
+    assert reqs == [requester2.request() for _ in range(40)]
+    requester1.init()
+    assert reqs == [requester1.request() for _ in range(40)]
+    requester1.seed(1)
+    assert reqs != [requester1.request() for _ in range(40)]
+    assert all(s != d and prob[s] > 0 and prob[d] > 0 for s, d, _, _ in reqs)
+
+    # empirical distribution of pairs
+    pairs = requester1.sample_pairs(200000)
+    p = np.array(prob)
+    expected = p[:, None] * p[None, :] / (1 - p[:, None])
+    np.fill_diagonal(expected, 0.)
+    counts = np.zeros((n_nodes, n_nodes))
+    np.add.at(counts, (pairs[:, 0], pairs[:, 1]), 1)
+    assert np.allclose(counts / len(pairs), expected, atol=5e-3)
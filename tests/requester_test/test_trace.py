@@ -0,0 +1,68 @@
+
+import numpy as np
+import pytest
+from rsarl.envs import DeepRMSAEnv
+from rsarl.networks import SingleFiberNetwork
+from rsarl.requester import (
+    UniformRequester, NonuniformRequester, RequestTrace, TraceRequester, generate_trace)
+
+
+def test_generate_trace():
+    n_nodes = 10
+    trace = generate_trace(UniformRequester(n_nodes, 10, 12, seed=0), 1000, chunk_size=300)
+    assert len(trace) == 1000
+    assert np.all(trace.source < trace.destination)
+    assert trace.destination.max() < n_nodes
+    assert trace.bandwidth.min() >= 25 and trace.bandwidth.max() <= 100
+    assert np.all(trace.duration > 0) and np.all(trace.interval > 0)
+    # reproducible with the same seed
+    trace2 = generate_trace(UniformRequester(n_nodes, 10, 12, seed=0), 1000, chunk_size=300)
+    assert np.array_equal(trace.source, trace2.source)
+
+    # fallback of requesters without vectorized sampling
+    trace = generate_trace(NonuniformRequester(n_nodes, [0.1] * n_nodes, 10, 12, seed=0), 10, chunk_size=3)
+    assert len(trace) == 10
+    assert np.all(trace.source != trace.destination)
+
+
+@pytest.mark.parametrize("name, mmap", [("trace.npz", False), ("trace", False), ("trace", True)])
+def test_save_load(tmp_path, name, mmap):
+    trace = generate_trace(UniformRequester(10, 10, 12, seed=0), 100)
+    path = str(tmp_path / name)
+    trace.save(path)
+    loaded = RequestTrace.load(path, mmap=mmap)
+    assert loaded.n_nodes == 10
+    for f in RequestTrace.FIELDS:
+        assert np.array_equal(getattr(trace, f), getattr(loaded, f))
+    if mmap:
+        assert isinstance(loaded.source, np.memmap)
+
+
+def test_trace_requester():
+    trace = generate_trace(UniformRequester(5, 10, 12, seed=0), 20)
+    requester = TraceRequester(trace)
+    req = requester.request()
+    assert req == trace[0]
+    assert requester.time_interval() == trace.interval[1]
+    assert requester.request() == trace[1]
+    clone = requester.clone()
+    assert clone.request() == requester.request() == trace[2]
+    # seed does not change the trace
+    requester.seed(3)
+    requester.init()
+    assert requester.request() == trace[0]
+    for _ in range(19):
+        requester.request()
+    with pytest.raises(IndexError):
+        requester.request()
+
+
+def test_replay_across_envs():
+    trace = generate_trace(UniformRequester(5, 10, 12, seed=0), 50)
+    envs = [DeepRMSAEnv(SingleFiberNetwork("nsf", 20, is_weight=True), TraceRequester(trace)) for _ in range(2)]
+    envs[1].seed(1)
+    obs = [env.reset() for env in envs]
+    for _ in range(30):
+        assert obs[0].request == obs[1].request
+        obs = [env.step(None)[0] for env in envs]
+    assert envs[0].net.clock == envs[1].net.clock == pytest.approx(trace.interval[1:31].sum())
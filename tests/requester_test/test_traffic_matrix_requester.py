@@ -0,0 +1,80 @@
+
+import numpy as np
+import pytest
+from rsarl.requester import TrafficMatrixRequester, ConstantLoad, DiurnalLoad, StepLoad, generate_trace
+
+
+def test_load_profile():
+    assert np.all(ConstantLoad(2.)(np.arange(3)) == 2.)
+    diurnal = DiurnalLoad(period=24., amplitude=0.5)
+    assert diurnal(6.) == pytest.approx(1.5)
+    assert diurnal.peak == 1.5
+    step = StepLoad([10., 20.], [1., 3., 0.5])
+    assert list(step(np.array([0., 10., 15., 25.]))) == [1., 3., 3., 0.5]
+    assert step.peak == 3.
+    with pytest.raises(ValueError):
+        StepLoad([10.], [1.])
+
+
+def test_traffic_matrix_requester():
+    n_nodes = 4
+    tm = np.zeros((n_nodes, n_nodes))
+    tm[0, 1] = 3.
+    tm[2, 3] = 1.
+    requester = TrafficMatrixRequester(n_nodes, tm, 10, 12, seed=0, batch_size=64)
+    first = requester.request()
+    reqs = [first]
+    for _ in range(199):
+        requester.time_interval()
+        reqs.append(requester.request())
+    assert all((s, d) in [(0, 1), (2, 3)] for s, d, _, _ in reqs)
+    assert 0.65 < np.mean([s == 0 for s, _, _, _ in reqs]) < 0.85
+
+    # reproducible and restarted by init
+    requester.init()
+    assert requester.request() == first
+    assert requester.clock == 0.
+    clone = requester.clone()
+    assert clone.time_interval() == requester.time_interval()
+    assert clone.request() == requester.request()
+
+
+def test_time_varying_load():
+    n_nodes = 3
+    rate = 50.
+    profile = StepLoad([100.], [1., 0.2])
+    requester = TrafficMatrixRequester(n_nodes, np.ones((n_nodes, n_nodes)), 10, rate, profile, seed=0)
+    trace = generate_trace(requester, 20000, chunk_size=1000)
+    assert trace.interval[0] == 0.
+    times = np.cumsum(trace.interval)
+    assert np.all(np.diff(times) >= 0)
+    # the number of arrivals in each period follows the load
+    assert np.sum(times < 100.) == pytest.approx(rate * 100., rel=0.05)
+    n_after = np.sum((times >= 100.) & (times < 1000.))
+    assert n_after == pytest.approx(rate * 0.2 * 900., rel=0.05)
+    assert np.all(trace.source != trace.destination)
+
+    # diurnal load
+    profile = DiurnalLoad(period=100., amplitude=1.)
+    requester = TrafficMatrixRequester(n_nodes, np.ones((n_nodes, n_nodes)), 10, rate, profile, seed=0)
+    times = np.cumsum(requester.sample(20000)["interval"])
+    assert np.sum(times < 50.) > 4 * np.sum((times >= 50.) & (times < 100.))
+
+
+class ZeroLoad(StepLoad):
+    """ load stays at 0 after time 1, bypassing the check of StepLoad """
+
+    def __init__(self):
+        self.times = np.array([1.])
+        self.levels = np.array([1., 0.])
+        self.peak = 1.
+
+
+def test_zero_load():
+    with pytest.raises(ValueError):
+        StepLoad([1.0], [1.0, 0.0])
+    requester = TrafficMatrixRequester(
+        3, np.ones((3, 3)), 10, 5, load_profile=ZeroLoad(), max_rejections=10**4)
+    # no request arrives after time 1
+    with pytest.raises(ValueError):
+        requester.arrival_times(100)
@@ -2,8 +2,9 @@
 import pytest
 import numpy as np
 from bitarray import bitarray
-from rsarl.utils.fragmentation.entropy import entropy, _path_based_entropy
-from rsarl.utils.fragmentation import is_cut, misalignment
+from rsarl.utils import path_to_edges, sort_tuple
+from rsarl.utils.fragmentation.entropy import entropy, _path_based_entropy, edge_based_entropy
+from rsarl.utils.fragmentation import is_cut, misalignment, count_cut, count_misalignment
 
 
 ent_test_data = [
@@ -68,3 +69,29 @@ def test_misallignment(path_slot, neighbor_slot, start_idx, req_n_slot, expect):
     neighbor_slot = bitarray(neighbor_slot)
     assert misalignment(path_slot, neighbor_slot, start_idx, req_n_slot) == expect
 
+
+
+@pytest.mark.parametrize("net_fixture", ["net", "array_net"])
+def test_network_metrics(net_fixture, request):
+    net = request.getfixturevalue(net_fixture)
+    net.assign_path([0, 1, 2], 2, 3, 5.)
+    net.assign_path([1, 3], 0, 4, 5.)
+    path = [0, 1, 3]
+    slot_dict = net.slot
+    edges = path_to_edges(path)
+    # reference values from the dict view of slot tables
+    expect_cut = sum(is_cut(bitarray(slot_dict[e]), 5, 2) for e in edges)
+    expect_entropy = sum(_path_based_entropy(bitarray(slot_dict[e]), 2) for e in edges)
+    assert count_cut(net, path, 5, 2) == expect_cut
+    assert np.allclose(edge_based_entropy(net, path, 2), expect_entropy)
+
+    expect_misalign = 0
+    for e in edges:
+        for node in e:
+            for neighbor in net.G[node]:
+                neighbor_edge = sort_tuple((neighbor, node))
+                if neighbor_edge in edges:
+                    continue
+                expect_misalign += misalignment(
+                    bitarray(slot_dict[e]), bitarray(slot_dict[neighbor_edge]), 5, 2)
+    assert count_misalignment(net, path, 5, 2) == expect_misalign